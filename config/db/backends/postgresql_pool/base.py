@@ -0,0 +1,61 @@
+"""
+PostgreSQL backend that borrows connections from a per-process pool.
+
+Use it by setting ENGINE to "config.db.backends.postgresql_pool" and
+configuring the pool with a "POOL" dict in the database settings (see
+DEFAULT_POOL_SETTINGS). Closing a connection returns it to the pool, so
+the default CONN_MAX_AGE of 0 no longer means one TCP + auth handshake
+per request.
+"""
+
+import psycopg2.extras
+
+from django.db.backends.postgresql import base
+from psycopg2 import extensions
+
+from config.db.backends.postgresql_pool.pool import get_pool
+from config.db.backends.postgresql_pool.pool import render_pool_metrics
+from users.metrics import registry
+
+
+registry.register_collector(render_pool_metrics)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    pool = None
+
+    def get_pool(self, conn_params):
+        conn_params = {
+            key: value
+            for key, value in conn_params.items()
+            if key not in ("connection_factory", "cursor_factory")
+        }
+        return get_pool(
+            self.alias,
+            extensions.make_dsn(**conn_params),
+            self.settings_dict.get("POOL", {}),
+        )
+
+    def get_new_connection(self, conn_params):
+        self.pool = self.get_pool(conn_params)
+        connection = self.pool.getconn()
+
+        # Same session setup as the stock backend, see
+        # django.db.backends.postgresql.base.DatabaseWrapper.get_new_connection.
+        options = self.settings_dict["OPTIONS"]
+        try:
+            self.isolation_level = options["isolation_level"]
+        except KeyError:
+            self.isolation_level = connection.isolation_level
+        else:
+            if self.isolation_level != connection.isolation_level:
+                connection.set_session(isolation_level=self.isolation_level)
+        psycopg2.extras.register_default_jsonb(
+            conn_or_curs=connection, loads=lambda x: x
+        )
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.pool.putconn(self.connection)
@@ -0,0 +1,198 @@
+import threading
+import time
+import weakref
+
+import psycopg2_pool
+
+from psycopg2 import extensions
+
+
+DEFAULT_POOL_SETTINGS = {
+    "MIN_SIZE": 1,
+    "MAX_SIZE": 10,
+    # Seconds to wait for a free connection before giving up.
+    "TIMEOUT": 5.0,
+    # Idle connections are closed after this many seconds.
+    "IDLE_TIMEOUT": 300,
+    # Connections are replaced once they are this many seconds old.
+    "MAX_LIFETIME": 1800,
+    # Run `SELECT 1` on checkout when a connection sat idle this long.
+    "HEALTH_CHECK_INTERVAL": 30,
+}
+
+
+class PoolTimeout(psycopg2_pool.PoolError):
+    pass
+
+
+class ConnectionPool:
+    """Bounded psycopg2 connection pool with waiting and connection recycling.
+
+    psycopg2_pool raises as soon as MAX_SIZE connections are checked out;
+    this wrapper waits up to TIMEOUT seconds for one to be returned instead,
+    retires connections older than MAX_LIFETIME and pings connections that
+    have been idle for a while before handing them out.
+    """
+
+    def __init__(self, dsn, **options):
+        self.options = {**DEFAULT_POOL_SETTINGS, **options}
+        self.pool = psycopg2_pool.ThreadSafeConnectionPool(
+            minconn=self.options["MIN_SIZE"],
+            maxconn=self.options["MAX_SIZE"],
+            idle_timeout=self.options["IDLE_TIMEOUT"],
+            dsn=dsn,
+        )
+        self.condition = threading.Condition()
+        self.created_at = weakref.WeakKeyDictionary()
+        self.returned_at = weakref.WeakKeyDictionary()
+
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.timeouts = 0
+        self.recycled = 0
+        self.failed_health_checks = 0
+
+    def getconn(self):
+        while True:
+            conn = self.checkout()
+            if conn not in self.created_at:
+                self.created_at[conn] = time.monotonic()
+                return conn
+            if self.is_expired(conn):
+                self.recycled += 1
+                self.discard(conn)
+            elif not self.is_healthy(conn):
+                self.failed_health_checks += 1
+                self.discard(conn)
+            else:
+                return conn
+
+    def checkout(self):
+        started_at = time.monotonic()
+        deadline = started_at + self.options["TIMEOUT"]
+        waited = False
+        with self.condition:
+            while True:
+                try:
+                    conn = self.pool.getconn()
+                    break
+                except psycopg2_pool.PoolError:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.timeouts += 1
+                        raise PoolTimeout(
+                            f"No connection available within "
+                            f"{self.options['TIMEOUT']} seconds."
+                        )
+                    if not waited:
+                        waited = True
+                        self.waits += 1
+                    self.condition.wait(remaining)
+
+            self.checkouts += 1
+            if waited:
+                self.wait_seconds += time.monotonic() - started_at
+
+        return conn
+
+    def putconn(self, conn):
+        self.returned_at[conn] = time.monotonic()
+        if self.is_expired(conn):
+            self.recycled += 1
+            self.discard(conn)
+            return
+        self.pool.putconn(conn)
+        with self.condition:
+            self.condition.notify()
+
+    def discard(self, conn):
+        with self.pool.lock:
+            self.pool.connections_in_use.discard(conn)
+        if not conn.closed:
+            conn.close()
+        with self.condition:
+            self.condition.notify()
+
+    def is_expired(self, conn):
+        if conn.closed:
+            return True
+        age = time.monotonic() - self.created_at.get(conn, time.monotonic())
+        return age > self.options["MAX_LIFETIME"]
+
+    def is_healthy(self, conn):
+        returned_at = self.returned_at.get(conn)
+        if returned_at is None:
+            return True
+        if time.monotonic() - returned_at < self.options["HEALTH_CHECK_INTERVAL"]:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            if conn.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def get_stats(self):
+        return {
+            "size": len(self.pool.connections_in_use) + len(self.pool.idle_connections),
+            "in_use": len(self.pool.connections_in_use),
+            "idle": len(self.pool.idle_connections),
+            "max_size": self.options["MAX_SIZE"],
+            "checkouts": self.checkouts,
+            "waits": self.waits,
+            "wait_seconds": self.wait_seconds,
+            "timeouts": self.timeouts,
+            "recycled": self.recycled,
+            "failed_health_checks": self.failed_health_checks,
+        }
+
+    def close(self):
+        self.pool.clear()
+
+
+pools = {}
+pools_lock = threading.Lock()
+
+
+def get_pool(alias, dsn, options):
+    # Keyed by DSN too: the test runner points an alias at another database.
+    key = (alias, dsn)
+    pool = pools.get(key)
+    if pool is None:
+        with pools_lock:
+            pool = pools.get(key)
+            if pool is None:
+                pool = pools[key] = ConnectionPool(dsn, **options)
+    return pool
+
+
+def get_pool_stats():
+    stats = {}
+    for (alias, _), pool in list(pools.items()):
+        for name, value in pool.get_stats().items():
+            stats.setdefault(alias, {}).setdefault(name, 0)
+            stats[alias][name] += value
+    return stats
+
+
+def render_pool_metrics():
+    lines = []
+    for name, metric_type in [
+        ("in_use", "gauge"),
+        ("idle", "gauge"),
+        ("max_size", "gauge"),
+        ("checkouts", "counter"),
+        ("waits", "counter"),
+        ("wait_seconds", "counter"),
+        ("timeouts", "counter"),
+        ("recycled", "counter"),
+        ("failed_health_checks", "counter"),
+    ]:
+        metric = f"db_pool_{name}" + ("_total" if metric_type == "counter" else "")
+        lines.append(f"# TYPE {metric} {metric_type}")
+        for alias, stats in sorted(get_pool_stats().items()):
+            lines.append(f'{metric}{{alias="{alias}"}} {stats[name]}')
+    return lines
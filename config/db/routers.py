@@ -0,0 +1,120 @@
+"""
+Database router sending user lookups to read replicas.
+
+Replicas are listed in the DATABASE_REPLICAS secret and added to DATABASES
+by the settings. Reads of the routed models go to a random replica, except
+when the current context has written to them recently (read-your-writes),
+is inside a transaction on the primary, or follows an instance loaded from
+the primary. Writes of the routed models always go to the primary.
+"""
+
+import contextvars
+import math
+import random
+import time
+
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db import connections
+
+
+DEFAULT_REPLICA_ROUTER_SETTINGS = {
+    "REPLICAS": [],
+    "MODELS": ["users.User"],
+    # Reads stay on the primary this long after a write, covering the lag.
+    "READ_YOUR_WRITES_SECONDS": 5,
+    "PIN_COOKIE_NAME": "use_primary_db",
+}
+
+
+def get_replica_router_setting(name):
+    return getattr(settings, "REPLICA_ROUTER", {}).get(
+        name, DEFAULT_REPLICA_ROUTER_SETTINGS[name]
+    )
+
+
+class RoutingState:
+    __slots__ = ("pinned_until", "wrote")
+
+    def __init__(self, pinned_until=0.0):
+        self.pinned_until = pinned_until
+        self.wrote = False
+
+    @property
+    def pinned(self):
+        return self.pinned_until > time.monotonic()
+
+
+current_routing_state = contextvars.ContextVar("current_routing_state", default=None)
+
+
+def get_routing_state():
+    state = current_routing_state.get()
+    if state is None:
+        state = RoutingState()
+        current_routing_state.set(state)
+    return state
+
+
+@contextmanager
+def routing_context(pinned=False):
+    """Route the enclosed code with a fresh read-your-writes window."""
+    state = RoutingState(math.inf if pinned else 0.0)
+    token = current_routing_state.set(state)
+    try:
+        yield state
+    finally:
+        current_routing_state.reset(token)
+
+
+def pin_to_primary():
+    state = get_routing_state()
+    state.wrote = True
+    state.pinned_until = max(
+        state.pinned_until,
+        time.monotonic() + get_replica_router_setting("READ_YOUR_WRITES_SECONDS"),
+    )
+
+
+def in_transaction(alias):
+    # Like the durable check in django.db.transaction.Atomic, ignore the
+    # transactions TestCase wraps around each test.
+    return any(not atomic._from_testcase for atomic in connections[alias].atomic_blocks)
+
+
+class ReplicaRouter:
+    def is_routed(self, model):
+        return model._meta.label in get_replica_router_setting("MODELS")
+
+    def db_for_read(self, model, **hints):
+        replicas = get_replica_router_setting("REPLICAS")
+        if not replicas or not self.is_routed(model):
+            return None
+        if get_routing_state().pinned:
+            return DEFAULT_DB_ALIAS
+        if in_transaction(DEFAULT_DB_ALIAS):
+            return DEFAULT_DB_ALIAS
+
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db == DEFAULT_DB_ALIAS:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        if self.is_routed(model):
+            pin_to_primary()
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *get_replica_router_setting("REPLICAS")}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in get_replica_router_setting("REPLICAS"):
+            return False
+        return None
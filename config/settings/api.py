@@ -0,0 +1,17 @@
+from config.settings.base import *
+
+
+# Profile for nodes serving the JWT API. Requests under API_PATH_PREFIXES
+# skip the session, CSRF, auth and messages middleware; the admin and any
+# other path keep the full stack.
+
+API_PATH_PREFIXES = ["/api/"]
+
+API_EXEMPT_MIDDLEWARE = {
+    "django.contrib.sessions.middleware.SessionMiddleware": "users.middleware.ApiExemptSessionMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware": "users.middleware.ApiExemptCsrfViewMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware": "users.middleware.ApiExemptAuthenticationMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware": "users.middleware.ApiExemptMessageMiddleware",
+}
+
+MIDDLEWARE = [API_EXEMPT_MIDDLEWARE.get(name, name) for name in MIDDLEWARE]
@@ -10,6 +10,9 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 
+import os
+import tempfile
+
 from datetime import timedelta
 from pathlib import Path
 
@@ -48,6 +51,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "users.middleware.MetricsMiddleware",
+    "users.middleware.ProfilingMiddleware",
+    "users.middleware.ReplicaPinningMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -83,6 +89,27 @@ WSGI_APPLICATION = "config.wsgi.application"
 
 DATABASES = {"default": secrets_viewer.get_secret("DATABASE")}
 
+# Pool sizing for the "config.db.backends.postgresql_pool" engine, see
+# config/db/backends/postgresql_pool/pool.py for the available keys.
+DATABASES["default"].setdefault("POOL", secrets_viewer.get_secret("DATABASE_POOL", {}))
+
+# Read replicas as {alias: DATABASES entry}. User lookups are routed to them
+# by config.db.routers.ReplicaRouter; tests run them as mirrors of default.
+DATABASE_REPLICAS = secrets_viewer.get_secret("DATABASE_REPLICAS", {})
+
+for alias, replica in DATABASE_REPLICAS.items():
+    replica.setdefault("TEST", {"MIRROR": "default"})
+    DATABASES[alias] = replica
+
+DATABASE_ROUTERS = ["config.db.routers.ReplicaRouter"]
+
+REPLICA_ROUTER = {
+    "REPLICAS": list(DATABASE_REPLICAS),
+    "MODELS": ["users.User"],
+    "READ_YOUR_WRITES_SECONDS": 5,
+    "PIN_COOKIE_NAME": "use_primary_db",
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -133,13 +160,55 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 AUTH_USER_MODEL = "users.User"
 
 
+# Test runner
+
+TEST_RUNNER = "tests.runner.TestRunner"
+
+
 # Django Rest Framework
 
 REST_FRAMEWORK = {
     "NONE_FIELD_ERRORS_KEY": "error",
-    "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+    "DEFAULT_AUTHENTICATION_CLASSES": ("users.authentication.CachedJWTAuthentication",),
+    # orjson-backed drop-ins for the JSON renderer and parser; they fall
+    # back to the standard library when orjson is not installed.
+    "DEFAULT_RENDERER_CLASSES": (
+        "users.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "users.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
     ),
+    # Token buckets for views with a `throttle_scope`, see THROTTLING.
+    "DEFAULT_THROTTLE_CLASSES": ("users.throttling.TokenBucketThrottle",),
+}
+
+# Token-bucket rates per view scope, for each client IP and for each
+# user. Kakao users are keyed by the Kakao id their id_token claims;
+# requests with only an access_token are limited per token, not per
+# account, since the token changes on every Kakao login. Set BACKEND to
+# "cache" to share the buckets between workers through CACHE.
+THROTTLING = {
+    "BACKEND": "local",
+    "CACHE": "default",
+    "RATES": {
+        "login": {"ip": "30/min", "user": "5/min"},
+        "registration": {"ip": "10/min", "user": "5/min"},
+        "batch-registration": {"ip": "5/min"},
+        "kakao-login": {"ip": "30/min", "user": "5/min"},
+        "kakao-registration": {"ip": "10/min", "user": "5/min"},
+    },
+}
+
+# Users resolved from JWTs are cached for TIMEOUT seconds. Changes to a
+# user only evict the entry from the cache of the worker making them; with
+# the per-process "default" cache the other workers may keep the old user
+# until TIMEOUT expires. Use a shared cache here to avoid that.
+AUTH_USER_CACHE = {
+    "CACHE": "default",
+    "TIMEOUT": 30,
 }
 
 
@@ -147,8 +216,45 @@ REST_FRAMEWORK = {
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=5),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
+    "ROTATE_REFRESH_TOKENS": True,
     "ALGORITHM": "HS256",
     "SIGNING_KEY": SECRET_KEY,
+    "AUTH_TOKEN_CLASSES": ("users.tokens.AccessToken",),
+    "TOKEN_OBTAIN_SERIALIZER": "users.serializers.TokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "users.serializers.TokenRefreshSerializer",
+}
+
+# last_login is buffered and written in bulk by users.last_login for every
+# login path, instead of simplejwt's UPDATE_LAST_LOGIN write per login.
+
+LAST_LOGIN = {
+    "FLUSH_SECONDS": 10,
+    "MAX_PENDING": 1000,
+    "FLUSH_IN_BACKGROUND": True,
+}
+
+# Refresh tokens replaced by rotation are revoked. Revocations are kept in
+# an in-process Bloom filter backed by the RevokedToken table, see
+# users/revocation.py.
+
+TOKEN_REVOCATION = {
+    "CAPACITY": 100000,
+    "ERROR_RATE": 0.001,
+    "SYNC_SECONDS": 30,
+    "SWEEP_SECONDS": 3600,
+}
+
+# Asymmetric signing so other services can verify tokens with the public
+# keys served at /api/v1/auth/.well-known/jwks.json. KEYS entries look like
+# {"KID": ..., "ALGORITHM": "RS256" or "EdDSA", "PRIVATE_KEY": PEM,
+# "PUBLIC_KEY": PEM}; retired keys keep only PUBLIC_KEY until their tokens
+# expire. With no keys, tokens stay HS256 signed with SIGNING_KEY.
+
+JWT_SIGNING = {
+    "ACTIVE_KID": secrets_viewer.get_secret("JWT_ACTIVE_KID", None),
+    "KEYS": secrets_viewer.get_secret("JWT_KEYS", []),
+    "ACCEPT_HS256": True,
+    "JWKS_MAX_AGE": 300,
 }
 
 
@@ -165,3 +271,106 @@ EMAIL_PORT = email_secrets["PORT"]
 EMAIL_HOST_USER = email_secrets["HOST_USER"]
 
 EMAIL_HOST_PASSWORD = email_secrets["HOST_PASSWORD"]
+
+
+# Kakao REST API client (one pooled keep-alive session per process)
+
+KAKAO_API = {
+    "BASE_URL": "https://kapi.kakao.com",
+    "CONNECT_TIMEOUT": 3.05,
+    "READ_TIMEOUT": 5,
+    "POOL_CONNECTIONS": 4,
+    "POOL_MAXSIZE": 32,
+    "POOL_BLOCK": False,
+    "PROFILE_CACHE": "kakao",
+}
+
+# Kakao Login OIDC: id_tokens sent to the Kakao views are verified locally
+# against kauth.kakao.com's JWKS, kept in memory, instead of asking
+# kapi.kakao.com about the access token. AUDIENCE lists the app's REST API
+# keys; id_tokens are refused while it is empty.
+
+KAKAO_OIDC = {
+    "ISSUER": "https://kauth.kakao.com",
+    "JWKS_URL": "https://kauth.kakao.com/.well-known/jwks.json",
+    "AUDIENCE": secrets_viewer.get_secret("KAKAO_OIDC_AUDIENCE", []),
+    "ALGORITHMS": ["RS256"],
+    "LEEWAY": 30,
+    "JWKS_REFRESH_SECONDS": 3600,
+    "JWKS_MIN_REFRESH_SECONDS": 60,
+}
+
+# Serve the Kakao views with native async implementations. config/asgi.py
+# turns this on so those views never park a worker thread on Kakao.
+
+ASYNC_KAKAO_VIEWS = os.environ.get("DJANGO_ASYNC_KAKAO_VIEWS") == "1"
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "kakao": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "kakao-profiles",
+        "TIMEOUT": 30,
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
+}
+
+
+# Email outbox, drained by `manage.py send_outbox_emails`
+
+EMAIL_OUTBOX = {
+    "BATCH_SIZE": 50,
+    "MAX_ATTEMPTS": 5,
+    "BACKOFF_SECONDS": 30,
+    "MAX_BACKOFF_SECONDS": 3600,
+}
+
+
+# Unverified users older than MAX_AGE_DAYS, removed by
+# `manage.py sweep_unverified_users` (run it daily from cron)
+
+UNVERIFIED_SWEEP = {
+    "MAX_AGE_DAYS": 7,
+    "BATCH_SIZE": 500,
+    "SLEEP_SECONDS": 0.5,
+}
+
+# Username/nickname availability: in-process Bloom filters answer most
+# checks without a query and are rebuilt from the database every
+# REBUILD_SECONDS, in a background thread.
+
+NAME_AVAILABILITY = {
+    "FIELDS": ["username", "nickname"],
+    "CAPACITY": 100000,
+    "ERROR_RATE": 0.01,
+    "REBUILD_SECONDS": 600,
+    "REBUILD_IN_BACKGROUND": True,
+}
+
+
+# On-demand profiling: requests carrying a HEADER value printed by
+# `manage.py profiles sign`, plus a SAMPLE_RATE fraction of all requests,
+# are profiled into a ring of at most MAX_FILES profiles in DIRECTORY.
+
+PROFILING = {
+    "SAMPLE_RATE": 0.0,
+    "HEADER": "X-Profile",
+    "HEADER_MAX_AGE": 3600,
+    "DIRECTORY": os.path.join(tempfile.gettempdir(), "profiles"),
+    "MAX_FILES": 200,
+    "MAX_QUERIES": 500,
+    "TOP_FUNCTIONS": 30,
+}
+
+# /metrics is only served to clients in ALLOWED_NETWORKS (by REMOTE_ADDR),
+# or to those sending "Authorization: Bearer <TOKEN>".
+METRICS = {
+    "ALLOWED_NETWORKS": ["127.0.0.0/8", "::1/128"],
+    "TOKEN": secrets_viewer.get_secret("METRICS_TOKEN", None),
+}
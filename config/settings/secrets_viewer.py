@@ -5,6 +5,9 @@ from pathlib import Path
 from django.core.exceptions import ImproperlyConfigured
 
 
+NOT_PROVIDED = object()
+
+
 class SecretsViewer:
     def __init__(self):
         self.BASE_DIR = Path(__file__).resolve().parent.parent.parent
@@ -12,9 +15,11 @@ class SecretsViewer:
         with open(self.secret_file) as f:
             self.secrets = json.loads(f.read())
 
-    def get_secret(self, settings):
+    def get_secret(self, settings, default=NOT_PROVIDED):
         try:
             return self.secrets[settings]
         except KeyError:
+            if default is not NOT_PROVIDED:
+                return default
             error_msg = f"Set the {settings} environment variable."
             raise ImproperlyConfigured(error_msg)
@@ -17,7 +17,10 @@ from django.contrib import admin
 from django.urls import include
 from django.urls import path
 
+from users.views import metrics_view
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/v1/auth/", include("users.urls")),
+    path("metrics", metrics_view, name="metrics"),
 ]
@@ -0,0 +1,69 @@
+import threading
+
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+from psycopg2 import extensions
+
+from config.db.backends.postgresql_pool.pool import ConnectionPool
+from config.db.backends.postgresql_pool.pool import PoolTimeout
+
+
+class FakeConnection:
+    class Info:
+        transaction_status = extensions.TRANSACTION_STATUS_IDLE
+
+    def __init__(self, **kwargs):
+        self.closed = 0
+        self.info = self.Info()
+
+    def close(self):
+        self.closed = 1
+
+    def rollback(self):
+        pass
+
+
+@patch("psycopg2_pool.psycopg2._connect", FakeConnection)
+class ConnectionPoolTest(SimpleTestCase):
+    def test_success_reusing_returned_connection(self):
+        pool = ConnectionPool("dbname=test", MIN_SIZE=0, MAX_SIZE=2)
+
+        conn = pool.getconn()
+        pool.putconn(conn)
+
+        self.assertIs(pool.getconn(), conn)
+        self.assertEqual(pool.get_stats()["checkouts"], 2)
+
+    def test_success_waiting_for_returned_connection(self):
+        pool = ConnectionPool("dbname=test", MIN_SIZE=0, MAX_SIZE=1, TIMEOUT=5)
+        conn = pool.getconn()
+
+        timer = threading.Timer(0.05, pool.putconn, args=(conn,))
+        timer.start()
+        self.addCleanup(timer.cancel)
+
+        self.assertIs(pool.getconn(), conn)
+        stats = pool.get_stats()
+        self.assertEqual(stats["waits"], 1)
+        self.assertGreater(stats["wait_seconds"], 0)
+
+    def test_fail_checkout_when_pool_stays_exhausted(self):
+        pool = ConnectionPool("dbname=test", MIN_SIZE=0, MAX_SIZE=1, TIMEOUT=0.05)
+        conn = pool.getconn()
+
+        with self.assertRaises(PoolTimeout):
+            pool.getconn()
+        self.assertEqual(pool.get_stats()["timeouts"], 1)
+        self.assertEqual(pool.get_stats()["in_use"], 1)
+        pool.putconn(conn)
+
+    def test_success_recycling_expired_connection(self):
+        pool = ConnectionPool("dbname=test", MIN_SIZE=0, MAX_SIZE=1, MAX_LIFETIME=0)
+
+        conn = pool.getconn()
+        pool.putconn(conn)
+
+        self.assertTrue(conn.closed)
+        self.assertIsNot(pool.getconn(), conn)
+        self.assertEqual(pool.get_stats()["recycled"], 1)
@@ -0,0 +1,100 @@
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.db import transaction
+from django.test import TestCase
+from django.test import override_settings
+from django.urls import reverse
+
+from rest_framework import status
+
+from config.db.routers import routing_context
+
+
+REPLICA = "replica"
+
+
+@override_settings(REPLICA_ROUTER={"REPLICAS": [REPLICA]})
+class ReplicaRouterTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # A second, in-memory SQLite database standing in for a replica. It
+        # only exists while this test case runs, so the test runner does not
+        # know the alias; it is created (and migrated) here, before
+        # REPLICA_ROUTER keeps migrations off it.
+        connections.settings[REPLICA] = {
+            **connections.settings["default"],
+            "TEST": {**connections.settings["default"]["TEST"], "NAME": None},
+        }
+        cls.replica_name = connections[REPLICA].settings_dict["NAME"]
+        connections[REPLICA].creation.create_test_db(verbosity=0, serialize=False)
+        cls.databases = {"default", REPLICA}
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[REPLICA].creation.destroy_test_db(cls.replica_name, verbosity=0)
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(
+            username="username",
+            nickname="primary",
+            password="password",
+            email="email@email.com",
+        )
+        # Same row on the replica with another nickname, so reads show
+        # which database answered.
+        replica_user = User.objects.using("default").get(pk=self.user.pk)
+        replica_user.nickname = "replica"
+        replica_user.save(using=REPLICA, force_insert=True)
+
+    def get_nickname(self):
+        return get_user_model().objects.get(username="username").nickname
+
+    def test_success_read_from_replica(self):
+        with routing_context():
+            self.assertEqual(self.get_nickname(), "replica")
+
+    def test_success_read_your_writes(self):
+        with routing_context():
+            get_user_model().objects.filter(pk=self.user.pk).update(nickname="updated")
+
+            self.assertEqual(self.get_nickname(), "updated")
+
+    @override_settings(
+        REPLICA_ROUTER={"REPLICAS": [REPLICA], "READ_YOUR_WRITES_SECONDS": 0}
+    )
+    def test_success_read_from_replica_after_window(self):
+        with routing_context():
+            get_user_model().objects.filter(pk=self.user.pk).update(nickname="updated")
+
+            self.assertEqual(self.get_nickname(), "replica")
+
+    def test_success_read_from_primary_in_transaction(self):
+        with routing_context(), transaction.atomic():
+            self.assertEqual(self.get_nickname(), "primary")
+
+    def test_success_login_after_registration(self):
+        response = self.client.post(
+            reverse("registration"),
+            data={
+                "username": "newuser",
+                "nickname": "newnickname",
+                "password": "password",
+                "email": "new@email.com",
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIn("use_primary_db", response.cookies)
+
+        login_data = {"username": "newuser", "password": "password"}
+        response = self.client.post(reverse("login"), data=login_data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # Without the cookie the login reads the replica, which lags behind.
+        self.client.cookies.clear()
+        response = self.client.post(reverse("login"), data=login_data)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+
+
+class TestRunner(DiscoverRunner):
+    """Run the suite without the last_login flusher thread.
+
+    Its own database connection would write while test cases hold their
+    transactions open; tests flush the buffer themselves instead.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.settings_override = override_settings(
+            LAST_LOGIN={
+                **getattr(settings, "LAST_LOGIN", {}),
+                "FLUSH_IN_BACKGROUND": False,
+            }
+        )
+        self.settings_override.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.settings_override.disable()
+        super().teardown_test_environment(**kwargs)
@@ -0,0 +1,113 @@
+from unittest.mock import patch
+
+from django.contrib.admin.sites import site
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.test import RequestFactory
+from django.test import TestCase
+from django.urls import reverse
+
+from users.admin import EstimatedCountPaginator
+from users.admin import UserAdmin
+
+
+class UserAdminTest(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.admin_user = User.objects.create_superuser(
+            username="admin", nickname="admin", password="password"
+        )
+        for i in range(3):
+            User.objects.create_user(
+                username=f"user{i}",
+                nickname=f"nickname{i}",
+                email=f"user{i}@email.com",
+                password="password",
+                is_verified=False,
+            )
+        self.client.force_login(self.admin_user)
+        self.changelist_url = reverse("admin:users_user_changelist")
+        self.model_admin = UserAdmin(User, site)
+
+    def test_success_changelist_with_exact_search_and_filters(self):
+        response = self.client.get(self.changelist_url, data={"q": "user1"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [user.username for user in response.context["cl"].result_list], ["user1"]
+        )
+
+        response = self.client.get(
+            self.changelist_url,
+            data={"is_verified__exact": "0", "registration_type__exact": "email"},
+        )
+        self.assertEqual(response.context["cl"].result_count, 3)
+
+    def test_success_partial_search_does_not_match(self):
+        response = self.client.get(self.changelist_url, data={"q": "user"})
+        self.assertEqual(response.context["cl"].result_count, 0)
+
+    def test_success_verify_users_action(self):
+        queryset = get_user_model().objects.filter(username__startswith="user")
+        request = RequestFactory().post(self.changelist_url)
+
+        with patch.object(self.model_admin, "message_user"):
+            # The primary keys to evict from the user cache, then the UPDATE.
+            with self.assertNumQueries(2):
+                self.model_admin.verify_users(request, queryset)
+
+        self.assertFalse(get_user_model().objects.filter(is_verified=False).exists())
+
+    def test_success_deactivate_users_action(self):
+        response = self.client.post(
+            self.changelist_url,
+            data={
+                "action": "deactivate_users",
+                "_selected_action": list(
+                    get_user_model()
+                    .objects.filter(username__in=["user0", "user1"])
+                    .values_list("pk", flat=True)
+                ),
+            },
+        )
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(
+            set(
+                get_user_model()
+                .objects.filter(is_active=False)
+                .values_list("username", flat=True)
+            ),
+            {"user0", "user1"},
+        )
+
+    def test_success_estimating_count_on_postgresql(self):
+        queryset = get_user_model().objects.order_by("pk")
+        plan = '[{"Plan": {"Plan Rows": 2000000}}]'
+
+        with patch.object(connections["default"], "vendor", "postgresql"):
+            with patch.object(type(queryset), "explain", return_value=plan):
+                with self.assertNumQueries(0):
+                    count = EstimatedCountPaginator(queryset, 100).count
+
+        self.assertEqual(count, 2000000)
+
+    def test_success_counting_small_results_exactly(self):
+        queryset = get_user_model().objects.order_by("pk")
+        plan = '[{"Plan": {"Plan Rows": 12}}]'
+
+        with patch.object(connections["default"], "vendor", "postgresql"):
+            with patch.object(type(queryset), "explain", return_value=plan):
+                count = EstimatedCountPaginator(queryset, 100).count
+
+        self.assertEqual(count, 4)
+
+    def test_success_counting_filtered_results_exactly(self):
+        queryset = get_user_model().objects.filter(username="user0").order_by("pk")
+        plan = '[{"Plan": {"Plan Rows": 2000000}}]'
+
+        with patch.object(connections["default"], "vendor", "postgresql"):
+            with patch.object(type(queryset), "explain", return_value=plan) as explain:
+                count = EstimatedCountPaginator(queryset, 100).count
+
+        self.assertEqual(count, 1)
+        explain.assert_not_called()
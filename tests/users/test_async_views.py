@@ -0,0 +1,93 @@
+import json
+
+from unittest.mock import AsyncMock
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import AsyncRequestFactory
+from django.test import TestCase
+
+from rest_framework import status
+
+from users.last_login import last_login_buffer
+from users.views import AsyncKakaoLogInView
+from users.views import AsyncKakaoRegistrationView
+
+
+class MockKakaoResponse:
+    def __init__(self, status_code=200, kakao_id=123456789):
+        self.status_code = status_code
+        self.kakao_id = kakao_id
+
+    def json(self):
+        return {"id": self.kakao_id, "kakao_account": {"email": "sample@email.com"}}
+
+
+@patch("users.utils.kakao_async_client")
+class AsyncKakaoViewTest(TestCase):
+    def setUp(self):
+        caches["kakao"].clear()
+        self.factory = AsyncRequestFactory()
+        self.login_view = AsyncKakaoLogInView.as_view()
+        self.registration_view = AsyncKakaoRegistrationView.as_view()
+        self.registration_form = {
+            "access_token": "token",
+            "nickname": "nickname",
+            "favorate_race": "zerg",
+        }
+
+    async def post(self, view, data):
+        request = self.factory.post(
+            "/", data=json.dumps(data), content_type="application/json"
+        )
+        response = await view(request)
+        return response, json.loads(response.content)
+
+    async def test_success_kakao_registration_and_login(self, mock_kakao_api):
+        mock_kakao_api.get = AsyncMock(return_value=MockKakaoResponse())
+
+        response, data = await self.post(self.registration_view, self.registration_form)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue("access" in data)
+        self.assertTrue(
+            await get_user_model()
+            .objects.filter(kakao_id=123456789, registration_type="kakao")
+            .aexists()
+        )
+
+        last_login_buffer.reset()
+        response, data = await self.post(self.login_view, {"access_token": "token"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue("refresh" in data)
+        user = await get_user_model().objects.aget(kakao_id=123456789)
+        self.assertIn(user.pk, last_login_buffer.pending)
+        self.assertEqual(mock_kakao_api.get.await_count, 1)
+
+    async def test_fail_kakao_registration_with_already_exist_user(
+        self, mock_kakao_api
+    ):
+        mock_kakao_api.get = AsyncMock(return_value=MockKakaoResponse())
+
+        response, _ = await self.post(self.registration_view, self.registration_form)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response, _ = await self.post(self.registration_view, self.registration_form)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_fail_kakao_login_with_wrong_access_token(self, mock_kakao_api):
+        mock_kakao_api.get = AsyncMock(return_value=MockKakaoResponse(401))
+
+        response, _ = await self.post(self.login_view, {"access_token": "token"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_fail_kakao_login_with_no_exist_user(self, mock_kakao_api):
+        mock_kakao_api.get = AsyncMock(return_value=MockKakaoResponse())
+
+        response, data = await self.post(self.login_view, {"access_token": "token"})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(data, "가입되지 않은 사용자입니다.")
+
+    async def test_fail_kakao_login_without_access_token(self, mock_kakao_api):
+        response, _ = await self.post(self.login_view, {})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
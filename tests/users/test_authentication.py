@@ -0,0 +1,59 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+
+from rest_framework.test import APIRequestFactory
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from users.authentication import CachedJWTAuthentication
+
+
+class CachedJWTAuthenticationTest(APITestCase):
+    def setUp(self):
+        caches["default"].clear()
+        self.user = get_user_model().objects.create_user(
+            username="username",
+            nickname="nickname",
+            password="password",
+            email="email@email.com",
+        )
+        access_token = RefreshToken.for_user(self.user).access_token
+        self.request = APIRequestFactory().get(
+            "/", HTTP_AUTHORIZATION=f"Bearer {access_token}"
+        )
+        self.authentication = CachedJWTAuthentication()
+
+    def test_success_authentication_from_cache(self):
+        with self.assertNumQueries(1):
+            user, _ = self.authentication.authenticate(self.request)
+        self.assertEqual(user.pk, self.user.pk)
+
+        with self.assertNumQueries(0):
+            user, _ = self.authentication.authenticate(self.request)
+        self.assertEqual(user.pk, self.user.pk)
+
+    def test_fail_authentication_after_deactivation(self):
+        self.authentication.authenticate(self.request)
+
+        self.user.is_active = False
+        self.user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.authenticate(self.request)
+
+    def test_fail_authentication_after_queryset_update(self):
+        self.authentication.authenticate(self.request)
+
+        get_user_model().objects.filter(pk=self.user.pk).update(is_active=False)
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.authenticate(self.request)
+
+    def test_fail_authentication_after_deletion(self):
+        self.authentication.authenticate(self.request)
+
+        get_user_model().objects.filter(pk=self.user.pk).delete()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.authenticate(self.request)
@@ -0,0 +1,128 @@
+from django.contrib.auth import get_user_model
+from django.db.models import QuerySet
+from django.test import SimpleTestCase
+from django.test import TransactionTestCase
+from django.test import override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from users.availability import name_index
+from users.bloom import BloomFilter
+
+
+class BloomFilterTest(SimpleTestCase):
+    def test_success_no_false_negatives(self):
+        bloom_filter = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom_filter.add(f"user{i}")
+
+        for i in range(1000):
+            self.assertIn(f"user{i}", bloom_filter)
+
+    def test_success_false_positive_rate(self):
+        bloom_filter = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom_filter.add(f"user{i}")
+
+        false_positives = sum(f"other{i}" in bloom_filter for i in range(10000))
+        self.assertLess(false_positives, 300)
+
+
+# A background rebuild could not see the rows of the test's transaction.
+@override_settings(NAME_AVAILABILITY={"REBUILD_IN_BACKGROUND": False})
+class NameAvailabilityTest(APITestCase):
+    def setUp(self):
+        self.availability_url = reverse("availability")
+        get_user_model().objects.create_user(
+            username="user01", nickname="nickname01", password="password01"
+        )
+        name_index.reset()
+
+    def tearDown(self):
+        name_index.reset()
+
+    def test_success_available_name_without_query(self):
+        name_index.rebuild()
+
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                self.availability_url, data={"username": "user02"}
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"username": True})
+
+    def test_success_taken_name(self):
+        response = self.client.get(
+            self.availability_url,
+            data={"username": "user01", "nickname": "nickname02"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"username": False, "nickname": True})
+
+    def test_success_name_taken_after_building(self):
+        name_index.rebuild()
+
+        get_user_model().objects.create_user(
+            username="user02", nickname="nickname02", password="password02"
+        )
+        get_user_model().objects.bulk_create_users(
+            [{"username": "user03", "nickname": "nickname03"}]
+        )
+
+        for data in [{"nickname": "nickname02"}, {"username": "user03"}]:
+            response = self.client.get(self.availability_url, data=data)
+            self.assertEqual(response.data, {name: False for name in data})
+
+    def test_success_kakao_user_taken_after_building(self):
+        name_index.rebuild()
+
+        # Kakao users get their numeric Kakao id as username.
+        get_user_model().objects.create_kakao_user(kakao_id=1234, nickname="nickname02")
+
+        response = self.client.get(self.availability_url, data={"username": "1234"})
+        self.assertEqual(response.data, {"username": False})
+
+    @override_settings(
+        NAME_AVAILABILITY={"REBUILD_SECONDS": 0, "REBUILD_IN_BACKGROUND": False}
+    )
+    def test_success_rebuilding_stale_filters(self):
+        name_index.rebuild()
+        # Skip UserQuerySet.bulk_create, as if another process created it.
+        User = get_user_model()
+        QuerySet.bulk_create(
+            User.objects.all(), [User(username="user02", nickname="nickname02")]
+        )
+
+        response = self.client.get(self.availability_url, data={"username": "user02"})
+        self.assertEqual(response.data, {"username": False})
+
+    def test_fail_availability_without_name(self):
+        response = self.client.get(self.availability_url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class BackgroundRebuildTest(TransactionTestCase):
+    def setUp(self):
+        self.availability_url = reverse("availability")
+        get_user_model().objects.create_user(
+            username="user01", nickname="nickname01", password="password01"
+        )
+        name_index.reset()
+        self.addCleanup(name_index.reset)
+
+    def test_success_answering_while_rebuilding_in_background(self):
+        # No filters yet: the request starts the rebuild and asks the database.
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                self.availability_url, data={"username": "user01"}
+            )
+        self.assertEqual(response.data, {"username": False})
+
+        name_index.thread.join()
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                self.availability_url, data={"username": "user02"}
+            )
+        self.assertEqual(response.data, {"username": True})
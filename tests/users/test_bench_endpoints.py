@@ -0,0 +1,35 @@
+import json
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TransactionTestCase
+
+from users import urls as users_urls
+
+
+class BenchEndpointsCommandTest(TransactionTestCase):
+    def test_success_bench_endpoints(self):
+        stdout = StringIO()
+        call_command(
+            "bench_endpoints",
+            requests=2,
+            concurrency=1,
+            seed_users=2,
+            use_current_database=True,
+            stdout=stdout,
+        )
+
+        report = json.loads(stdout.getvalue())
+        self.assertEqual(
+            set(report["routes"]),
+            {pattern.name for pattern in users_urls.urlpatterns},
+        )
+        for name, result in report["routes"].items():
+            self.assertEqual(result["requests"], 2, name)
+            self.assertEqual(result["errors"], 0, name)
+
+    def test_fail_bench_unknown_route(self):
+        with self.assertRaises(CommandError):
+            call_command("bench_endpoints", routes="unknown", stdout=StringIO())
@@ -0,0 +1,143 @@
+import json
+import os
+import tempfile
+
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.test import override_settings
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class ImportUsersTest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        get_user_model().objects.create_user(
+            username="taken", nickname="taken", email="taken@email.com"
+        )
+
+    def write_jsonl(self, rows):
+        path = os.path.join(self.directory.name, "users.jsonl")
+        with open(path, "w") as f:
+            for row in rows:
+                f.write(json.dumps(row) + "\n")
+        return path
+
+    def import_users(self, path, *args):
+        stdout, stderr = StringIO(), StringIO()
+        call_command(
+            "import_users", path, "--workers", "0", *args, stdout=stdout, stderr=stderr
+        )
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_success_importing_users_in_batches(self):
+        path = os.path.join(self.directory.name, "users.csv")
+        with open(path, "w") as f:
+            f.write("username,nickname,email,favorate_race,password\n")
+            for i in range(5):
+                f.write(f"user{i},nick{i},user{i}@email.com,zerg,password{i}\n")
+
+        stdout, _ = self.import_users(path, "--batch-size", "2")
+
+        self.assertIn("Imported 5 users, skipped 0.", stdout)
+        user = get_user_model().objects.get(username="user3")
+        self.assertTrue(user.check_password("password3"))
+        self.assertEqual(user.favorate_race, "zerg")
+
+    def test_success_skipping_conflicting_and_invalid_rows(self):
+        path = self.write_jsonl(
+            [
+                {"username": "new", "nickname": "new", "password": "password"},
+                {"username": "taken", "nickname": "other"},
+                {"username": "again", "nickname": "new"},
+                {"username": "bad", "nickname": "bad", "favorate_race": "elf"},
+            ]
+        )
+
+        stdout, stderr = self.import_users(path)
+
+        self.assertIn("Imported 1 users, skipped 3.", stdout)
+        self.assertIn("line 2: skipped, already exists: username", stderr)
+        self.assertIn("line 3: skipped, already exists: nickname", stderr)
+        self.assertIn("line 4: skipped, invalid favorate_race", stderr)
+
+    def test_success_skipping_too_long_values(self):
+        path = self.write_jsonl(
+            [
+                {"username": "u" * 101, "nickname": "nick0"},
+                {
+                    "username": "user1",
+                    "nickname": "nick1",
+                    "email": "a" * 250 + "@b.com",
+                },
+                {"username": "user2", "nickname": "nick2"},
+            ]
+        )
+
+        stdout, stderr = self.import_users(path)
+
+        self.assertIn("Imported 1 users, skipped 2.", stdout)
+        self.assertIn("line 1: skipped, username longer than 100 characters", stderr)
+        self.assertIn("line 2: skipped, email longer than 254 characters", stderr)
+
+    def test_success_reporting_rows_still_conflicting_on_retry(self):
+        path = self.write_jsonl(
+            [
+                {"username": "user0", "nickname": "nick0"},
+                {"username": "taken", "nickname": "nick1"},
+                {"username": "user2", "nickname": "nick2"},
+            ]
+        )
+
+        # As if "taken" were registered again between each check and insert.
+        with mock.patch(
+            "users.management.commands.import_users.Command.drop_conflicts",
+            lambda self, rows: rows,
+        ):
+            stdout, stderr = self.import_users(path)
+
+        self.assertIn("Imported 2 users, skipped 1.", stdout)
+        self.assertIn("line 2: skipped, already exists", stderr)
+        self.assertTrue(get_user_model().objects.filter(username="user2").exists())
+
+    def test_success_skipping_malformed_jsonl_lines(self):
+        path = os.path.join(self.directory.name, "users.jsonl")
+        with open(path, "w") as f:
+            f.write('{"username": "user0", "nickname": "nick0"}\n')
+            f.write('{"username": "user1", \n')
+            f.write('["user2", "nick2"]\n')
+            f.write('{"username": "user3", "nickname": "nick3"}\n')
+
+        stdout, stderr = self.import_users(path)
+
+        self.assertIn("Imported 2 users, skipped 2.", stdout)
+        self.assertIn("line 2: skipped, invalid JSON", stderr)
+        self.assertIn("line 3: skipped, not a JSON object", stderr)
+
+    def test_success_reporting_csv_file_lines(self):
+        path = os.path.join(self.directory.name, "users.csv")
+        with open(path, "w") as f:
+            f.write("username,nickname,email\n")
+            f.write('user0,"multi\nline",user0@email.com\n')
+            f.write("user1,taken,user1@email.com\n")
+
+        _, stderr = self.import_users(path)
+
+        self.assertIn("line 4: skipped, already exists: nickname", stderr)
+
+    def test_success_resuming_from_checkpoint(self):
+        path = self.write_jsonl(
+            [{"username": f"user{i}", "nickname": f"nick{i}"} for i in range(4)]
+        )
+        with open(f"{path}.checkpoint", "w") as f:
+            json.dump({"line": 2, "imported": 2, "skipped": 0}, f)
+
+        stdout, _ = self.import_users(path, "--resume")
+
+        self.assertIn("Imported 4 users, skipped 0.", stdout)
+        self.assertFalse(get_user_model().objects.filter(username="user0").exists())
+        self.assertTrue(get_user_model().objects.filter(username="user3").exists())
@@ -0,0 +1,174 @@
+import jwt
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519
+from cryptography.hazmat.primitives.asymmetric import rsa
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIRequestFactory
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken as HS256RefreshToken
+
+from users.authentication import CachedJWTAuthentication
+from users.jwks import key_ring
+from users.utils import create_token_with_user
+
+
+def generate_private_key(algorithm):
+    if algorithm == "RS256":
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    else:
+        private_key = ed25519.Ed25519PrivateKey.generate()
+    return private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode()
+
+
+def get_public_key(private_pem):
+    private_key = serialization.load_pem_private_key(private_pem.encode(), None)
+    return (
+        private_key.public_key()
+        .public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode()
+    )
+
+
+RSA_KEY = generate_private_key("RS256")
+ED25519_KEY = generate_private_key("EdDSA")
+
+KEYS = [
+    {"KID": "2022-10-rsa", "ALGORITHM": "RS256", "PRIVATE_KEY": RSA_KEY},
+    {"KID": "2022-10-ed25519", "ALGORITHM": "EdDSA", "PRIVATE_KEY": ED25519_KEY},
+]
+
+
+@override_settings(JWT_SIGNING={"KEYS": KEYS, "ACTIVE_KID": "2022-10-rsa"})
+class KeyRingTest(APITestCase):
+    def setUp(self):
+        key_ring.reset()
+        self.user = get_user_model().objects.create_user(
+            username="username",
+            nickname="nickname",
+            password="password",
+            email="email@email.com",
+        )
+
+    def tearDown(self):
+        key_ring.reset()
+
+    def authenticate(self, access_token):
+        request = APIRequestFactory().get(
+            "/", HTTP_AUTHORIZATION=f"Bearer {access_token}"
+        )
+        return CachedJWTAuthentication().authenticate(request)
+
+    def test_success_jwks(self):
+        response = self.client.get(reverse("jwks"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("max-age=300", response["Cache-Control"])
+        keys = {jwk["kid"]: jwk for jwk in response.json()["keys"]}
+        self.assertEqual(keys["2022-10-rsa"]["kty"], "RSA")
+        self.assertEqual(keys["2022-10-ed25519"]["crv"], "Ed25519")
+        for jwk in keys.values():
+            self.assertNotIn("d", jwk)
+
+    def test_success_verify_token_with_jwks(self):
+        access_token = create_token_with_user(self.user)["access"]
+
+        header = jwt.get_unverified_header(access_token)
+        self.assertEqual(header["kid"], "2022-10-rsa")
+        self.assertEqual(header["alg"], "RS256")
+
+        jwks = jwt.PyJWKSet.from_dict(self.client.get(reverse("jwks")).json())
+        public_key = next(key for key in jwks.keys if key.key_id == header["kid"])
+        payload = jwt.decode(access_token, public_key.key, algorithms=["RS256"])
+        self.assertEqual(payload["user_id"], self.user.pk)
+
+    @override_settings(JWT_SIGNING={"KEYS": KEYS, "ACTIVE_KID": "2022-10-ed25519"})
+    def test_success_eddsa_token(self):
+        access_token = create_token_with_user(self.user)["access"]
+
+        self.assertEqual(jwt.get_unverified_header(access_token)["alg"], "EdDSA")
+        user, _ = self.authenticate(access_token)
+        self.assertEqual(user.pk, self.user.pk)
+
+    def test_success_login_and_refresh(self):
+        response = self.client.post(
+            reverse("login"), data={"username": "username", "password": "password"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            jwt.get_unverified_header(response.data["refresh"])["kid"], "2022-10-rsa"
+        )
+
+        response = self.client.post(
+            reverse("token-refresh"), data={"refresh": response.data["refresh"]}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            jwt.get_unverified_header(response.data["access"])["kid"], "2022-10-rsa"
+        )
+
+    def test_success_verify_email_after_rotation(self):
+        access_token = create_token_with_user(self.user)["access"]
+
+        rotated_keys = [
+            {
+                "KID": "2022-10-rsa",
+                "ALGORITHM": "RS256",
+                "PUBLIC_KEY": get_public_key(RSA_KEY),
+            },
+            {
+                "KID": "2022-11-rsa",
+                "ALGORITHM": "RS256",
+                "PRIVATE_KEY": generate_private_key("RS256"),
+            },
+        ]
+        with self.settings(JWT_SIGNING={"KEYS": rotated_keys}):
+            key_ring.reset()
+            self.assertEqual(key_ring.active_key.kid, "2022-11-rsa")
+
+            response = self.client.get(
+                reverse("email-verification"), data={"token": access_token}
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.is_verified)
+
+    def test_fail_verify_email_with_unknown_kid(self):
+        access_token = create_token_with_user(self.user)["access"]
+
+        with self.settings(JWT_SIGNING={"KEYS": KEYS[1:]}):
+            key_ring.reset()
+            response = self.client.get(
+                reverse("email-verification"), data={"token": access_token}
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, "유효하지 않은 토큰입니다.")
+
+    def test_success_legacy_hs256_token(self):
+        access_token = HS256RefreshToken.for_user(self.user).access_token
+
+        user, _ = self.authenticate(access_token)
+        self.assertEqual(user.pk, self.user.pk)
+
+    @override_settings(JWT_SIGNING={"KEYS": KEYS, "ACCEPT_HS256": False})
+    def test_fail_legacy_hs256_token(self):
+        access_token = str(HS256RefreshToken.for_user(self.user).access_token)
+
+        response = self.client.get(
+            reverse("email-verification"), data={"token": access_token}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
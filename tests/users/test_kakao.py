@@ -0,0 +1,80 @@
+from django.core.cache import caches
+from django.test import SimpleTestCase
+from django.test import override_settings
+
+from users.exceptions import KakaoException
+from users.kakao import kakao_async_client
+from users.kakao import kakao_client
+from users.kakao import kakao_profile_cache
+from users.kakao_stub import get_stub_kakao_id
+from users.kakao_stub import start_stub_server
+from users.utils import afetch_kakao_user_data
+from users.utils import fetch_kakao_user_data
+from users.utils import invalidate_kakao_user_data
+
+
+class KakaoClientTest(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.stub_server = start_stub_server()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.stub_server.shutdown()
+        cls.stub_server.server_close()
+        kakao_client.reset()
+        super().tearDownClass()
+
+    def setUp(self):
+        caches["kakao"].clear()
+        kakao_client.reset()
+        kakao_profile_cache.reset()
+        override = override_settings(KAKAO_API={"BASE_URL": self.stub_server.base_url})
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_success_reusing_pooled_connection(self):
+        for i in range(3):
+            user_data = fetch_kakao_user_data(f"token{i}")
+            self.assertEqual(user_data["id"], get_stub_kakao_id(f"token{i}"))
+
+        stats = kakao_client.get_stats()
+        self.assertEqual(stats["requests"], 3)
+        self.assertEqual(stats["connections"], 1)
+        self.assertEqual(stats["reused_connections"], 2)
+
+    def test_success_skipping_network_for_cached_profile(self):
+        for _ in range(3):
+            fetch_kakao_user_data("token")
+
+        self.assertEqual(kakao_client.get_stats()["requests"], 1)
+        self.assertEqual(kakao_profile_cache.get_stats()["hits"], 2)
+
+        invalidate_kakao_user_data("token")
+        fetch_kakao_user_data("token")
+        self.assertEqual(kakao_client.get_stats()["requests"], 2)
+
+    async def test_success_fetching_asynchronously(self):
+        user_data = await afetch_kakao_user_data("token")
+        self.assertEqual(user_data["id"], get_stub_kakao_id("token"))
+
+        with self.assertRaises(KakaoException):
+            await afetch_kakao_user_data("invalid")
+        await kakao_async_client.aclose()
+
+    def test_fail_fetching_with_wrong_access_token(self):
+        with self.assertRaises(KakaoException):
+            fetch_kakao_user_data("invalid")
+
+    def test_fail_fetching_from_slow_upstream(self):
+        self.stub_server.delay = 0.5
+        self.addCleanup(setattr, self.stub_server, "delay", 0.0)
+
+        with override_settings(
+            KAKAO_API={"BASE_URL": self.stub_server.base_url, "READ_TIMEOUT": 0.1}
+        ):
+            with self.assertRaises(KakaoException):
+                fetch_kakao_user_data("token")
+
+        self.assertEqual(kakao_client.get_stats()["errors"], 1)
@@ -0,0 +1,143 @@
+import jwt
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from users.exceptions import KakaoException
+from users.kakao import kakao_async_client
+from users.kakao import kakao_client
+from users.kakao_oidc import averify_id_token
+from users.kakao_oidc import kakao_jwks
+from users.kakao_oidc import verify_id_token
+from users.kakao_stub import get_stub_kakao_id
+from users.kakao_stub import start_stub_server
+
+
+AUDIENCE = "rest-api-key"
+
+
+class KakaoIdTokenTest(APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.stub_server = start_stub_server()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.stub_server.shutdown()
+        cls.stub_server.server_close()
+        kakao_client.reset()
+        kakao_jwks.reset()
+        super().tearDownClass()
+
+    def setUp(self):
+        caches["kakao"].clear()
+        kakao_client.reset()
+        kakao_jwks.reset()
+        self.stub_server.jwks_requests = 0
+        override = override_settings(
+            KAKAO_API={"BASE_URL": self.stub_server.base_url},
+            KAKAO_OIDC={"JWKS_URL": self.stub_server.jwks_url, "AUDIENCE": [AUDIENCE]},
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_success_verifying_without_requests(self):
+        for i in range(3):
+            id_token = self.stub_server.issue_id_token(f"token{i}", AUDIENCE)
+            user_data = verify_id_token(id_token)
+            self.assertEqual(user_data["id"], get_stub_kakao_id(f"token{i}"))
+
+        # Only the JWKS, once.
+        self.assertEqual(kakao_client.get_stats()["requests"], 1)
+        self.assertEqual(self.stub_server.jwks_requests, 1)
+
+    def test_success_refetching_rotated_keys(self):
+        verify_id_token(self.stub_server.issue_id_token("token", AUDIENCE))
+        self.stub_server.rotate_signing_key()
+        id_token = self.stub_server.issue_id_token("token", AUDIENCE)
+
+        with override_settings(
+            KAKAO_OIDC={
+                "JWKS_URL": self.stub_server.jwks_url,
+                "AUDIENCE": [AUDIENCE],
+                "JWKS_MIN_REFRESH_SECONDS": 0,
+            }
+        ):
+            user_data = verify_id_token(id_token)
+
+        self.assertEqual(user_data["id"], get_stub_kakao_id("token"))
+        self.assertEqual(self.stub_server.jwks_requests, 2)
+
+    def test_success_limiting_refetches_for_unknown_kid(self):
+        verify_id_token(self.stub_server.issue_id_token("token", AUDIENCE))
+        forged = jwt.encode({"sub": "1"}, "secret", "HS256", headers={"kid": "forged"})
+
+        for _ in range(3):
+            with self.assertRaises(KakaoException):
+                verify_id_token(forged)
+        self.assertEqual(self.stub_server.jwks_requests, 1)
+
+    async def test_success_verifying_asynchronously(self):
+        id_token = self.stub_server.issue_id_token("token", AUDIENCE)
+        user_data = await averify_id_token(id_token)
+        self.assertEqual(user_data["id"], get_stub_kakao_id("token"))
+        await kakao_async_client.aclose()
+
+    def test_fail_verifying_id_token_for_other_app(self):
+        id_token = self.stub_server.issue_id_token("token", "other-app")
+        with self.assertRaises(KakaoException):
+            verify_id_token(id_token)
+
+    def test_fail_verifying_expired_id_token(self):
+        id_token = self.stub_server.issue_id_token("token", AUDIENCE, lifetime=-60)
+        with self.assertRaises(KakaoException):
+            verify_id_token(id_token)
+
+    def test_fail_verifying_without_audience(self):
+        id_token = self.stub_server.issue_id_token("token", AUDIENCE)
+        with override_settings(KAKAO_OIDC={"JWKS_URL": self.stub_server.jwks_url}):
+            with self.assertRaises(KakaoException):
+                verify_id_token(id_token)
+        self.assertEqual(self.stub_server.jwks_requests, 0)
+
+    def test_success_kakao_registration_and_login_with_id_token(self):
+        id_token = self.stub_server.issue_id_token("token", AUDIENCE)
+
+        response = self.client.post(
+            reverse("kakao-registration"),
+            data={
+                "id_token": id_token,
+                "nickname": "nickname",
+                "favorate_race": "zerg",
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        user = get_user_model().objects.get(nickname="nickname")
+        self.assertEqual(user.kakao_id, get_stub_kakao_id("token"))
+
+        response = self.client.post(reverse("kakao-login"), data={"id_token": id_token})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(kakao_client.get_stats()["requests"], 1)
+
+    def test_success_kakao_login_falling_back_to_access_token(self):
+        get_user_model().objects.create_kakao_user(
+            kakao_id=get_stub_kakao_id("token"), nickname="nickname"
+        )
+        id_token = self.stub_server.issue_id_token("token", "other-app")
+
+        response = self.client.post(
+            reverse("kakao-login"), data={"id_token": id_token, "access_token": "token"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_fail_kakao_registration_without_tokens(self):
+        response = self.client.post(
+            reverse("kakao-registration"), data={"nickname": "nickname"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
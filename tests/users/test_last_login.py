@@ -0,0 +1,130 @@
+import time
+
+from unittest.mock import Mock
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import DatabaseError
+from django.db import connection
+from django.test import TransactionTestCase
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from users.last_login import last_login_buffer
+from users.last_login import record_login
+
+
+@override_settings(LAST_LOGIN={"FLUSH_SECONDS": 3600, "FLUSH_IN_BACKGROUND": False})
+class LastLoginTest(APITestCase):
+    def setUp(self):
+        last_login_buffer.reset()
+        self.users = [
+            get_user_model().objects.create_user(
+                username=f"username{i}", nickname=f"nickname{i}", password="password"
+            )
+            for i in range(3)
+        ]
+
+    def tearDown(self):
+        last_login_buffer.reset()
+
+    def test_success_login_buffers_last_login(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(
+                reverse("login"),
+                data={"username": "username0", "password": "password"},
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(
+            any(query["sql"].startswith("UPDATE") for query in context.captured_queries)
+        )
+        self.assertIsNone(get_user_model().objects.get(pk=self.users[0].pk).last_login)
+
+        last_login_buffer.flush()
+        self.assertIsNotNone(
+            get_user_model().objects.get(pk=self.users[0].pk).last_login
+        )
+
+    def test_success_flushing_in_one_query(self):
+        for user in self.users:
+            record_login(user)
+        record_login(self.users[0])
+
+        with self.assertNumQueries(1):
+            self.assertEqual(last_login_buffer.flush(), 3)
+        for user in self.users:
+            user_in_db = get_user_model().objects.get(pk=user.pk)
+            self.assertEqual(user_in_db.last_login, user.last_login)
+
+    @override_settings(
+        LAST_LOGIN={
+            "MAX_PENDING": 2,
+            "FLUSH_SECONDS": 3600,
+            "FLUSH_IN_BACKGROUND": False,
+        }
+    )
+    def test_success_flushing_full_buffer(self):
+        record_login(self.users[0])
+        self.assertIsNone(get_user_model().objects.get(pk=self.users[0].pk).last_login)
+
+        record_login(self.users[1])
+        self.assertIsNotNone(
+            get_user_model().objects.get(pk=self.users[0].pk).last_login
+        )
+        self.assertEqual(last_login_buffer.pending, {})
+
+    def test_success_keeping_last_login_when_flush_fails(self):
+        record_login(self.users[0])
+
+        with patch.object(
+            get_user_model().objects,
+            "bulk_update",
+            side_effect=DatabaseError("database is down"),
+        ):
+            with self.assertLogs("users.last_login", "ERROR"):
+                self.assertEqual(last_login_buffer.flush(), 0)
+        self.assertIn(self.users[0].pk, last_login_buffer.pending)
+
+        self.assertEqual(last_login_buffer.flush(), 1)
+
+    @patch("users.utils.kakao_client")
+    def test_success_kakao_login_records_last_login(self, mock_kakao_api):
+        caches["kakao"].clear()
+        mock_kakao_api.get.return_value = Mock(
+            status_code=200, json=Mock(return_value={"id": 123456789})
+        )
+        user = get_user_model().objects.create_kakao_user(
+            kakao_id=123456789, nickname="kakao"
+        )
+
+        response = self.client.post(
+            reverse("kakao-login"), data={"access_token": "token"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(user.pk, last_login_buffer.pending)
+
+
+class LastLoginFlusherTest(TransactionTestCase):
+    def setUp(self):
+        last_login_buffer.reset()
+        self.addCleanup(last_login_buffer.reset)
+        self.user = get_user_model().objects.create_user(
+            username="username", nickname="nickname", password="password"
+        )
+
+    @override_settings(LAST_LOGIN={"FLUSH_SECONDS": 0.05, "FLUSH_IN_BACKGROUND": True})
+    def test_success_flushing_without_later_logins(self):
+        record_login(self.user)
+
+        deadline = time.monotonic() + 5
+        while last_login_buffer.pending and time.monotonic() < deadline:
+            time.sleep(0.01)
+        last_login_buffer.reset()
+
+        user_in_db = get_user_model().objects.get(pk=self.user.pk)
+        self.assertEqual(user_in_db.last_login, self.user.last_login)
@@ -0,0 +1,107 @@
+import re
+import threading
+
+from django.test import override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from users.metrics import MetricsRegistry
+from users.metrics import RequestStats
+from users.metrics import current_request_stats
+from users.metrics import record_outbound
+from users.metrics import registry
+
+
+class MetricsTest(APITestCase):
+    def setUp(self):
+        registry.reset()
+
+    def get_metrics(self):
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.content.decode()
+
+    def test_success_recording_latency_and_queries_per_url_name(self):
+        registration_form = {
+            "username": "user01",
+            "password": "password01",
+            "nickname": "nickname01",
+            "email": "user01@email.com",
+            "favorate_race": "zerg",
+        }
+        response = self.client.post(reverse("registration"), data=registration_form)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        metrics = self.get_metrics()
+        labels = 'view="registration",method="POST",status="201"'
+        self.assertIn(
+            f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1', metrics
+        )
+        self.assertIn(f"http_request_duration_seconds_count{{{labels}}} 1", metrics)
+
+        queries = re.search(
+            rf"http_request_db_queries_total{{{re.escape(labels)}}} (\d+)", metrics
+        )
+        self.assertGreater(int(queries.group(1)), 0)
+
+    def test_success_recording_outbound_time(self):
+        token = current_request_stats.set(RequestStats())
+        try:
+            record_outbound("kakao", 0.25)
+            record_outbound("kakao", 0.25)
+            stats = current_request_stats.get()
+        finally:
+            current_request_stats.reset(token)
+        registry.observe_request("kakao-login", "POST", 200, 0.6, stats)
+
+        metrics = self.get_metrics()
+        labels = 'view="kakao-login",service="kakao"'
+        self.assertIn(f"outbound_duration_seconds_total{{{labels}}} 0.5", metrics)
+        self.assertIn(f"outbound_calls_total{{{labels}}} 2", metrics)
+
+    def test_fail_scraping_from_outside_allowed_networks(self):
+        response = self.client.get(reverse("metrics"), REMOTE_ADDR="203.0.113.7")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        response = self.client.get(
+            reverse("metrics"),
+            REMOTE_ADDR="203.0.113.7",
+            HTTP_AUTHORIZATION="Bearer wrong",
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(METRICS={"ALLOWED_NETWORKS": ["10.0.0.0/8"], "TOKEN": "s3cret"})
+    def test_success_scraping_with_allowed_network_or_token(self):
+        response = self.client.get(reverse("metrics"), REMOTE_ADDR="10.1.2.3")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(
+            reverse("metrics"),
+            REMOTE_ADDR="203.0.113.7",
+            HTTP_AUTHORIZATION="Bearer s3cret",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_success_retiring_shards_of_finished_threads(self):
+        threads_registry = MetricsRegistry()
+
+        def observe():
+            threads_registry.observe_request("login", "POST", 200, 0.01, RequestStats())
+
+        for _ in range(3):
+            threads = [threading.Thread(target=observe) for _ in range(10)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            # New threads retire the shards of earlier finished ones.
+            self.assertLessEqual(len(threads_registry._shards), 10)
+
+        observe()
+        requests, _ = threads_registry.collect()
+
+        # Only this thread's shard is left, and no count was lost.
+        self.assertEqual(len(threads_registry._shards), 1)
+        self.assertEqual(requests[("login", "POST", "200")][0], 31)
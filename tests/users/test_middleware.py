@@ -0,0 +1,48 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from config.settings.api import MIDDLEWARE as API_MIDDLEWARE
+
+
+@override_settings(MIDDLEWARE=API_MIDDLEWARE)
+class ApiExemptMiddlewareTest(APITestCase):
+    def test_success_api_request_skips_session_and_csrf(self):
+        self.client.cookies["sessionid"] = "0123456789abcdef"
+
+        response = self.client.get(reverse("jwks"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(hasattr(response.wsgi_request, "session"))
+        self.assertFalse(hasattr(response.wsgi_request, "_messages"))
+        self.assertNotIn("CSRF_COOKIE", response.wsgi_request.META)
+        self.assertNotIn("Cookie", response.get("Vary", ""))
+
+    def test_success_admin_keeps_full_stack(self):
+        response = self.client.get(reverse("admin:login"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(hasattr(response.wsgi_request, "session"))
+        self.assertIn("csrftoken", response.cookies)
+
+    def test_success_login_without_session(self):
+        response = self.client.post(
+            reverse("login"), data={"username": "nobody", "password": "password"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class BenchMiddlewareCommandTest(APITestCase):
+    def test_success_bench_middleware(self):
+        stdout = StringIO()
+        call_command("bench_middleware", requests=5, stdout=stdout)
+
+        output = stdout.getvalue()
+        self.assertIn("base:", output)
+        self.assertIn("api:", output)
+        self.assertIn("API profile saves", output)
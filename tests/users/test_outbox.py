@@ -0,0 +1,50 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.test import TestCase
+from django.test import override_settings
+
+from users.models import EmailOutbox
+from users.outbox import deliver_outbox
+from users.outbox import enqueue_email
+
+
+class FailingEmailBackend(EmailBackend):
+    def send_messages(self, messages):
+        raise ConnectionError("smtp is down")
+
+
+class EmailOutboxTest(TestCase):
+    def setUp(self):
+        for i in range(3):
+            enqueue_email(subject="subject", body="body", to_email=f"u{i}@email.com")
+
+    def test_success_delivering_batch_over_one_connection(self):
+        with patch.object(EmailBackend, "open") as mock_open:
+            sent, failed = deliver_outbox(batch_size=2)
+
+        self.assertEqual((sent, failed), (2, 0))
+        self.assertEqual(mock_open.call_count, 1)
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(EmailOutbox.objects.filter(status="sent").count(), 2)
+
+    def test_success_draining_outbox_with_command(self):
+        call_command("send_outbox_emails", "--once", stdout=StringIO())
+
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertFalse(EmailOutbox.objects.filter(status="pending").exists())
+
+    @override_settings(EMAIL_OUTBOX={"MAX_ATTEMPTS": 2, "BACKOFF_SECONDS": 0})
+    def test_fail_delivery_is_retried_then_dead_lettered(self):
+        with patch("users.outbox.get_connection", return_value=FailingEmailBackend()):
+            self.assertEqual(deliver_outbox(), (0, 3))
+            self.assertEqual(EmailOutbox.objects.filter(status="pending").count(), 3)
+
+            self.assertEqual(deliver_outbox(), (0, 3))
+
+        self.assertEqual(EmailOutbox.objects.filter(status="dead").count(), 3)
+        self.assertEqual(deliver_outbox(), (0, 0))
+        self.assertEqual(len(mail.outbox), 0)
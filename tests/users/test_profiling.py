@@ -0,0 +1,103 @@
+import tempfile
+
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+
+from rest_framework.test import APITestCase
+
+from users.profiling import ProfileStore
+from users.profiling import make_profile_header_value
+from users.throttling import token_buckets
+
+
+class ProfilingMiddlewareTest(APITestCase):
+    def setUp(self):
+        token_buckets.reset()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        override = override_settings(PROFILING={"DIRECTORY": directory.name})
+        override.enable()
+        self.addCleanup(override.disable)
+        self.store = ProfileStore()
+
+    def login(self, **headers):
+        return self.client.post(
+            reverse("login"),
+            data={"username": "nobody", "password": "password"},
+            **headers,
+        )
+
+    def test_success_profiling_signed_request(self):
+        response = self.login(HTTP_X_PROFILE=make_profile_header_value())
+
+        profile = self.store.load(response["X-Profile-Id"])
+        self.assertEqual(profile["view"], "login")
+        self.assertEqual(profile["status"], 401)
+        self.assertGreater(profile["sql_count"], 0)
+        self.assertTrue(profile["top_functions"])
+
+    def test_success_answering_when_saving_profile_fails(self):
+        with patch.object(ProfileStore, "save", side_effect=OSError("disk full")):
+            with self.assertLogs("users.middleware", "ERROR"):
+                response = self.login(HTTP_X_PROFILE=make_profile_header_value())
+
+        self.assertEqual(response.status_code, 401)
+        self.assertNotIn("X-Profile-Id", response)
+
+    def test_success_skipping_unsigned_request(self):
+        response = self.login(HTTP_X_PROFILE="profile:forged:signature")
+
+        self.assertNotIn("X-Profile-Id", response)
+        self.assertEqual(self.store.list_ids(), [])
+
+    def test_success_sampling_requests(self):
+        with override_settings(
+            PROFILING={"DIRECTORY": self.store.directory, "SAMPLE_RATE": 1.0}
+        ):
+            response = self.client.get(reverse("jwks"))
+
+        self.assertEqual(self.store.list_ids(), [response["X-Profile-Id"]])
+
+    def test_success_keeping_newest_profiles(self):
+        with override_settings(
+            PROFILING={"DIRECTORY": self.store.directory, "MAX_FILES": 2}
+        ):
+            profile_ids = [
+                self.login(HTTP_X_PROFILE=make_profile_header_value())["X-Profile-Id"]
+                for _ in range(3)
+            ]
+
+        self.assertEqual(self.store.list_ids(), profile_ids[1:])
+
+    async def test_success_profiling_async_request(self):
+        # The async test client takes header names, not WSGI environ keys.
+        response = await self.async_client.get(
+            reverse("jwks"), **{"X-Profile": make_profile_header_value()}
+        )
+
+        self.assertEqual(self.store.load(response["X-Profile-Id"])["view"], "jwks")
+
+    def test_success_profiles_command(self):
+        profile_id = self.login(HTTP_X_PROFILE=make_profile_header_value())[
+            "X-Profile-Id"
+        ]
+
+        for args, expected in [
+            (["list"], "POST /api/v1/auth/login 401"),
+            (["show", profile_id], "SELECT"),
+            (["summary", "--view", "login"], "1 profiles"),
+        ]:
+            stdout = StringIO()
+            call_command("profiles", *args, stdout=stdout)
+            self.assertIn(expected, stdout.getvalue())
+
+        stdout = StringIO()
+        call_command("profiles", "sign", stdout=stdout)
+        self.assertTrue(stdout.getvalue().startswith("X-Profile: profile:"))
+
+        call_command("profiles", "clear", stdout=StringIO())
+        self.assertEqual(self.store.list_ids(), [])
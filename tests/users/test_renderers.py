@@ -0,0 +1,82 @@
+import io
+
+from datetime import datetime
+from decimal import Decimal
+from io import StringIO
+from unittest import skipIf
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.exceptions import ErrorDetail
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from users import renderers
+from users.parsers import ORJSONParser
+from users.renderers import ORJSONRenderer
+
+
+@skipIf(renderers.orjson is None, "orjson is not installed")
+class ORJSONRendererTest(SimpleTestCase):
+    def assertSameBytes(self, data, accepted_media_type=None):
+        self.assertEqual(
+            ORJSONRenderer().render(data, accepted_media_type),
+            JSONRenderer().render(data, accepted_media_type),
+        )
+
+    def test_success_rendering_like_json_renderer(self):
+        for data in [
+            {"access": "a.b.c", "refresh": "d.e.f"},
+            "이미 가입되어있는 유저입니다.",
+            {"username": [ErrorDetail("이미 존재합니다.", code="unique")]},
+            [{"username": "user01", "id": 1}, {"username": "user02", "id": 2}],
+            {1: True, "line\u2028separator": "paragraph\u2029separator"},
+            {
+                "joined": timezone.now(),
+                "naive": datetime(2022, 10, 1, 12, 0, 0, 123456),
+            },
+            {"score": Decimal("1.5")},
+            {"big": 2**70},
+        ]:
+            self.assertSameBytes(data)
+
+    def test_success_rendering_indented(self):
+        self.assertSameBytes({"a": [1, 2]}, "application/json; indent=4")
+
+
+class ORJSONParserTest(SimpleTestCase):
+    def parse(self, body):
+        return ORJSONParser().parse(io.BytesIO(body))
+
+    def test_success_parsing_like_json_parser(self):
+        for body in [
+            '{"nickname": "닉네임", "password": "password"}'.encode(),
+            b'[{"id": 1}, {"id": 2}]',
+            b'{"big": 1180591620717411303424, "escaped": "\\ud800"}',
+        ]:
+            self.assertEqual(self.parse(body), JSONParser().parse(io.BytesIO(body)))
+
+    def test_fail_parsing_malformed_body(self):
+        for body in [b'{"username": ', b'{"score": NaN}']:
+            with self.assertRaises(ParseError):
+                self.parse(body)
+
+
+class ORJSONResponseTest(APITestCase):
+    def test_success_korean_error_response(self):
+        response = self.client.post(reverse("kakao-login"), data={})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.content, "\"'access_token'필드에 오류가 있습니다.\"".encode())
+
+    def test_success_bench_json(self):
+        stdout = StringIO()
+        call_command("bench_json", iterations=5, stdout=stdout)
+        self.assertIn("render token", stdout.getvalue())
+        self.assertIn("parse login", stdout.getvalue())
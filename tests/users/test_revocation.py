@@ -0,0 +1,87 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from users.models import RevokedToken
+from users.revocation import RevocationSet
+from users.revocation import revoked_tokens
+from users.tokens import RefreshToken
+
+
+class RefreshTokenRotationTest(APITestCase):
+    def setUp(self):
+        revoked_tokens.reset()
+        user = get_user_model().objects.create_user(
+            username="username", nickname="nickname", password="password"
+        )
+        self.refresh_token_url = reverse("token-refresh")
+        self.refresh_token = RefreshToken.for_user(user)
+
+    def tearDown(self):
+        revoked_tokens.reset()
+
+    def test_success_refresh_token_rotation(self):
+        response = self.client.post(
+            self.refresh_token_url, data={"refresh": str(self.refresh_token)}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.data["refresh"], str(self.refresh_token))
+
+        response = self.client.post(
+            self.refresh_token_url, data={"refresh": response.data["refresh"]}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_fail_reusing_rotated_refresh_token(self):
+        response = self.client.post(
+            self.refresh_token_url, data={"refresh": str(self.refresh_token)}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.post(
+            self.refresh_token_url, data={"refresh": str(self.refresh_token)}
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_success_checking_without_query(self):
+        revoked_tokens.maintain()
+
+        with self.assertNumQueries(0):
+            self.assertFalse(revoked_tokens.is_revoked(self.refresh_token["jti"]))
+
+    def test_success_revocation_seen_by_other_process(self):
+        self.assertTrue(self.refresh_token.revoke())
+        # Saved right away, not when this process next does maintenance.
+        self.assertTrue(
+            RevokedToken.objects.filter(jti=self.refresh_token["jti"]).exists()
+        )
+
+        other_process = RevocationSet()
+        self.assertTrue(other_process.is_revoked(self.refresh_token["jti"]))
+        self.assertFalse(
+            other_process.revoke(self.refresh_token["jti"], self.refresh_token["exp"])
+        )
+
+    @override_settings(TOKEN_REVOCATION={"SYNC_SECONDS": 0})
+    def test_success_skipping_maintenance_in_progress(self):
+        revoked_tokens.maintain()
+
+        # Another thread is syncing; this one keeps the current filter.
+        with revoked_tokens.maintenance_lock:
+            with self.assertNumQueries(0):
+                self.assertFalse(revoked_tokens.is_revoked(self.refresh_token["jti"]))
+
+    @override_settings(TOKEN_REVOCATION={"SWEEP_SECONDS": 0})
+    def test_success_sweeping_expired_revocations(self):
+        RevokedToken.objects.create(
+            jti="expired", expires_at=timezone.now() - timedelta(seconds=1)
+        )
+
+        self.assertFalse(revoked_tokens.is_revoked("expired"))
+        self.assertFalse(RevokedToken.objects.filter(jti="expired").exists())
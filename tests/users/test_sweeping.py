@@ -0,0 +1,117 @@
+import json
+import os
+import tempfile
+
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from users.availability import name_index
+from users.sweeping import get_sweep_cutoff
+from users.sweeping import get_sweep_queryset
+from users.sweeping import sweep_unverified_batch
+
+
+class SweepUnverifiedUsersTest(APITestCase):
+    def setUp(self):
+        name_index.reset()
+        User = get_user_model()
+        for i in range(5):
+            User.objects.create_user(
+                username=f"stale{i}",
+                nickname=f"stale{i}",
+                email=f"stale{i}@email.com",
+                password="password",
+                is_verified=False,
+            )
+        User.objects.create_user(
+            username="verified", nickname="verified", password="password"
+        )
+        User.objects.create_user(
+            username="recent", nickname="recent", password="password", is_verified=False
+        )
+        User.objects.exclude(username="recent").update(
+            date_joined=timezone.now() - timedelta(days=30)
+        )
+
+    def tearDown(self):
+        name_index.reset()
+
+    def sweep(self, **options):
+        stdout = StringIO()
+        call_command(
+            "sweep_unverified_users", batch_size=2, sleep=0, stdout=stdout, **options
+        )
+        return stdout.getvalue()
+
+    def test_success_sweeping_stale_unverified_users(self):
+        output = self.sweep()
+
+        self.assertIn("Deleted 5 users", output)
+        self.assertEqual(output.count("deleted="), 3)
+        self.assertEqual(
+            set(get_user_model().objects.values_list("username", flat=True)),
+            {"verified", "recent"},
+        )
+
+    def test_success_releasing_names(self):
+        name_index.rebuild()
+        self.sweep()
+
+        response = self.client.get(
+            reverse("availability"), data={"username": "stale0", "nickname": "stale0"}
+        )
+        self.assertEqual(response.data, {"username": True, "nickname": True})
+
+        response = self.client.post(
+            reverse("registration"),
+            data={
+                "username": "stale0",
+                "nickname": "stale0",
+                "email": "stale0@email.com",
+                "password": "password",
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_success_archiving_swept_users(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "unverified.jsonl")
+            self.sweep(archive=path)
+
+            with open(path, encoding="utf-8") as f:
+                archived = [json.loads(line) for line in f]
+
+        self.assertEqual(
+            sorted(user["username"] for user in archived),
+            [f"stale{i}" for i in range(5)],
+        )
+        self.assertNotIn("password", archived[0])
+
+    def test_success_keeping_users_verified_meanwhile(self):
+        cutoff = get_sweep_cutoff()
+        candidates = list(get_sweep_queryset(cutoff).values_list("date_joined", "pk"))
+        # Verified between reading the candidates and deleting them.
+        get_user_model().objects.filter(username="stale0").update(is_verified=True)
+
+        with patch("users.sweeping.get_sweep_queryset") as get_queryset:
+            get_queryset.return_value.values_list.return_value = candidates
+            deleted, after = sweep_unverified_batch(cutoff, batch_size=10)
+
+        self.assertEqual(deleted, 4)
+        self.assertEqual(after, candidates[-1])
+        self.assertTrue(get_user_model().objects.filter(username="stale0").exists())
+
+    def test_success_dry_run(self):
+        output = self.sweep(dry_run=True)
+
+        self.assertIn("5 unverified users", output)
+        self.assertEqual(get_user_model().objects.count(), 7)
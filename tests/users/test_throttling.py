@@ -0,0 +1,152 @@
+import json
+
+import jwt
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import AsyncRequestFactory
+from django.test import RequestFactory
+from django.test import SimpleTestCase
+from django.test import override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from users.throttling import CacheBuckets
+from users.throttling import acheck_throttle
+from users.throttling import check_throttle
+from users.throttling import take_token
+from users.throttling import token_buckets
+from users.views import AsyncKakaoLogInView
+
+
+class TakeTokenTest(SimpleTestCase):
+    def test_success_taking_tokens_until_empty(self):
+        rate = (3, 60)
+        tat = None
+        for _ in range(3):
+            tat, wait = take_token(tat, 1000.0, rate)
+            self.assertEqual(wait, 0)
+
+        self.assertEqual(take_token(tat, 1000.0, rate), (None, 20.0))
+        # One token is back every 20 seconds.
+        tat, wait = take_token(tat, 1020.0, rate)
+        self.assertEqual(wait, 0)
+
+
+class TokenBucketThrottleTest(APITestCase):
+    def setUp(self):
+        token_buckets.reset()
+        caches["default"].clear()
+        get_user_model().objects.create_user(
+            username="user01", nickname="nickname01", password="password01"
+        )
+
+    def login(self, username, password="wrong", **extra):
+        return self.client.post(
+            reverse("login"),
+            data={"username": username, "password": password},
+            **extra,
+        )
+
+    @override_settings(THROTTLING={"RATES": {"login": {"user": "2/min"}}})
+    def test_fail_login_throttled_by_username(self):
+        for _ in range(2):
+            response = self.login("user01")
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        # Rejected before any query or password hashing.
+        with self.assertNumQueries(0):
+            response = self.login("user01", "password01")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response["Retry-After"], "30")
+        self.assertEqual(response.data["detail"], "요청이 너무 많습니다. 30초 후에 다시 시도해주세요.")
+
+        # Other users are not affected.
+        response = self.login("user02")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(THROTTLING={"RATES": {"login": {"ip": "2/min"}}})
+    def test_fail_login_throttled_by_ip(self):
+        self.login("user01")
+        self.login("user02")
+
+        response = self.login("user03")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+        response = self.login("user01", REMOTE_ADDR="10.0.0.1")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(THROTTLING={"RATES": {}})
+    def test_success_login_without_rates(self):
+        for _ in range(10):
+            response = self.login("user01", "password01")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(
+        THROTTLING={"BACKEND": "cache", "RATES": {"login": {"user": "2/min"}}}
+    )
+    def test_fail_login_throttled_through_cache(self):
+        self.login("user01")
+        self.login("user01")
+
+        response = self.login("user01")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response["Retry-After"], "30")
+
+    @override_settings(THROTTLING={"BACKEND": "cache"})
+    def test_success_sharing_buckets_between_workers(self):
+        worker, other_worker = CacheBuckets(), CacheBuckets()
+        self.assertEqual(worker.hit("key", (2, 60)), 0)
+        self.assertEqual(other_worker.hit("key", (2, 60)), 0)
+        self.assertGreater(worker.hit("key", (2, 60)), 0)
+
+        # Later rejections are answered without the cache.
+        caches["default"].clear()
+        self.assertGreater(worker.hit("key", (2, 60)), 0)
+        self.assertEqual(other_worker.hit("key", (2, 60)), 0)
+
+
+class AsyncTokenBucketThrottleTest(SimpleTestCase):
+    def setUp(self):
+        token_buckets.reset()
+
+    @override_settings(THROTTLING={"RATES": {"kakao-login": {"user": "1/min"}}})
+    async def test_fail_async_kakao_login_throttled(self):
+        data = {"access_token": "token"}
+        request = AsyncRequestFactory().post(
+            reverse("kakao-login"), data=data, content_type="application/json"
+        )
+        # Spend the only token without calling Kakao.
+        self.assertEqual(await acheck_throttle(request, "kakao-login", data), 0)
+
+        response = await AsyncKakaoLogInView.as_view()(request)
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response["Retry-After"], "60")
+        self.assertEqual(
+            json.loads(response.content)["detail"],
+            "요청이 너무 많습니다. 60초 후에 다시 시도해주세요.",
+        )
+
+    @override_settings(THROTTLING={"RATES": {"kakao-login": {"user": "1/min"}}})
+    def test_fail_kakao_login_throttled_by_id_token_sub(self):
+        request = RequestFactory().post(reverse("kakao-login"))
+        first, second = (
+            jwt.encode({"sub": "1234", "nonce": nonce}, "key", algorithm="HS256")
+            for nonce in ("first", "second")
+        )
+
+        self.assertEqual(check_throttle(request, "kakao-login", {"id_token": first}), 0)
+        # A new id_token of the same Kakao account shares its bucket.
+        self.assertGreater(
+            check_throttle(request, "kakao-login", {"id_token": second}), 0
+        )
+
+        # Access tokens cannot be tied to an account, only to themselves.
+        for access_token in ("token1", "token2"):
+            self.assertEqual(
+                check_throttle(request, "kakao-login", {"access_token": access_token}),
+                0,
+            )
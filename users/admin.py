@@ -1,6 +1,69 @@
+import json
+
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
 
 from users.models import User
 
 
-admin.site.register(User)
+class EstimatedCountPaginator(Paginator):
+    """Paginator trusting the planner's row estimate for large results.
+
+    On PostgreSQL the count of an unfiltered changelist comes from
+    EXPLAIN, which costs the same for millions of rows as for ten; results
+    estimated under `exact_count_limit` rows are still counted exactly.
+    Filtered or searched changelists are counted exactly, since the
+    estimate can be far off for them and their count uses an index. Other
+    databases always count.
+    """
+
+    exact_count_limit = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if connections[queryset.db].vendor == "postgresql" and not queryset.query.where:
+            plan = json.loads(queryset.explain(format="json"))
+            estimate = int(plan[0]["Plan"]["Plan Rows"])
+            if estimate >= self.exact_count_limit:
+                return estimate
+        return super().count
+
+
+@admin.register(User)
+class UserAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "username",
+        "nickname",
+        "email",
+        "registration_type",
+        "favorate_race",
+        "is_verified",
+        "is_active",
+        "date_joined",
+    )
+    list_display_links = ("id", "username")
+    list_filter = ("registration_type", "is_verified", "is_active", "favorate_race")
+    # Exact matches hit the unique indexes; Kakao users' username is their
+    # Kakao id.
+    search_fields = ("username__exact", "nickname__exact", "email__exact")
+    ordering = ("-id",)
+    readonly_fields = ("date_joined", "last_login")
+    actions = ("verify_users", "deactivate_users")
+
+    paginator = EstimatedCountPaginator
+    # Skip the second, unfiltered COUNT(*) shown next to filtered results.
+    show_full_result_count = False
+
+    @admin.action(description="선택된 사용자를 인증 처리합니다")
+    def verify_users(self, request, queryset):
+        updated = queryset.filter(is_verified=False).update(is_verified=True)
+        self.message_user(request, f"{updated}명의 사용자를 인증 처리했습니다.")
+
+    @admin.action(description="선택된 사용자를 비활성화합니다")
+    def deactivate_users(self, request, queryset):
+        updated = queryset.filter(is_active=True).update(is_active=False)
+        self.message_user(request, f"{updated}명의 사용자를 비활성화했습니다.")
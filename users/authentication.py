@@ -0,0 +1,34 @@
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from users.caches import cache_user
+from users.caches import get_cached_user
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that keeps resolved users in a short-TTL cache.
+
+    `User.save()` and the user queryset's `update()`/`delete()` drop the
+    cached row from this process's cache. Other workers see deactivation
+    and password changes right away only if AUTH_USER_CACHE["CACHE"] is
+    shared, otherwise once their entry expires after TIMEOUT seconds.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = get_cached_user(user_id)
+        if user is None:
+            user = super().get_user(validated_token)
+            cache_user(user)
+        elif not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return user
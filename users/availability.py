@@ -0,0 +1,161 @@
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections
+
+from users.bloom import BloomFilter
+
+
+DEFAULT_NAME_AVAILABILITY_SETTINGS = {
+    "FIELDS": ["username", "nickname"],
+    "CAPACITY": 100000,
+    "ERROR_RATE": 0.01,
+    "REBUILD_SECONDS": 600,
+    # Rebuild in a thread of its own. When False the request noticing the
+    # filters are stale rebuilds them, while other requests keep the old ones.
+    "REBUILD_IN_BACKGROUND": True,
+}
+
+logger = logging.getLogger(__name__)
+
+
+def get_name_availability_setting(name):
+    return getattr(settings, "NAME_AVAILABILITY", {}).get(
+        name, DEFAULT_NAME_AVAILABILITY_SETTINGS[name]
+    )
+
+
+class NameIndex:
+    """Bloom filters over the taken usernames and nicknames.
+
+    A value missing from its filter is definitely available and answered
+    without a query; a hit is confirmed against the unique index. Users
+    created in this process are added right away, those created elsewhere
+    show up at the next periodic rebuild. Until the first build finishes
+    every check is a query.
+    """
+
+    def __init__(self):
+        self.filters = None
+        self.built_at = float("-inf")
+        self.rebuilding = False
+        self.pending = []
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def claim_rebuild(self):
+        with self.lock:
+            if self.rebuilding:
+                return False
+            self.rebuilding = True
+            self.pending = []
+            return True
+
+    def rebuild(self):
+        if self.claim_rebuild():
+            self.build()
+
+    def build(self):
+        try:
+            User = get_user_model()
+            fields = get_name_availability_setting("FIELDS")
+            capacity = max(
+                get_name_availability_setting("CAPACITY"), 2 * User.objects.count()
+            )
+            filters = {
+                field_name: BloomFilter(
+                    capacity, get_name_availability_setting("ERROR_RATE")
+                )
+                for field_name in fields
+            }
+            for row in User.objects.values_list(*fields).iterator(chunk_size=10000):
+                for field_name, value in zip(fields, row):
+                    if value is not None:
+                        filters[field_name].add(value)
+        except Exception:
+            with self.lock:
+                # Retried after REBUILD_SECONDS, not by every request.
+                self.built_at = time.monotonic()
+                self.rebuilding = False
+            raise
+
+        with self.lock:
+            # Users created while the rows were being read.
+            for field_name, value in self.pending:
+                if field_name in filters:
+                    filters[field_name].add(value)
+            self.filters = filters
+            self.built_at = time.monotonic()
+            self.rebuilding = False
+            self.pending = []
+
+    def build_in_background(self):
+        try:
+            self.build()
+        except Exception:
+            logger.exception("Failed to rebuild the name availability filters.")
+        finally:
+            # Connections are per thread and this one is done.
+            connections.close_all()
+
+    def get_filters(self):
+        if (
+            time.monotonic() - self.built_at
+            > get_name_availability_setting("REBUILD_SECONDS")
+            and self.claim_rebuild()
+        ):
+            if get_name_availability_setting("REBUILD_IN_BACKGROUND"):
+                self.thread = threading.Thread(
+                    target=self.build_in_background,
+                    name="name-index-rebuild",
+                    daemon=True,
+                )
+                self.thread.start()
+            else:
+                self.build()
+        return self.filters
+
+    def add(self, field_name, value):
+        with self.lock:
+            if self.filters is not None and field_name in self.filters:
+                self.filters[field_name].add(value)
+            if self.rebuilding:
+                self.pending.append((field_name, value))
+
+    def add_values(self, values):
+        for field_name in get_name_availability_setting("FIELDS"):
+            value = values.get(field_name)
+            if value is not None:
+                self.add(field_name, value)
+
+    def add_user(self, user):
+        self.add_values(
+            {
+                field_name: getattr(user, field_name)
+                for field_name in get_name_availability_setting("FIELDS")
+            }
+        )
+
+    def is_available(self, field_name, value):
+        filters = self.get_filters()
+        # None until the first build finishes.
+        if filters is not None and value not in filters[field_name]:
+            return True
+        User = get_user_model()
+        return not User.objects.filter(**{field_name: value}).exists()
+
+    def reset(self):
+        thread = self.thread
+        if thread is not None:
+            thread.join()
+        with self.lock:
+            self.filters = None
+            self.built_at = float("-inf")
+            self.pending = []
+            self.thread = None
+
+
+name_index = NameIndex()
@@ -0,0 +1,65 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+DEFAULT_AUTH_USER_CACHE_SETTINGS = {
+    "CACHE": "default",
+    # Upper bound on how long other workers may see a changed user when
+    # CACHE is not shared between them.
+    "TIMEOUT": 30,
+}
+
+# Changes to any of these must be visible to the next authenticated request.
+AUTH_USER_CACHE_FIELDS = frozenset(
+    ["password", "is_active", "is_verified", "is_staff", "is_superuser"]
+)
+
+
+def get_auth_user_cache_setting(name):
+    return getattr(settings, "AUTH_USER_CACHE", {}).get(
+        name, DEFAULT_AUTH_USER_CACHE_SETTINGS[name]
+    )
+
+
+def get_auth_user_cache():
+    return caches[get_auth_user_cache_setting("CACHE")]
+
+
+def make_auth_user_key(pk):
+    return f"users:auth-user:{pk}"
+
+
+def get_cached_user(pk):
+    return get_auth_user_cache().get(make_auth_user_key(pk))
+
+
+def cache_user(user):
+    get_auth_user_cache().set(
+        make_auth_user_key(user.pk),
+        user,
+        timeout=get_auth_user_cache_setting("TIMEOUT"),
+    )
+
+
+def invalidate_cached_users(pks):
+    get_auth_user_cache().delete_many([make_auth_user_key(pk) for pk in pks])
+
+
+# Single-use tokens (email verification links) already acted upon. Entries
+# live until the token expires, after which decoding rejects it anyway.
+
+
+def make_consumed_token_key(jti):
+    return f"users:consumed-token:{jti}"
+
+
+def is_token_consumed(jti):
+    return get_auth_user_cache().get(make_consumed_token_key(jti)) is not None
+
+
+def consume_token(jti, exp):
+    get_auth_user_cache().set(
+        make_consumed_token_key(jti), True, timeout=max(1, int(exp - time.time()))
+    )
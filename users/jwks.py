@@ -0,0 +1,217 @@
+import json
+import threading
+
+import jwt
+
+from cryptography.hazmat.primitives import serialization
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.translation import gettext_lazy as _
+from jwt import InvalidAlgorithmError
+from jwt import InvalidTokenError
+from jwt.algorithms import OKPAlgorithm
+from jwt.algorithms import RSAAlgorithm
+
+from rest_framework_simplejwt.backends import TokenBackend
+from rest_framework_simplejwt.exceptions import TokenBackendError
+from rest_framework_simplejwt.settings import api_settings
+
+
+DEFAULT_JWT_SIGNING_SETTINGS = {
+    # Key used to sign new tokens, the first key with a private key by default.
+    "ACTIVE_KID": None,
+    # [{"KID", "ALGORITHM", "PRIVATE_KEY", "PUBLIC_KEY"}, ...] with PEM keys.
+    "KEYS": [],
+    # Keep accepting HS256 tokens without a `kid` (issued before the switch).
+    "ACCEPT_HS256": True,
+    "JWKS_MAX_AGE": 300,
+}
+
+ASYMMETRIC_ALGORITHMS = {
+    "RS256": RSAAlgorithm,
+    "EdDSA": OKPAlgorithm,
+}
+
+
+def get_jwt_signing_setting(name):
+    return getattr(settings, "JWT_SIGNING", {}).get(
+        name, DEFAULT_JWT_SIGNING_SETTINGS[name]
+    )
+
+
+class SigningKey:
+    def __init__(self, kid, algorithm, private_key=None, public_key=None):
+        if algorithm not in ASYMMETRIC_ALGORITHMS:
+            raise ImproperlyConfigured(
+                f"JWT key {kid!r} uses unsupported algorithm {algorithm!r}."
+            )
+        if private_key is None and public_key is None:
+            raise ImproperlyConfigured(f"JWT key {kid!r} has no key material.")
+
+        self.kid = kid
+        self.algorithm = algorithm
+        self.private_key = None
+        if private_key is not None:
+            self.private_key = serialization.load_pem_private_key(
+                private_key.encode(), password=None
+            )
+        if public_key is not None:
+            self.public_key = serialization.load_pem_public_key(public_key.encode())
+        else:
+            self.public_key = self.private_key.public_key()
+
+    def to_jwk(self):
+        jwk = json.loads(ASYMMETRIC_ALGORITHMS[self.algorithm].to_jwk(self.public_key))
+        jwk.update(kid=self.kid, alg=self.algorithm, use="sig")
+        return jwk
+
+
+class KeyRing:
+    """Signing keys for JWTs, looked up by the `kid` header on decode.
+
+    New tokens are signed with the active key. Retired keys only need their
+    public half and stay in the ring (and in the JWKS) until the tokens they
+    signed have expired. Without any keys tokens keep using simplejwt's
+    HS256 `SIGNING_KEY`, and such tokens are never published.
+    """
+
+    def __init__(self):
+        self._keys = None
+        self._active_key = None
+        self._jwks = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        with self._lock:
+            if self._keys is not None:
+                return
+
+            keys = {}
+            for entry in get_jwt_signing_setting("KEYS"):
+                key = SigningKey(
+                    kid=entry["KID"],
+                    algorithm=entry["ALGORITHM"],
+                    private_key=entry.get("PRIVATE_KEY"),
+                    public_key=entry.get("PUBLIC_KEY"),
+                )
+                keys[key.kid] = key
+
+            active_kid = get_jwt_signing_setting("ACTIVE_KID") or next(
+                (kid for kid, key in keys.items() if key.private_key is not None),
+                None,
+            )
+            active_key = keys.get(active_kid)
+            if keys and (active_key is None or active_key.private_key is None):
+                raise ImproperlyConfigured(
+                    f"JWT_SIGNING ACTIVE_KID {active_kid!r} has no private key."
+                )
+
+            self._jwks = {"keys": [key.to_jwk() for key in keys.values()]}
+            self._active_key = active_key
+            self._keys = keys
+
+    @property
+    def keys(self):
+        self.load()
+        return self._keys
+
+    @property
+    def active_key(self):
+        self.load()
+        return self._active_key
+
+    def get_jwks(self):
+        self.load()
+        return self._jwks
+
+    def encode(self, payload, json_encoder=None):
+        key = self.active_key
+        if key is None:
+            return jwt.encode(
+                payload,
+                api_settings.SIGNING_KEY,
+                algorithm=api_settings.ALGORITHM,
+                json_encoder=json_encoder,
+            )
+        return jwt.encode(
+            payload,
+            key.private_key,
+            algorithm=key.algorithm,
+            headers={"kid": key.kid},
+            json_encoder=json_encoder,
+        )
+
+    def decode(self, token, verify=True, **kwargs):
+        """Decode `token`, raising PyJWT's exceptions when it is not valid."""
+        kid = jwt.get_unverified_header(token).get("kid")
+        if kid is None:
+            if self.keys and not get_jwt_signing_setting("ACCEPT_HS256"):
+                raise jwt.DecodeError("Token has no key id.")
+            verifying_key = api_settings.SIGNING_KEY
+            algorithm = api_settings.ALGORITHM
+        else:
+            key = self.keys.get(kid)
+            if key is None:
+                raise jwt.DecodeError(f"Unknown key id {kid!r}.")
+            verifying_key = key.public_key
+            algorithm = key.algorithm
+
+        audience = kwargs.pop("audience", None)
+        return jwt.decode(
+            token,
+            verifying_key,
+            algorithms=[algorithm],
+            audience=audience,
+            options={"verify_aud": audience is not None, "verify_signature": verify},
+            **kwargs,
+        )
+
+    def reset(self):
+        with self._lock:
+            self._keys = None
+            self._active_key = None
+            self._jwks = None
+
+
+key_ring = KeyRing()
+
+
+class KeyRingTokenBackend(TokenBackend):
+    """simplejwt backend that signs and verifies through `key_ring`.
+
+    The parent constructor is skipped on purpose: it only accepts a single
+    algorithm, and not EdDSA.
+    """
+
+    def __init__(self, key_ring):
+        self.key_ring = key_ring
+        self.audience = api_settings.AUDIENCE
+        self.issuer = api_settings.ISSUER
+        self.leeway = api_settings.LEEWAY
+        self.json_encoder = api_settings.JSON_ENCODER
+        self.jwks_client = None
+
+    def encode(self, payload):
+        jwt_payload = payload.copy()
+        if self.audience is not None:
+            jwt_payload["aud"] = self.audience
+        if self.issuer is not None:
+            jwt_payload["iss"] = self.issuer
+        return self.key_ring.encode(jwt_payload, json_encoder=self.json_encoder)
+
+    def decode(self, token, verify=True):
+        try:
+            return self.key_ring.decode(
+                token,
+                verify=verify,
+                audience=self.audience,
+                issuer=self.issuer,
+                leeway=self.get_leeway(),
+            )
+        except InvalidAlgorithmError as ex:
+            raise TokenBackendError(_("Invalid algorithm specified")) from ex
+        except InvalidTokenError:
+            raise TokenBackendError(_("Token is invalid or expired"))
+
+
+token_backend = KeyRingTokenBackend(key_ring)
@@ -0,0 +1,261 @@
+import asyncio
+import hashlib
+import threading
+import time
+import weakref
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from django.conf import settings
+from django.core.cache import caches
+
+from users.metrics import record_outbound
+
+
+DEFAULT_KAKAO_API_SETTINGS = {
+    "BASE_URL": "https://kapi.kakao.com",
+    "CONNECT_TIMEOUT": 3.05,
+    "READ_TIMEOUT": 5,
+    "POOL_CONNECTIONS": 4,
+    "POOL_MAXSIZE": 32,
+    "POOL_BLOCK": False,
+    "PROFILE_CACHE": "kakao",
+}
+
+
+def get_kakao_api_setting(name):
+    return getattr(settings, "KAKAO_API", {}).get(
+        name, DEFAULT_KAKAO_API_SETTINGS[name]
+    )
+
+
+class KakaoClient:
+    """Process-wide keep-alive session for the Kakao REST API.
+
+    The session is created lazily so that settings overrides made before the
+    first request are honoured, and `reset()` drops it (and its pooled
+    connections) when the settings change.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._session = None
+        self._adapter = None
+        self.requests = 0
+        self.errors = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    @property
+    def session(self):
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    adapter = HTTPAdapter(
+                        pool_connections=get_kakao_api_setting("POOL_CONNECTIONS"),
+                        pool_maxsize=get_kakao_api_setting("POOL_MAXSIZE"),
+                        pool_block=get_kakao_api_setting("POOL_BLOCK"),
+                    )
+                    session = requests.Session()
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._adapter = adapter
+                    self._session = session
+        return self._session
+
+    @property
+    def timeout(self):
+        return (
+            get_kakao_api_setting("CONNECT_TIMEOUT"),
+            get_kakao_api_setting("READ_TIMEOUT"),
+        )
+
+    def get(self, path, **kwargs):
+        url = path
+        if not path.startswith(("http://", "https://")):
+            url = get_kakao_api_setting("BASE_URL") + path
+        kwargs.setdefault("timeout", self.timeout)
+        started_at = time.perf_counter()
+        try:
+            return self.session.get(url, **kwargs)
+        except requests.RequestException:
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            latency = time.perf_counter() - started_at
+            record_outbound("kakao", latency)
+            with self._lock:
+                self.requests += 1
+                self.total_latency += latency
+                self.max_latency = max(self.max_latency, latency)
+
+    def count_connections(self):
+        if self._adapter is None:
+            return 0
+        pools = self._adapter.poolmanager.pools
+        return sum(pools[key].num_connections for key in list(pools.keys()))
+
+    def get_stats(self):
+        connections = self.count_connections()
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "connections": connections,
+                "reused_connections": max(self.requests - connections, 0),
+                "total_latency": self.total_latency,
+                "max_latency": self.max_latency,
+                "avg_latency": self.total_latency / self.requests
+                if self.requests
+                else 0.0,
+            }
+
+    def reset(self):
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+            self._session = None
+            self._adapter = None
+            self.requests = 0
+            self.errors = 0
+            self.total_latency = 0.0
+            self.max_latency = 0.0
+
+
+kakao_client = KakaoClient()
+
+
+class AsyncKakaoClient:
+    """Non-blocking counterpart of `KakaoClient` for the ASGI views.
+
+    httpx clients are bound to the event loop that created them, so one
+    pooled client is kept per running loop.
+    """
+
+    def __init__(self):
+        self._clients = weakref.WeakKeyDictionary()
+        self.requests = 0
+        self.errors = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    @property
+    def client(self):
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = httpx.AsyncClient(
+                base_url=get_kakao_api_setting("BASE_URL"),
+                limits=httpx.Limits(
+                    max_connections=get_kakao_api_setting("POOL_MAXSIZE"),
+                    max_keepalive_connections=get_kakao_api_setting("POOL_MAXSIZE"),
+                ),
+                timeout=httpx.Timeout(
+                    get_kakao_api_setting("READ_TIMEOUT"),
+                    connect=get_kakao_api_setting("CONNECT_TIMEOUT"),
+                ),
+            )
+            self._clients[loop] = client
+        return client
+
+    async def get(self, path, **kwargs):
+        started_at = time.perf_counter()
+        try:
+            return await self.client.get(path, **kwargs)
+        except httpx.HTTPError:
+            self.errors += 1
+            raise
+        finally:
+            latency = time.perf_counter() - started_at
+            record_outbound("kakao", latency)
+            self.requests += 1
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+
+    def get_stats(self):
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "total_latency": self.total_latency,
+            "max_latency": self.max_latency,
+            "avg_latency": self.total_latency / self.requests if self.requests else 0.0,
+        }
+
+    async def aclose(self):
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+
+kakao_async_client = AsyncKakaoClient()
+
+
+class KakaoProfileCache:
+    """Short-lived cache of `/v2/user/me` answers keyed by token digest.
+
+    Entries live in the Django cache named by KAKAO_API["PROFILE_CACHE"],
+    whose TIMEOUT and MAX_ENTRIES bound how long and how many profiles are
+    kept. Raw access tokens are never used as cache keys.
+    """
+
+    key_prefix = "kakao:profile:"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def cache(self):
+        return caches[get_kakao_api_setting("PROFILE_CACHE")]
+
+    def make_key(self, access_token):
+        digest = hashlib.sha256(access_token.encode()).hexdigest()
+        return self.key_prefix + digest
+
+    def get(self, access_token):
+        user_data = self.cache.get(self.make_key(access_token))
+        with self._lock:
+            if user_data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return user_data
+
+    def set(self, access_token, user_data):
+        self.cache.set(self.make_key(access_token), user_data)
+
+    async def aget(self, access_token):
+        user_data = await self.cache.aget(self.make_key(access_token))
+        with self._lock:
+            if user_data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return user_data
+
+    async def aset(self, access_token, user_data):
+        await self.cache.aset(self.make_key(access_token), user_data)
+
+    def invalidate(self, access_token):
+        self.cache.delete(self.make_key(access_token))
+
+    def get_stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+    def reset(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+
+kakao_profile_cache = KakaoProfileCache()
@@ -0,0 +1,193 @@
+import threading
+import time
+
+import httpx
+import jwt
+import requests
+from asgiref.sync import sync_to_async
+
+from django.conf import settings
+
+from users.exceptions import KakaoException
+from users.kakao import kakao_async_client
+from users.kakao import kakao_client
+
+
+DEFAULT_KAKAO_OIDC_SETTINGS = {
+    "ISSUER": "https://kauth.kakao.com",
+    "JWKS_URL": "https://kauth.kakao.com/.well-known/jwks.json",
+    # REST API keys id_tokens may be issued to. id_tokens are refused
+    # while this is empty.
+    "AUDIENCE": [],
+    "ALGORITHMS": ["RS256"],
+    "LEEWAY": 30,
+    # Known keys are refetched this often...
+    "JWKS_REFRESH_SECONDS": 3600,
+    # ...and at most this often when a token names an unknown kid.
+    "JWKS_MIN_REFRESH_SECONDS": 60,
+}
+
+
+def get_kakao_oidc_setting(name):
+    return getattr(settings, "KAKAO_OIDC", {}).get(
+        name, DEFAULT_KAKAO_OIDC_SETTINGS[name]
+    )
+
+
+class KakaoJWKS:
+    """Kakao's OIDC signing keys, fetched lazily and kept in memory.
+
+    The keys are refetched once they are JWKS_REFRESH_SECONDS old. A token
+    signed with an unknown kid (Kakao rotated its keys) triggers an early
+    refetch, but no more than once every JWKS_MIN_REFRESH_SECONDS, so forged
+    kids cannot send every login to kauth.kakao.com. A failed refetch keeps
+    the previous keys.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.keys = {}
+        self.fetched_at = None
+        self.loaded_at = None
+        # Cleared while a fetch is in flight.
+        self.idle = threading.Event()
+        self.idle.set()
+
+    def claim_refresh(self, kid):
+        """Return whether the caller should refetch the keys now."""
+        now = time.monotonic()
+        with self.lock:
+            if self.fetched_at is not None:
+                since_fetch = now - self.fetched_at
+                if since_fetch < get_kakao_oidc_setting("JWKS_MIN_REFRESH_SECONDS"):
+                    return False
+                if kid in self.keys and now - self.loaded_at < get_kakao_oidc_setting(
+                    "JWKS_REFRESH_SECONDS"
+                ):
+                    return False
+            # Other threads keep using the current keys meanwhile.
+            self.fetched_at = now
+            self.idle.clear()
+            return True
+
+    def is_waiting_needed(self, kid):
+        # Only a fetch that may bring the key is worth waiting for.
+        with self.lock:
+            return kid not in self.keys and not self.idle.is_set()
+
+    @property
+    def wait_timeout(self):
+        timeout = kakao_client.timeout
+        return timeout[0] + timeout[1]
+
+    def load(self, data):
+        keys = {}
+        for jwk in data.get("keys", []):
+            try:
+                key = jwt.PyJWK(jwk)
+            except jwt.PyJWKError:
+                continue
+            if key.key_id:
+                keys[key.key_id] = key.key
+        with self.lock:
+            self.keys = keys
+            self.loaded_at = time.monotonic()
+
+    def refresh(self):
+        try:
+            response = kakao_client.get(get_kakao_oidc_setting("JWKS_URL"))
+            response.raise_for_status()
+            self.load(response.json())
+        except (requests.RequestException, ValueError):
+            pass
+        finally:
+            self.idle.set()
+
+    async def arefresh(self):
+        try:
+            response = await kakao_async_client.get(get_kakao_oidc_setting("JWKS_URL"))
+            response.raise_for_status()
+            self.load(response.json())
+        except (httpx.HTTPError, ValueError):
+            pass
+        finally:
+            self.idle.set()
+
+    def lookup(self, kid):
+        with self.lock:
+            key = self.keys.get(kid)
+        if key is None:
+            raise jwt.InvalidKeyError(f"Unknown kid: {kid}")
+        return key
+
+    def get_key(self, kid):
+        if self.claim_refresh(kid):
+            self.refresh()
+        elif self.is_waiting_needed(kid):
+            self.idle.wait(self.wait_timeout)
+        return self.lookup(kid)
+
+    async def aget_key(self, kid):
+        if self.claim_refresh(kid):
+            await self.arefresh()
+        elif self.is_waiting_needed(kid):
+            await sync_to_async(self.idle.wait, thread_sensitive=False)(
+                self.wait_timeout
+            )
+        return self.lookup(kid)
+
+    def reset(self):
+        with self.lock:
+            self.keys = {}
+            self.fetched_at = None
+            self.loaded_at = None
+            self.idle.set()
+
+
+kakao_jwks = KakaoJWKS()
+
+
+def get_id_token_kid(id_token):
+    if not get_kakao_oidc_setting("AUDIENCE"):
+        raise KakaoException("ID 토큰 로그인이 설정되지 않았습니다.")
+    try:
+        return jwt.get_unverified_header(id_token).get("kid")
+    except jwt.InvalidTokenError:
+        raise KakaoException("유효하지 않은 ID 토큰입니다.")
+
+
+def decode_id_token(id_token, key):
+    try:
+        payload = jwt.decode(
+            id_token,
+            key,
+            algorithms=get_kakao_oidc_setting("ALGORITHMS"),
+            audience=get_kakao_oidc_setting("AUDIENCE"),
+            issuer=get_kakao_oidc_setting("ISSUER"),
+            leeway=get_kakao_oidc_setting("LEEWAY"),
+            options={"require": ["exp", "iat", "iss", "aud", "sub"]},
+        )
+    except jwt.ExpiredSignatureError:
+        raise KakaoException("만료된 ID 토큰입니다.")
+    except jwt.InvalidTokenError:
+        raise KakaoException("유효하지 않은 ID 토큰입니다.")
+    # Same shape as the /v2/user/me answer the views read.
+    return {"id": int(payload["sub"])}
+
+
+def verify_id_token(id_token):
+    kid = get_id_token_kid(id_token)
+    try:
+        key = kakao_jwks.get_key(kid)
+    except jwt.InvalidKeyError:
+        raise KakaoException("유효하지 않은 ID 토큰입니다.")
+    return decode_id_token(id_token, key)
+
+
+async def averify_id_token(id_token):
+    kid = get_id_token_kid(id_token)
+    try:
+        key = await kakao_jwks.aget_key(kid)
+    except jwt.InvalidKeyError:
+        raise KakaoException("유효하지 않은 ID 토큰입니다.")
+    return decode_id_token(id_token, key)
@@ -0,0 +1,134 @@
+import hashlib
+import json
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+
+INVALID_ACCESS_TOKEN = "invalid"
+
+ID_TOKEN_ISSUER = "https://kauth.kakao.com"
+
+
+def get_stub_kakao_id(access_token):
+    """Derive a stable fake Kakao id from an access token."""
+    digest = hashlib.sha256(access_token.encode()).hexdigest()
+    return int(digest[:12], 16)
+
+
+class KakaoStubHandler(BaseHTTPRequestHandler):
+    """Answers `/v2/user/me` like kapi.kakao.com and serves the OIDC JWKS
+    like kauth.kakao.com, over HTTP/1.1 keep-alive."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.server.delay:
+            time.sleep(self.server.delay)
+
+        if self.path.split("?", 1)[0] == "/.well-known/jwks.json":
+            self.server.jwks_requests += 1
+            return self.send_json(200, self.server.get_jwks())
+
+        if self.path.split("?", 1)[0] != "/v2/user/me":
+            return self.send_json(404, {"msg": "not found", "code": -404})
+
+        authorization = self.headers.get("Authorization", "")
+        access_token = authorization.removeprefix("Bearer ").strip()
+        if not access_token or access_token == INVALID_ACCESS_TOKEN:
+            return self.send_json(
+                401, {"msg": "this access token does not exist", "code": -401}
+            )
+
+        kakao_id = get_stub_kakao_id(access_token)
+        self.send_json(
+            200,
+            {"id": kakao_id, "kakao_account": {"email": f"{kakao_id}@kakao.stub"}},
+        )
+
+    def send_json(self, status_code, data):
+        body = json.dumps(data).encode()
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json;charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class KakaoStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 0), delay=0.0):
+        super().__init__(address, KakaoStubHandler)
+        self.delay = delay
+        self.signing_keys = []
+        self.signing_keys_lock = threading.Lock()
+        self.jwks_requests = 0
+
+    def handle_error(self, request, client_address):
+        # Clients that hit their read timeout hang up mid-response.
+        pass
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def jwks_url(self):
+        return self.base_url + "/.well-known/jwks.json"
+
+    def rotate_signing_key(self):
+        """Start signing id_tokens with a new key, still publishing the old."""
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        with self.signing_keys_lock:
+            self.signing_keys.append(
+                (f"stub-{len(self.signing_keys) + 1}", private_key)
+            )
+
+    def get_signing_keys(self):
+        with self.signing_keys_lock:
+            if not self.signing_keys:
+                private_key = rsa.generate_private_key(
+                    public_exponent=65537, key_size=2048
+                )
+                self.signing_keys.append(("stub-1", private_key))
+            return list(self.signing_keys)
+
+    def get_jwks(self):
+        keys = []
+        for kid, private_key in self.get_signing_keys():
+            jwk = json.loads(
+                jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key())
+            )
+            keys.append({**jwk, "kid": kid, "alg": "RS256", "use": "sig"})
+        return {"keys": keys}
+
+    def issue_id_token(self, access_token, audience, lifetime=3600):
+        """Sign an id_token for the user `access_token` stands for."""
+        kid, private_key = self.get_signing_keys()[-1]
+        issued_at = int(time.time())
+        payload = {
+            "iss": ID_TOKEN_ISSUER,
+            "aud": audience,
+            "sub": str(get_stub_kakao_id(access_token)),
+            "iat": issued_at,
+            "exp": issued_at + lifetime,
+        }
+        return jwt.encode(payload, private_key, "RS256", headers={"kid": kid})
+
+
+def start_stub_server(host="127.0.0.1", port=0, delay=0.0):
+    """Serve the stub in a daemon thread and return the running server."""
+    server = KakaoStubServer((host, port), delay=delay)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
@@ -0,0 +1,132 @@
+import atexit
+import logging
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.utils import timezone
+
+
+DEFAULT_LAST_LOGIN_SETTINGS = {
+    # Buffered timestamps are written at most this long after the login...
+    "FLUSH_SECONDS": 10,
+    # ...or as soon as this many users are waiting.
+    "MAX_PENDING": 1000,
+    # Flush every FLUSH_SECONDS from a thread of its own and at exit, so
+    # idle processes write their logins too. When False only logins flush.
+    "FLUSH_IN_BACKGROUND": True,
+}
+
+logger = logging.getLogger(__name__)
+
+
+def get_last_login_setting(name):
+    return getattr(settings, "LAST_LOGIN", {}).get(
+        name, DEFAULT_LAST_LOGIN_SETTINGS[name]
+    )
+
+
+class LastLoginBuffer:
+    """Coalesces `User.last_login` writes into periodic bulk UPDATEs.
+
+    Logins only record the timestamp in memory; a background thread, the
+    login that finds the buffer due and process exit write every pending
+    user with one `bulk_update`. Repeated logins of a user between flushes
+    cost a single row update. A failed write is logged and retried by the
+    next flush.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.flushed_at = time.monotonic()
+        self.flusher = None
+        self.stopped = threading.Event()
+        self.exit_hook_registered = False
+
+    def start_flusher(self):
+        # Threads do not survive a fork, so this also covers new workers.
+        if self.flusher is not None and self.flusher.is_alive():
+            return
+        self.stopped = threading.Event()
+        self.flusher = threading.Thread(
+            target=self.run_flusher,
+            args=(self.stopped,),
+            name="last-login-flusher",
+            daemon=True,
+        )
+        self.flusher.start()
+        if not self.exit_hook_registered:
+            atexit.register(self.flush)
+            self.exit_hook_registered = True
+
+    def run_flusher(self, stopped):
+        while not stopped.wait(get_last_login_setting("FLUSH_SECONDS")):
+            self.flush()
+            # Connections are per thread; don't hold one between flushes.
+            connections.close_all()
+
+    def add(self, pk, logged_in_at):
+        """Buffer a login, returning whether the buffer should be flushed."""
+        with self.lock:
+            self.pending[pk] = logged_in_at
+            pending_count = len(self.pending)
+            age = time.monotonic() - self.flushed_at
+            if get_last_login_setting("FLUSH_IN_BACKGROUND"):
+                self.start_flusher()
+        if pending_count >= get_last_login_setting("MAX_PENDING"):
+            return True
+        return age >= get_last_login_setting("FLUSH_SECONDS")
+
+    def flush(self):
+        """Write the buffered logins, returning how many users were updated."""
+        with self.lock:
+            pending, self.pending = self.pending, {}
+            self.flushed_at = time.monotonic()
+        if not pending:
+            return 0
+
+        User = get_user_model()
+        try:
+            User.objects.bulk_update(
+                [
+                    User(pk=pk, last_login=last_login)
+                    for pk, last_login in pending.items()
+                ],
+                ["last_login"],
+            )
+        except Exception:
+            # The login itself succeeded; keep the timestamps for next time.
+            logger.exception("Failed to write %d last_login values.", len(pending))
+            with self.lock:
+                for pk, last_login in pending.items():
+                    self.pending.setdefault(pk, last_login)
+            return 0
+        return len(pending)
+
+    def reset(self):
+        self.stopped.set()
+        if self.flusher is not None:
+            self.flusher.join()
+        with self.lock:
+            self.pending = {}
+            self.flushed_at = time.monotonic()
+            self.flusher = None
+
+
+last_login_buffer = LastLoginBuffer()
+
+
+def record_login(user):
+    user.last_login = timezone.now()
+    if last_login_buffer.add(user.pk, user.last_login):
+        last_login_buffer.flush()
+
+
+async def arecord_login(user):
+    user.last_login = timezone.now()
+    if last_login_buffer.add(user.pk, user.last_login):
+        await sync_to_async(last_login_buffer.flush)()
@@ -0,0 +1,387 @@
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+
+from contextlib import ExitStack
+
+import django
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.db import connections
+from django.test import Client
+from django.test import override_settings
+from django.test.utils import setup_databases
+from django.test.utils import teardown_databases
+from django.urls import reverse
+
+from users import urls as users_urls
+from users.availability import name_index
+from users.kakao import kakao_client
+from users.kakao import kakao_profile_cache
+from users.kakao_oidc import kakao_jwks
+from users.kakao_stub import get_stub_kakao_id
+from users.kakao_stub import start_stub_server
+from users.last_login import last_login_buffer
+from users.revocation import revoked_tokens
+from users.throttling import token_buckets
+from users.tokens import AccessToken
+from users.tokens import RefreshToken
+
+
+BENCH_PASSWORD = "bench-password"
+
+BENCH_KAKAO_AUDIENCE = "bench-rest-api-key"
+
+
+def build_jwks(bench, i):
+    return "get", reverse("jwks"), None
+
+
+def build_login(bench, i):
+    user = bench.get_user(i)
+    return (
+        "post",
+        reverse("login"),
+        {"username": user.username, "password": BENCH_PASSWORD},
+    )
+
+
+def build_token_refresh(bench, i):
+    refresh = RefreshToken.for_user(bench.get_user(i))
+    return "post", reverse("token-refresh"), {"refresh": str(refresh)}
+
+
+def build_registration(bench, i):
+    return (
+        "post",
+        reverse("registration"),
+        {
+            "username": f"bench-registration-{i}",
+            "nickname": f"bench-registration-{i}",
+            "password": BENCH_PASSWORD,
+            "email": f"bench-registration-{i}@bench.test",
+            "favorate_race": "zerg",
+        },
+    )
+
+
+def build_batch_registration(bench, i):
+    return (
+        "post",
+        reverse("batch-registration"),
+        [
+            {
+                "username": f"bench-batch-{i}-{j}",
+                "nickname": f"bench-batch-{i}-{j}",
+                "password": BENCH_PASSWORD,
+                "email": f"bench-batch-{i}-{j}@bench.test",
+                "favorate_race": "protoss",
+            }
+            for j in range(bench.batch_size)
+        ],
+    )
+
+
+def build_availability(bench, i):
+    # Half taken, half free names.
+    username = bench.get_user(i).username if i % 2 else f"bench-free-{i}"
+    return "get", reverse("availability"), {"username": username}
+
+
+def build_email_verification(bench, i):
+    access_token = AccessToken.for_user(bench.get_user(i))
+    return "get", reverse("email-verification"), {"token": str(access_token)}
+
+
+def build_kakao_login(bench, i):
+    access_token = f"bench-kakao-{i % bench.seed_users}"
+    if bench.kakao_id_token:
+        id_token = bench.stub_server.issue_id_token(access_token, BENCH_KAKAO_AUDIENCE)
+        return "post", reverse("kakao-login"), {"id_token": id_token}
+    return "post", reverse("kakao-login"), {"access_token": access_token}
+
+
+def build_kakao_registration(bench, i):
+    return (
+        "post",
+        reverse("kakao-registration"),
+        {
+            "access_token": f"bench-kakao-registration-{i}",
+            "nickname": f"bench-kakao-registration-{i}",
+            "favorate_race": "terran",
+        },
+    )
+
+
+# One request builder per URL name in users.urls.
+SCENARIOS = {
+    "jwks": build_jwks,
+    "login": build_login,
+    "token-refresh": build_token_refresh,
+    "registration": build_registration,
+    "batch-registration": build_batch_registration,
+    "availability": build_availability,
+    "email-verification": build_email_verification,
+    "kakao-login": build_kakao_login,
+    "kakao-registration": build_kakao_registration,
+}
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def get_git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=settings.BASE_DIR,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive every route in users.urls at a given concurrency against a "
+        "throwaway test database, a local Kakao stub and locmem email, and "
+        "report throughput, latency percentiles and queries per request as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requests", type=int, default=200, help="Requests per route."
+        )
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument(
+            "--routes",
+            default=None,
+            help="Comma separated URL names to run, all of users.urls by default.",
+        )
+        parser.add_argument("--seed-users", type=int, default=100)
+        parser.add_argument("--batch-size", type=int, default=5)
+        parser.add_argument(
+            "--kakao-delay",
+            type=float,
+            default=0.0,
+            help="Seconds the Kakao stub waits before answering.",
+        )
+        parser.add_argument(
+            "--kakao-id-token",
+            action="store_true",
+            help="Log in to Kakao with locally verified OIDC id_tokens.",
+        )
+        parser.add_argument(
+            "--use-current-database",
+            action="store_true",
+            help="Skip creating a test database (the database must be empty).",
+        )
+        parser.add_argument("--output", default=None, help="Write JSON here.")
+
+    def handle(self, *args, **options):
+        url_names = [pattern.name for pattern in users_urls.urlpatterns]
+        missing = [name for name in url_names if name not in SCENARIOS]
+        if missing:
+            raise CommandError(f"No benchmark scenario for: {', '.join(missing)}")
+        if options["routes"]:
+            routes = options["routes"].split(",")
+            unknown = [name for name in routes if name not in url_names]
+            if unknown:
+                raise CommandError(f"Unknown routes: {', '.join(unknown)}")
+        else:
+            routes = url_names
+
+        self.seed_users = options["seed_users"]
+        self.batch_size = options["batch_size"]
+        self.kakao_id_token = options["kakao_id_token"]
+
+        with ExitStack() as stack:
+            if not options["use_current_database"]:
+                stack.enter_context(self.test_database())
+            stub_server = self.stub_server = start_stub_server(
+                delay=options["kakao_delay"]
+            )
+            stack.callback(stub_server.server_close)
+            stack.callback(stub_server.shutdown)
+            stack.enter_context(
+                override_settings(
+                    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+                    KAKAO_API={
+                        **getattr(settings, "KAKAO_API", {}),
+                        "BASE_URL": stub_server.base_url,
+                    },
+                    KAKAO_OIDC={
+                        **getattr(settings, "KAKAO_OIDC", {}),
+                        "JWKS_URL": stub_server.jwks_url,
+                        "AUDIENCE": [BENCH_KAKAO_AUDIENCE],
+                    },
+                    ALLOWED_HOSTS=["testserver"],
+                    # Every bench request comes from one client.
+                    THROTTLING={**getattr(settings, "THROTTLING", {}), "RATES": {}},
+                )
+            )
+            self.reset_state()
+            stack.callback(self.reset_state)
+
+            self.seed()
+            results = {
+                name: self.run_route(name, options["requests"], options["concurrency"])
+                for name in routes
+            }
+
+        report = {
+            "commit": get_git_commit(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connections["default"].vendor,
+            "requests_per_route": options["requests"],
+            "concurrency": options["concurrency"],
+            "kakao_delay": options["kakao_delay"],
+            "kakao_id_token": options["kakao_id_token"],
+            "routes": results,
+        }
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(output + "\n")
+        self.stdout.write(output)
+
+    def test_database(self):
+        stack = ExitStack()
+        for connection in connections.all():
+            test_settings = connection.settings_dict["TEST"]
+            if connection.vendor == "sqlite" and not test_settings.get("NAME"):
+                # In-memory SQLite would serialize the worker threads on
+                # table locks, a file honours the busy timeout instead.
+                path = os.path.join(
+                    tempfile.mkdtemp(), f"bench_{connection.alias}.sqlite3"
+                )
+                test_settings["NAME"] = path
+                stack.callback(test_settings.pop, "NAME")
+
+        old_config = setup_databases(verbosity=0, interactive=False)
+        stack.callback(teardown_databases, old_config, verbosity=0)
+        return stack
+
+    def reset_state(self):
+        for singleton in [
+            kakao_client,
+            kakao_jwks,
+            kakao_profile_cache,
+            name_index,
+            revoked_tokens,
+            last_login_buffer,
+            token_buckets,
+        ]:
+            singleton.reset()
+
+    def seed(self):
+        User = get_user_model()
+        password = make_password(BENCH_PASSWORD)
+        User.objects.bulk_create(
+            [
+                User(
+                    username=f"bench-user-{i}",
+                    nickname=f"bench-user-{i}",
+                    email=f"bench-user-{i}@bench.test",
+                    registration_type="email",
+                    password=password,
+                    is_verified=False,
+                )
+                for i in range(self.seed_users)
+            ]
+            + [
+                User(
+                    username=f"bench-kakao-{i}",
+                    nickname=f"bench-kakao-{i}",
+                    registration_type="kakao",
+                    kakao_id=get_stub_kakao_id(f"bench-kakao-{i}"),
+                    password=password,
+                )
+                for i in range(self.seed_users)
+            ]
+        )
+        self.users = list(User.objects.filter(username__startswith="bench-user-"))
+
+    def get_user(self, i):
+        return self.users[i % len(self.users)]
+
+    def run_route(self, name, requests, concurrency):
+        build = SCENARIOS[name]
+        counter = itertools.count()
+        samples = []
+        samples_lock = threading.Lock()
+
+        def worker():
+            client = Client()
+            worker_samples = []
+            try:
+                while (i := next(counter)) < requests:
+                    method, path, data = build(self, i)
+                    worker_samples.append(self.send(client, method, path, data))
+            finally:
+                connections.close_all()
+                with samples_lock:
+                    samples.extend(worker_samples)
+
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        started_at = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started_at
+
+        latencies = [latency for latency, _, _ in samples]
+        status_codes = {}
+        for _, status_code, _ in samples:
+            status_codes[str(status_code)] = status_codes.get(str(status_code), 0) + 1
+        return {
+            "requests": len(samples),
+            "errors": sum(status_code >= 400 for _, status_code, _ in samples),
+            "status_codes": status_codes,
+            "throughput_rps": round(len(samples) / elapsed, 2),
+            "latency_ms": {
+                "mean": round(statistics.mean(latencies) * 1000, 3),
+                "p50": round(percentile(latencies, 0.5) * 1000, 3),
+                "p90": round(percentile(latencies, 0.9) * 1000, 3),
+                "p99": round(percentile(latencies, 0.99) * 1000, 3),
+                "max": round(max(latencies) * 1000, 3),
+            },
+            "queries_per_request": round(
+                statistics.mean(queries for _, _, queries in samples), 2
+            ),
+        }
+
+    def send(self, client, method, path, data):
+        queries = 0
+
+        def count_query(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(count_query))
+            started_at = time.perf_counter()
+            if method == "get":
+                response = client.get(path, data=data)
+            else:
+                response = client.post(path, data=data, content_type="application/json")
+            latency = time.perf_counter() - started_at
+        return latency, response.status_code, queries
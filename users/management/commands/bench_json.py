@@ -0,0 +1,90 @@
+import io
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from users.parsers import ORJSONParser
+from users.renderers import ORJSONRenderer
+from users.serializers import UserSerializer
+from users.utils import create_token_with_user
+
+
+class Command(BaseCommand):
+    help = (
+        "Time DRF's JSON renderer and parser against the orjson ones on "
+        "the payloads of the token endpoints, checking the bytes match."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=10000)
+
+    def get_payloads(self):
+        User = get_user_model()
+        token = create_token_with_user(User(pk=1, username="username"))
+        serializer = UserSerializer(data={"favorate_race": "human"})
+        serializer.is_valid()
+        return {
+            "token": token,
+            "error": "'access_token'필드에 오류가 있습니다.",
+            "validation_errors": serializer.errors,
+            "batch_tokens": [{"username": f"user{i}", **token} for i in range(100)],
+        }
+
+    def get_bodies(self):
+        login = {"username": "username", "password": "password"}
+        batch = [
+            {
+                "username": f"user{i}",
+                "nickname": f"닉네임{i}",
+                "password": "password",
+                "email": f"user{i}@email.com",
+                "favorate_race": "zerg",
+            }
+            for i in range(100)
+        ]
+        return {
+            "login": JSONRenderer().render(login),
+            "batch_registration": JSONRenderer().render(batch),
+        }
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+
+        for name, data in self.get_payloads().items():
+            expected = JSONRenderer().render(data)
+            if ORJSONRenderer().render(data) != expected:
+                raise CommandError(f"Rendered {name} differs from JSONRenderer.")
+            self.report(
+                f"render {name}",
+                self.time(lambda: JSONRenderer().render(data), iterations),
+                self.time(lambda: ORJSONRenderer().render(data), iterations),
+            )
+
+        for name, body in self.get_bodies().items():
+            expected = JSONParser().parse(io.BytesIO(body))
+            if ORJSONParser().parse(io.BytesIO(body)) != expected:
+                raise CommandError(f"Parsed {name} differs from JSONParser.")
+            self.report(
+                f"parse {name}",
+                self.time(lambda: JSONParser().parse(io.BytesIO(body)), iterations),
+                self.time(lambda: ORJSONParser().parse(io.BytesIO(body)), iterations),
+            )
+
+    def time(self, function, iterations):
+        for _ in range(min(iterations, 100)):
+            function()
+        started_at = time.perf_counter()
+        for _ in range(iterations):
+            function()
+        return (time.perf_counter() - started_at) / iterations
+
+    def report(self, name, default, fast):
+        self.stdout.write(
+            f"{name:>26}: json={default * 1e6:.1f}us orjson={fast * 1e6:.1f}us "
+            f"({default / fast:.1f}x)"
+        )
@@ -0,0 +1,82 @@
+import statistics
+import time
+
+from django.core.handlers.base import BaseHandler
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from django.test import override_settings
+from django.urls import reverse
+
+from config.settings import api as api_profile
+from config.settings import base as base_profile
+
+
+class Command(BaseCommand):
+    help = (
+        "Time requests through the middleware of the base and the API settings "
+        "profiles and report the per-request difference."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=5000)
+        parser.add_argument(
+            "--path",
+            default=None,
+            help="Path to request, the JWKS endpoint by default.",
+        )
+        parser.add_argument(
+            "--with-cookies",
+            action="store_true",
+            help="Send session and CSRF cookies like a browser would.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"] or reverse("jwks")
+        headers = {}
+        if options["with_cookies"]:
+            headers["HTTP_COOKIE"] = "sessionid=0123456789abcdef; csrftoken=" + (
+                "x" * 64
+            )
+
+        results = {}
+        for name, middleware in [
+            ("base", base_profile.MIDDLEWARE),
+            ("api", api_profile.MIDDLEWARE),
+        ]:
+            timings = self.run(middleware, path, headers, options["requests"])
+            results[name] = timings
+            self.stdout.write(
+                f"{name:>5}: mean={statistics.mean(timings) * 1e6:.1f}us "
+                f"p50={statistics.median(timings) * 1e6:.1f}us "
+                f"p99={self.percentile(timings, 0.99) * 1e6:.1f}us"
+            )
+
+        saved = statistics.mean(results["base"]) - statistics.mean(results["api"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"API profile saves {saved * 1e6:.1f}us per request on {path} "
+                f"({saved / statistics.mean(results['base']):.1%})."
+            )
+        )
+
+    def run(self, middleware, path, headers, requests):
+        factory = RequestFactory()
+        with override_settings(MIDDLEWARE=middleware, ALLOWED_HOSTS=["testserver"]):
+            handler = BaseHandler()
+            handler.load_middleware()
+
+            for _ in range(min(requests, 100)):
+                handler.get_response(factory.get(path, **headers)).close()
+
+            timings = []
+            for _ in range(requests):
+                request = factory.get(path, **headers)
+                started_at = time.perf_counter()
+                response = handler.get_response(request)
+                timings.append(time.perf_counter() - started_at)
+                response.close()
+        return timings
+
+    def percentile(self, timings, fraction):
+        timings = sorted(timings)
+        return timings[min(len(timings) - 1, int(len(timings) * fraction))]
@@ -0,0 +1,284 @@
+import csv
+import json
+import os
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from operator import or_
+
+import django
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.core.validators import validate_email
+from django.db import DEFAULT_DB_ALIAS
+from django.db import IntegrityError
+from django.db import transaction
+from django.db.models import Q
+
+
+UNIQUE_FIELDS = ("username", "nickname", "email")
+
+
+class InvalidRow:
+    """Stands in for a line that could not be parsed into a row."""
+
+    def __init__(self, error):
+        self.error = error
+
+
+def read_rows(path, file_format):
+    """Yield `(line_number, row)` pairs without loading the whole file."""
+    with open(path, newline="", encoding="utf-8") as f:
+        if file_format == "csv":
+            reader = csv.DictReader(f)
+            for row in reader:
+                # The line the record ends on; quoted fields may span lines.
+                yield reader.line_num, row
+        else:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    row = InvalidRow(f"invalid JSON, {e.msg}")
+                yield line_number, row
+
+
+def chunked(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk import users from a CSV or JSONL file with username, nickname, "
+        "email, favorate_race and password columns."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument(
+            "--format",
+            choices=["csv", "jsonl"],
+            default=None,
+            help="Input format. Guessed from the file extension by default.",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="Password hashing processes. 0 hashes in this process.",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            default=None,
+            help="Checkpoint file, '<path>.checkpoint' by default.",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Skip the rows recorded in the checkpoint file.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_format = options["format"] or (
+            "csv" if path.lower().endswith(".csv") else "jsonl"
+        )
+        self.checkpoint_path = options["checkpoint"] or f"{path}.checkpoint"
+        self.User = get_user_model()
+        self.race_choices = {race for race, _ in self.User.RACE_LIST}
+        self.max_lengths = {
+            field_name: self.User._meta.get_field(field_name).max_length
+            for field_name in UNIQUE_FIELDS
+        }
+
+        state = {"line": 0, "imported": 0, "skipped": 0}
+        if options["resume"]:
+            state = self.read_checkpoint()
+            self.stdout.write(f"Resuming after line {state['line']}.")
+
+        rows = (
+            (line_number, row)
+            for line_number, row in read_rows(path, file_format)
+            if line_number > state["line"]
+        )
+
+        self.workers = options["workers"]
+        executor = None
+        if self.workers > 0:
+            executor = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=django.setup
+            )
+
+        started_at = time.perf_counter()
+        try:
+            for batch in chunked(rows, options["batch_size"]):
+                imported, skipped = self.import_batch(batch, executor)
+                state["line"] = batch[-1][0]
+                state["imported"] += imported
+                state["skipped"] += skipped
+                self.write_checkpoint(state)
+
+                elapsed = time.perf_counter() - started_at
+                self.stdout.write(
+                    f"line {state['line']}: imported={state['imported']} "
+                    f"skipped={state['skipped']} "
+                    f"({state['imported'] / elapsed:.1f} rows/sec)"
+                )
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {state['imported']} users, skipped {state['skipped']}."
+            )
+        )
+
+    def import_batch(self, batch, executor):
+        rows = []
+        for line_number, row in batch:
+            error = self.validate_row(row)
+            if error:
+                self.report(line_number, error)
+            else:
+                rows.append((line_number, row))
+
+        rows = self.drop_conflicts(rows)
+        passwords = [row.get("password") or None for _, row in rows]
+        if executor is None:
+            hashed_passwords = list(map(make_password, passwords))
+        else:
+            chunksize = max(1, len(passwords) // (self.workers * 4))
+            hashed_passwords = list(
+                executor.map(make_password, passwords, chunksize=chunksize)
+            )
+
+        users = [
+            self.User(
+                username=row["username"],
+                nickname=row["nickname"],
+                email=row.get("email") or None,
+                favorate_race=row.get("favorate_race") or "random",
+                password=hashed_password,
+            )
+            for (_, row), hashed_password in zip(rows, hashed_passwords)
+        ]
+
+        try:
+            with transaction.atomic():
+                self.User.objects.bulk_create(users)
+        except IntegrityError:
+            # Someone registered one of these names since drop_conflicts();
+            # check again against the now committed rows and retry once.
+            kept = {line_number for line_number, _ in self.drop_conflicts(rows)}
+            retried = [
+                (line_number, user)
+                for (line_number, _), user in zip(rows, users)
+                if line_number in kept
+            ]
+            users = [user for _, user in retried]
+            try:
+                with transaction.atomic():
+                    self.User.objects.bulk_create(users)
+            except IntegrityError:
+                # Still racing with registrations; insert the rows one by
+                # one to find those that clash.
+                users = self.create_each(retried)
+
+        return len(users), len(batch) - len(users)
+
+    def create_each(self, rows):
+        created = []
+        for line_number, user in rows:
+            try:
+                with transaction.atomic():
+                    self.User.objects.bulk_create([user])
+            except IntegrityError:
+                self.report(line_number, "already exists")
+            else:
+                created.append(user)
+        return created
+
+    def validate_row(self, row):
+        if isinstance(row, InvalidRow):
+            return row.error
+        if not isinstance(row, dict):
+            return "not a JSON object"
+        for field_name in ("username", "nickname"):
+            if not row.get(field_name):
+                return f"missing {field_name}"
+        for field_name, max_length in self.max_lengths.items():
+            if row.get(field_name) and len(str(row[field_name])) > max_length:
+                return f"{field_name} longer than {max_length} characters"
+        if row.get("email"):
+            try:
+                validate_email(row["email"])
+            except ValidationError:
+                return "invalid email"
+        if row.get("favorate_race") and row["favorate_race"] not in self.race_choices:
+            return "invalid favorate_race"
+        return None
+
+    def drop_conflicts(self, rows):
+        """Remove rows clashing with the database or an earlier row."""
+        lookups = [
+            Q(**{f"{field_name}__in": values})
+            for field_name in UNIQUE_FIELDS
+            if (values := {row[field_name] for _, row in rows if row.get(field_name)})
+        ]
+        taken = {field_name: set() for field_name in UNIQUE_FIELDS}
+        if lookups:
+            # Read from the primary; a replica may not have the rows yet.
+            existing_users = self.User.objects.using(DEFAULT_DB_ALIAS).filter(
+                reduce(or_, lookups)
+            )
+            for existing in existing_users.values(*UNIQUE_FIELDS):
+                for field_name in UNIQUE_FIELDS:
+                    taken[field_name].add(existing[field_name])
+
+        kept = []
+        for line_number, row in rows:
+            conflicts = [
+                field_name
+                for field_name in UNIQUE_FIELDS
+                if row.get(field_name) and row[field_name] in taken[field_name]
+            ]
+            if conflicts:
+                self.report(line_number, f"already exists: {', '.join(conflicts)}")
+                continue
+            for field_name in UNIQUE_FIELDS:
+                if row.get(field_name):
+                    taken[field_name].add(row[field_name])
+            kept.append((line_number, row))
+        return kept
+
+    def report(self, line_number, message):
+        self.stderr.write(f"line {line_number}: skipped, {message}")
+
+    def read_checkpoint(self):
+        try:
+            with open(self.checkpoint_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise CommandError(f"No checkpoint found at {self.checkpoint_path}.")
+
+    def write_checkpoint(self, state):
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.checkpoint_path)
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from users.kakao_stub import KakaoStubServer
+
+
+class Command(BaseCommand):
+    help = "Run a local stand-in for kapi.kakao.com for offline benchmarks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8089)
+        parser.add_argument(
+            "--delay",
+            type=float,
+            default=0.0,
+            help="Seconds to sleep before answering, to mimic upstream latency.",
+        )
+
+    def handle(self, *args, **options):
+        server = KakaoStubServer(
+            (options["host"], options["port"]), delay=options["delay"]
+        )
+        self.stdout.write(
+            f"Kakao stub listening on {server.base_url} "
+            f"(set KAKAO_API['BASE_URL'] to use it)"
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
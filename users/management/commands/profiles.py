@@ -0,0 +1,114 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from users.profiling import ProfileStore
+from users.profiling import get_profiling_setting
+from users.profiling import make_profile_header_value
+from users.profiling import summarize_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "List and summarise the request profiles written by "
+        "ProfilingMiddleware, or print a header value requesting one."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "action",
+            nargs="?",
+            choices=["list", "show", "summary", "sign", "clear"],
+            default="list",
+        )
+        parser.add_argument(
+            "profile_id", nargs="?", default=None, help="Profile to show."
+        )
+        parser.add_argument(
+            "--view", default=None, help="Only profiles of this URL name."
+        )
+        parser.add_argument("--limit", type=int, default=20)
+
+    def handle(self, *args, **options):
+        self.store = ProfileStore()
+        self.limit = options["limit"]
+        if options["action"] == "sign":
+            header = get_profiling_setting("HEADER")
+            self.stdout.write(f"{header}: {make_profile_header_value()}")
+        elif options["action"] == "show":
+            if not options["profile_id"]:
+                raise CommandError("Give the id of the profile to show.")
+            self.show(options["profile_id"])
+        elif options["action"] == "clear":
+            for profile_id in self.store.list_ids():
+                self.store.remove(profile_id)
+        else:
+            profiles = [
+                self.store.load(profile_id) for profile_id in self.store.list_ids()
+            ]
+            if options["view"]:
+                profiles = [
+                    profile
+                    for profile in profiles
+                    if profile["view"] == options["view"]
+                ]
+            if options["action"] == "summary":
+                self.summarize(profiles)
+            else:
+                for profile in profiles:
+                    self.stdout.write(self.format_profile(profile))
+
+    def format_profile(self, profile):
+        started_at = datetime.fromtimestamp(profile["time"]).isoformat(
+            sep=" ", timespec="seconds"
+        )
+        return (
+            f"{profile['id']}  {started_at}  {profile['method']} {profile['path']} "
+            f"{profile['status']}  {profile['duration'] * 1000:.1f}ms  "
+            f"sql={profile['sql_count']}/{profile['sql_duration'] * 1000:.1f}ms"
+        )
+
+    def write_functions(self, functions):
+        self.stdout.write(f"{'cumtime':>10} {'tottime':>10} {'calls':>8}  function")
+        for function in functions[: self.limit]:
+            self.stdout.write(
+                f"{function['cumtime'] * 1000:>8.1f}ms {function['tottime'] * 1000:>8.1f}ms "
+                f"{function['calls']:>8}  {function['function']}"
+            )
+
+    def show(self, profile_id):
+        try:
+            profile = self.store.load(profile_id)
+        except FileNotFoundError:
+            raise CommandError(f"No profile {profile_id}.")
+
+        self.stdout.write(self.format_profile(profile))
+        self.stdout.write("")
+        self.write_functions(profile["top_functions"])
+        self.stdout.write("")
+        queries = sorted(
+            profile["queries"], key=lambda query: query["duration"], reverse=True
+        )
+        for query in queries[: self.limit]:
+            self.stdout.write(
+                f"{query['duration'] * 1000:>8.1f}ms [{query['alias']}] {query['sql']}"
+            )
+
+    def summarize(self, profiles):
+        if not profiles:
+            self.stdout.write("No profiles.")
+            return
+
+        durations = sorted(profile["duration"] for profile in profiles)
+        sql_durations = [profile["sql_duration"] for profile in profiles]
+        self.stdout.write(
+            f"{len(profiles)} profiles: "
+            f"p50={durations[len(durations) // 2] * 1000:.1f}ms "
+            f"max={durations[-1] * 1000:.1f}ms "
+            f"sql={sum(sql_durations) / len(profiles) * 1000:.1f}ms/request"
+        )
+        self.stdout.write("")
+        # cProfile stats of every profile merged.
+        stats = self.store.load_stats([profile["id"] for profile in profiles])
+        self.write_functions(summarize_stats(stats, self.limit))
@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from users.outbox import deliver_outbox
+from users.outbox import get_outbox_setting
+
+
+class Command(BaseCommand):
+    help = "Deliver queued emails from the outbox in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Number of messages sent per SMTP connection.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds to sleep when the outbox is empty.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the outbox once and exit instead of polling forever.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"] or get_outbox_setting("BATCH_SIZE")
+        interval = options["interval"]
+
+        while True:
+            sent, failed = deliver_outbox(batch_size=batch_size)
+            if sent or failed:
+                self.stdout.write(f"sent={sent} failed={failed}")
+                continue
+            if options["once"]:
+                return
+            time.sleep(interval)
@@ -0,0 +1,76 @@
+import time
+
+from contextlib import ExitStack
+
+from django.core.management.base import BaseCommand
+
+from users.sweeping import get_sweep_cutoff
+from users.sweeping import get_sweep_queryset
+from users.sweeping import get_unverified_sweep_setting
+from users.sweeping import sweep_unverified_batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete users who never verified their email, in small batches. "
+        "Meant to run periodically, e.g. daily from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than-days",
+            type=float,
+            default=None,
+            help="Minimum account age, UNVERIFIED_SWEEP['MAX_AGE_DAYS'] by default.",
+        )
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=None,
+            help="Seconds to pause between batches.",
+        )
+        parser.add_argument(
+            "--archive",
+            default=None,
+            help="Append the deleted users to this JSON lines file.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count the users that would be deleted.",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = get_sweep_cutoff(options["older_than_days"])
+        if options["dry_run"]:
+            count = get_sweep_queryset(cutoff).count()
+            self.stdout.write(f"{count} unverified users joined before {cutoff}.")
+            return
+
+        batch_size = options["batch_size"] or get_unverified_sweep_setting("BATCH_SIZE")
+        sleep = options["sleep"]
+        if sleep is None:
+            sleep = get_unverified_sweep_setting("SLEEP_SECONDS")
+
+        total = 0
+        after = None
+        with ExitStack() as stack:
+            archive = None
+            if options["archive"]:
+                archive = stack.enter_context(
+                    open(options["archive"], "a", encoding="utf-8")
+                )
+            while True:
+                deleted, after = sweep_unverified_batch(
+                    cutoff, after, batch_size=batch_size, archive=archive
+                )
+                if after is None:
+                    break
+                total += deleted
+                self.stdout.write(f"deleted={deleted} total={total}")
+                time.sleep(sleep)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Deleted {total} users unverified since {cutoff}.")
+        )
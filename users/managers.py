@@ -1,10 +1,72 @@
 from django.contrib.auth.models import BaseUserManager
+from django.db import models
+from django.db import transaction
 
+from users.availability import name_index
+from users.caches import AUTH_USER_CACHE_FIELDS
+from users.caches import invalidate_cached_users
 
-class UserManager(BaseUserManager):
+
+class UserQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        for user in objs:
+            name_index.add_user(user)
+        return objs
+
+    def update(self, **kwargs):
+        if AUTH_USER_CACHE_FIELDS.isdisjoint(kwargs):
+            return self._update_without_invalidation(**kwargs)
+
+        pks = list(self.values_list("pk", flat=True))
+        rows = self._update_without_invalidation(**kwargs)
+        invalidate_cached_users(pks)
+        return rows
+
+    update.alters_data = True
+
+    def _update_without_invalidation(self, **kwargs):
+        """update() for callers that evict the cached users themselves."""
+        name_index.add_values(kwargs)
+        return super().update(**kwargs)
+
+    _update_without_invalidation.alters_data = True
+
+    def delete(self):
+        pks = list(self.values_list("pk", flat=True))
+        deleted = super().delete()
+        invalidate_cached_users(pks)
+        return deleted
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
     def create_user(self, username, nickname, password=None, **extra_fields):
-        try:
-            user = self.model(username=username, nickname=nickname, **extra_fields)
+        user = self.model(username=username, nickname=nickname, **extra_fields)
+        if password:
+            user.set_password(password)
+        else:
+            user.set_unusable_password()
+        user.is_active = True
+        user.is_staff = False
+        user.is_superuser = False
+        user.save()
+
+        return user
+
+    def bulk_create_users(self, users_data):
+        """Insert many users like `create_user` does, with one INSERT.
+
+        `users_data` holds dicts of `create_user` keyword arguments. Returns
+        the saved users in the same order.
+        """
+        users = []
+        for user_data in users_data:
+            user_data = dict(user_data)
+            password = user_data.pop("password", None)
+            user = self.model(**user_data)
             if password:
                 user.set_password(password)
             else:
@@ -12,11 +74,45 @@ class UserManager(BaseUserManager):
             user.is_active = True
             user.is_staff = False
             user.is_superuser = False
-            user.save()
+            users.append(user)
 
-            return user
-        except Exception as e:
-            print(e)
+        return self.bulk_create(users)
+
+    def verify_email(self, pk):
+        """Mark the user verified with one conditional UPDATE.
+
+        Returns whether this call changed the flag; already verified (or
+        missing) users are left untouched.
+        """
+        # The pk is known, so skip update()'s pk lookup.
+        updated = self.filter(pk=pk, is_verified=False)._update_without_invalidation(
+            is_verified=True
+        )
+        if updated:
+            invalidate_cached_users([pk])
+        return bool(updated)
+
+    def create_kakao_user(self, kakao_id, nickname, **extra_fields):
+        """Insert a Kakao user, relying on the unique Kakao identity constraint.
+
+        Raises IntegrityError when the Kakao account is already registered,
+        which keeps concurrent signups for one account from both succeeding
+        without a separate existence check.
+        """
+        with transaction.atomic():
+            return self.create_user(
+                username=kakao_id,
+                nickname=nickname,
+                registration_type="kakao",
+                kakao_id=kakao_id,
+                **extra_fields,
+            )
+
+    def get_kakao_user(self, kakao_id):
+        return self.filter(registration_type="kakao", kakao_id=kakao_id).first()
+
+    async def aget_kakao_user(self, kakao_id):
+        return await self.filter(registration_type="kakao", kakao_id=kakao_id).afirst()
 
     def create_superuser(self, username, nickname, password=None, **extra_fields):
         try:
@@ -0,0 +1,259 @@
+import contextvars
+import hmac
+import ipaddress
+import threading
+import time
+
+from bisect import bisect_left
+
+from django.conf import settings
+from django.db import connections
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+DEFAULT_METRICS_SETTINGS = {
+    # Client networks allowed to scrape /metrics. Matched against
+    # REMOTE_ADDR, so scrapers should reach the workers directly rather
+    # than through a proxy.
+    "ALLOWED_NETWORKS": ["127.0.0.0/8", "::1/128"],
+    # Scrapers elsewhere may send "Authorization: Bearer <TOKEN>" instead.
+    "TOKEN": None,
+}
+
+# Per-request accumulator read by the query recorder and `record_outbound`.
+# Being a context variable it follows requests into sync_to_async threads.
+current_request_stats = contextvars.ContextVar("current_request_stats", default=None)
+
+
+class RequestStats:
+    __slots__ = ("db_queries", "db_duration", "outbound")
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_duration = 0.0
+        self.outbound = {}
+
+
+def new_shard():
+    return {"requests": {}, "outbound": {}}
+
+
+def merge_shard(target, shard):
+    for key, series in list(shard["requests"].items()):
+        merged = target["requests"].setdefault(key, [0] * len(series))
+        for i, value in enumerate(series):
+            merged[i] += value
+    for key, series in list(shard["outbound"].items()):
+        merged = target["outbound"].setdefault(key, [0, 0.0])
+        merged[0] += series[0]
+        merged[1] += series[1]
+
+
+class MetricsRegistry:
+    """Per-process request metrics aggregated without a shared lock.
+
+    Every thread writes to its own shard, so recording never contends with
+    other threads; shards are only merged when the metrics are scraped.
+    Shards of finished threads are folded into a retired shard, so
+    short-lived threads neither pile up nor make the counters go back.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._local = threading.local()
+        self._shards = {}
+        self._retired = new_shard()
+        self._lock = threading.Lock()
+        self.collectors = []
+
+    def register_collector(self, collector):
+        """Add a callable returning extra exposition lines for each scrape."""
+        if collector not in self.collectors:
+            self.collectors.append(collector)
+
+    def get_shard(self):
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = new_shard()
+            # current_thread() also registers threads not started through
+            # `threading`, so that prune() sees them alive.
+            ident = threading.current_thread().ident
+            with self._lock:
+                self.prune()
+                # Left by a finished thread whose ident was reused.
+                stale = self._shards.pop(ident, None)
+                if stale is not None:
+                    merge_shard(self._retired, stale)
+                self._shards[ident] = shard
+            self._local.shard = shard
+        return shard
+
+    def prune(self):
+        """Fold the shards of finished threads into the retired shard."""
+        alive = {thread.ident for thread in threading.enumerate()}
+        for ident in [ident for ident in self._shards if ident not in alive]:
+            merge_shard(self._retired, self._shards.pop(ident))
+
+    def observe_request(self, view, method, status, duration, stats):
+        shard = self.get_shard()
+
+        key = (view, method, str(status))
+        series = shard["requests"].get(key)
+        if series is None:
+            # count, sum, db queries, db seconds, then one slot per bucket
+            series = shard["requests"][key] = [0, 0.0, 0, 0.0] + [0] * (
+                len(self.buckets) + 1
+            )
+        series[0] += 1
+        series[1] += duration
+        series[2] += stats.db_queries
+        series[3] += stats.db_duration
+        series[4 + bisect_left(self.buckets, duration)] += 1
+
+        for service, (calls, seconds) in stats.outbound.items():
+            self.observe_outbound(view, service, calls, seconds, shard=shard)
+
+    def observe_outbound(self, view, service, calls, seconds, shard=None):
+        outbound = (shard or self.get_shard())["outbound"]
+        key = (view, service)
+        series = outbound.get(key)
+        if series is None:
+            series = outbound[key] = [0, 0.0]
+        series[0] += calls
+        series[1] += seconds
+
+    def collect(self):
+        """Merge all shards into `(requests, outbound)` dicts."""
+        merged = new_shard()
+        with self._lock:
+            self.prune()
+            merge_shard(merged, self._retired)
+            shards = list(self._shards.values())
+        for shard in shards:
+            merge_shard(merged, shard)
+        return merged["requests"], merged["outbound"]
+
+    def reset(self):
+        with self._lock:
+            for shard in [self._retired, *self._shards.values()]:
+                shard["requests"].clear()
+                shard["outbound"].clear()
+
+    def render_prometheus(self):
+        requests, outbound = self.collect()
+        lines = [
+            "# HELP http_request_duration_seconds Request latency by URL name.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (view, method, status), series in sorted(requests.items()):
+            labels = f'view="{view}",method="{method}",status="{status}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets, series[4:]):
+                cumulative += count
+                lines.append(
+                    f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} '
+                    f"{cumulative}"
+                )
+            lines.append(
+                f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} '
+                f"{series[0]}"
+            )
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {series[1]}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {series[0]}")
+
+        lines += [
+            "# HELP http_request_db_queries_total SQL queries issued by requests.",
+            "# TYPE http_request_db_queries_total counter",
+        ]
+        for (view, method, status), series in sorted(requests.items()):
+            labels = f'view="{view}",method="{method}",status="{status}"'
+            lines.append(f"http_request_db_queries_total{{{labels}}} {series[2]}")
+
+        lines += [
+            "# HELP http_request_db_duration_seconds_total Time spent in SQL.",
+            "# TYPE http_request_db_duration_seconds_total counter",
+        ]
+        for (view, method, status), series in sorted(requests.items()):
+            labels = f'view="{view}",method="{method}",status="{status}"'
+            lines.append(
+                f"http_request_db_duration_seconds_total{{{labels}}} {series[3]}"
+            )
+
+        lines += [
+            "# HELP outbound_duration_seconds_total Time spent calling other services.",
+            "# TYPE outbound_duration_seconds_total counter",
+        ]
+        for (view, service), series in sorted(outbound.items()):
+            labels = f'view="{view}",service="{service}"'
+            lines.append(f"outbound_duration_seconds_total{{{labels}}} {series[1]}")
+
+        lines += [
+            "# HELP outbound_calls_total Calls made to other services.",
+            "# TYPE outbound_calls_total counter",
+        ]
+        for (view, service), series in sorted(outbound.items()):
+            labels = f'view="{view}",service="{service}"'
+            lines.append(f"outbound_calls_total{{{labels}}} {series[0]}")
+
+        for collector in self.collectors:
+            lines += collector()
+
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def record_outbound(service, seconds):
+    """Attribute time spent on an external call (Kakao, SMTP, ...)."""
+    stats = current_request_stats.get()
+    if stats is None:
+        registry.observe_outbound("-", service, 1, seconds)
+    else:
+        calls, total = stats.outbound.get(service, (0, 0.0))
+        stats.outbound[service] = (calls + 1, total + seconds)
+
+
+def record_query(execute, sql, params, many, context):
+    stats = current_request_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+
+    started_at = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.db_queries += 1
+        stats.db_duration += time.perf_counter() - started_at
+
+
+def install_query_recorder(connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def install_query_recorders():
+    for connection in connections.all():
+        install_query_recorder(connection)
+
+
+def get_metrics_setting(name):
+    return getattr(settings, "METRICS", {}).get(name, DEFAULT_METRICS_SETTINGS[name])
+
+
+def is_metrics_access_allowed(request):
+    token = get_metrics_setting("TOKEN")
+    if token:
+        authorization = request.headers.get("Authorization", "")
+        if hmac.compare_digest(authorization.encode(), f"Bearer {token}".encode()):
+            return True
+
+    try:
+        address = ipaddress.ip_address(request.META.get("REMOTE_ADDR", ""))
+    except ValueError:
+        return False
+    return any(
+        address in ipaddress.ip_network(network)
+        for network in get_metrics_setting("ALLOWED_NETWORKS")
+    )
@@ -0,0 +1,222 @@
+import asyncio
+import logging
+import math
+import time
+
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.messages.middleware import MessageMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.db.backends.signals import connection_created
+from django.middleware.csrf import CsrfViewMiddleware
+
+from config.db.routers import get_replica_router_setting
+from config.db.routers import routing_context
+
+from users.metrics import RequestStats
+from users.metrics import current_request_stats
+from users.metrics import install_query_recorder
+from users.metrics import install_query_recorders
+from users.metrics import registry
+from users.profiling import RequestProfiler
+from users.profiling import install_profiled_query_recorder
+from users.profiling import should_profile
+
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsMiddleware:
+    """Record latency, SQL and outbound time per URL name.
+
+    Place it first in MIDDLEWARE so the measured latency covers the rest
+    of the stack. The numbers are exposed by `users.views.metrics_view`.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+        connection_created.connect(
+            install_query_recorder, dispatch_uid="users.metrics.query_recorder"
+        )
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+
+        install_query_recorders()
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+        started_at = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_request_stats.reset(token)
+        self.observe(request, response, time.perf_counter() - started_at, stats)
+        return response
+
+    async def __acall__(self, request):
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+        started_at = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_request_stats.reset(token)
+        self.observe(request, response, time.perf_counter() - started_at, stats)
+        return response
+
+    def observe(self, request, response, duration, stats):
+        resolver_match = getattr(request, "resolver_match", None)
+        view = resolver_match.url_name if resolver_match else None
+        registry.observe_request(
+            view or "<unmatched>", request.method, response.status_code, duration, stats
+        )
+
+
+class ProfilingMiddleware:
+    """Profile requests carrying a signed header or picked by sampling.
+
+    See `users.profiling`: the cProfile stats and SQL timings are written
+    to PROFILING["DIRECTORY"] and the profile id is returned in the
+    X-Profile-Id response header. `manage.py profiles` reads them back.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+        connection_created.connect(
+            install_profiled_query_recorder,
+            dispatch_uid="users.profiling.query_recorder",
+        )
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+
+        if not should_profile(request):
+            return self.get_response(request)
+        profiler = RequestProfiler()
+        if not profiler.start():
+            return self.get_response(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.stop()
+        return self.save_profile(request, response, profiler)
+
+    async def __acall__(self, request):
+        if not should_profile(request):
+            return await self.get_response(request)
+        profiler = RequestProfiler()
+        if not profiler.start():
+            return await self.get_response(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            profiler.stop()
+        return self.save_profile(request, response, profiler)
+
+    def save_profile(self, request, response, profiler):
+        try:
+            profile_id = profiler.save(request, response)
+        except Exception:
+            # A profile is never worth failing the request it describes.
+            logger.exception("Failed to save the profile of %s.", request.path)
+        else:
+            response["X-Profile-Id"] = profile_id
+        return response
+
+
+class ReplicaPinningMiddleware:
+    """Keep a client on the primary database for a while after it wrote.
+
+    A write during the request sets a short-lived cookie; requests carrying
+    it read from the primary, so a client sees its own registration or
+    verification even if the replicas lag behind.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+
+        with routing_context(pinned=self.is_pinned(request)) as state:
+            response = self.get_response(request)
+        return self.process_response(state, response)
+
+    async def __acall__(self, request):
+        with routing_context(pinned=self.is_pinned(request)) as state:
+            response = await self.get_response(request)
+        return self.process_response(state, response)
+
+    def is_pinned(self, request):
+        return get_replica_router_setting("PIN_COOKIE_NAME") in request.COOKIES
+
+    def process_response(self, state, response):
+        if state.wrote:
+            response.set_cookie(
+                get_replica_router_setting("PIN_COOKIE_NAME"),
+                "1",
+                max_age=math.ceil(
+                    get_replica_router_setting("READ_YOUR_WRITES_SECONDS")
+                ),
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+
+def is_api_request(request):
+    prefixes = getattr(settings, "API_PATH_PREFIXES", ["/api/"])
+    return request.path_info.startswith(tuple(prefixes))
+
+
+class ApiExemptMiddlewareMixin:
+    """Pass API requests straight through the wrapped middleware.
+
+    The API authenticates with JWTs and never reads sessions, messages or
+    CSRF cookies, so only the other paths (the admin) need them.
+    """
+
+    def __call__(self, request):
+        if is_api_request(request):
+            return self.get_response(request)
+        return super().__call__(request)
+
+
+class ApiExemptSessionMiddleware(ApiExemptMiddlewareMixin, SessionMiddleware):
+    pass
+
+
+class ApiExemptCsrfViewMiddleware(ApiExemptMiddlewareMixin, CsrfViewMiddleware):
+    def process_view(self, request, callback, callback_args, callback_kwargs):
+        # Unlike the request/response hooks this one is called by the handler.
+        if is_api_request(request):
+            return None
+        return super().process_view(request, callback, callback_args, callback_kwargs)
+
+
+class ApiExemptAuthenticationMiddleware(
+    ApiExemptMiddlewareMixin, AuthenticationMiddleware
+):
+    pass
+
+
+class ApiExemptMessageMiddleware(ApiExemptMiddlewareMixin, MessageMiddleware):
+    pass
@@ -0,0 +1,86 @@
+# Generated by Django 4.1.1 on 2026-10-18 06:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="User",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("password", models.CharField(max_length=128, verbose_name="password")),
+                (
+                    "registration_type",
+                    models.CharField(
+                        choices=[("email", "Email"), ("kakao", "Kakao")],
+                        default=("email", "Email"),
+                        max_length=20,
+                    ),
+                ),
+                ("username", models.CharField(max_length=100, unique=True)),
+                ("nickname", models.CharField(max_length=100, unique=True)),
+                ("email", models.EmailField(max_length=254, null=True, unique=True)),
+                (
+                    "favorate_race",
+                    models.CharField(
+                        choices=[
+                            ("terran", "Terran"),
+                            ("zerg", "Zerg"),
+                            ("protoss", "Protoss"),
+                            ("random", "Random"),
+                        ],
+                        default="random",
+                        max_length=10,
+                    ),
+                ),
+                ("is_staff", models.BooleanField(default=False)),
+                ("is_active", models.BooleanField(default=True)),
+                ("is_verified", models.BooleanField(default=True)),
+                ("is_superuser", models.BooleanField(default=False)),
+                ("date_joined", models.DateTimeField(auto_now_add=True)),
+                ("last_login", models.DateTimeField(blank=True, null=True)),
+                ("kakao_id", models.BigIntegerField(default=0, null=True)),
+                (
+                    "groups",
+                    models.ManyToManyField(
+                        blank=True,
+                        help_text="The groups this user belongs to. A user will get all permissions granted to each of their groups.",
+                        related_name="user_set",
+                        related_query_name="user",
+                        to="auth.group",
+                        verbose_name="groups",
+                    ),
+                ),
+                (
+                    "user_permissions",
+                    models.ManyToManyField(
+                        blank=True,
+                        help_text="Specific permissions for this user.",
+                        related_name="user_set",
+                        related_query_name="user",
+                        to="auth.permission",
+                        verbose_name="user permissions",
+                    ),
+                ),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.1.1 on 2026-10-18 06:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0002_email_outbox"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="user",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("registration_type", "kakao")),
+                fields=("registration_type", "kakao_id"),
+                name="unique_kakao_identity",
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.1.1 on 2026-10-18 07:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0004_revoked_token"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                condition=models.Q(("is_verified", False)),
+                fields=["date_joined", "id"],
+                name="user_unverified_joined_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.1.1 on 2026-10-18 07:10
+
+from django.db import migrations, models
+
+
+def fix_registration_type(apps, schema_editor):
+    # The old default stored the whole ("email", "Email") choice.
+    User = apps.get_model("users", "User")
+    User.objects.filter(registration_type=str(("email", "Email"))).update(
+        registration_type="email"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0005_user_unverified_joined_idx"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="user",
+            name="registration_type",
+            field=models.CharField(
+                choices=[("email", "Email"), ("kakao", "Kakao")],
+                default="email",
+                max_length=20,
+            ),
+        ),
+        migrations.RunPython(fix_registration_type, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,10 @@
 from django.db import models
 from django.contrib.auth.models import AbstractBaseUser
 from django.contrib.auth.models import PermissionsMixin
+from django.utils import timezone
 
+from users.availability import name_index
+from users.caches import invalidate_cached_users
 from users.managers import UserManager
 
 
@@ -18,7 +21,7 @@ class User(AbstractBaseUser, PermissionsMixin):
     ]
 
     registration_type = models.CharField(
-        max_length=20, choices=USER_TYPE_CHOICES, default=USER_TYPE_CHOICES[0]
+        max_length=20, choices=USER_TYPE_CHOICES, default=USER_TYPE_CHOICES[0][0]
     )
     username = models.CharField(max_length=100, unique=True)
     nickname = models.CharField(max_length=100, unique=True)
@@ -43,5 +46,71 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     objects = UserManager()
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["registration_type", "kakao_id"],
+                condition=models.Q(registration_type="kakao"),
+                name="unique_kakao_identity",
+            ),
+        ]
+        indexes = [
+            # Keyset scans of `sweep_unverified_users`.
+            models.Index(
+                fields=["date_joined", "id"],
+                condition=models.Q(is_verified=False),
+                name="user_unverified_joined_idx",
+            ),
+        ]
+
     def __str__(self):
         return self.nickname
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        invalidate_cached_users([self.pk])
+        name_index.add_user(self)
+
+    def delete(self, *args, **kwargs):
+        pk = self.pk
+        deleted = super().delete(*args, **kwargs)
+        invalidate_cached_users([pk])
+        return deleted
+
+
+class EmailOutbox(models.Model):
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("sent", "Sent"),
+        ("dead", "Dead"),
+    ]
+
+    to_email = models.EmailField(max_length=254)
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["status", "next_attempt_at"], name="outbox_status_due_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.to_email}"
+
+
+class RevokedToken(models.Model):
+    jti = models.CharField(max_length=255, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return self.jti
@@ -0,0 +1,129 @@
+import time
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.core.mail import get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from users.metrics import record_outbound
+from users.models import EmailOutbox
+
+
+DEFAULT_OUTBOX_SETTINGS = {
+    "BATCH_SIZE": 50,
+    "MAX_ATTEMPTS": 5,
+    "BACKOFF_SECONDS": 30,
+    "MAX_BACKOFF_SECONDS": 3600,
+}
+
+
+def get_outbox_setting(name):
+    return getattr(settings, "EMAIL_OUTBOX", {}).get(
+        name, DEFAULT_OUTBOX_SETTINGS[name]
+    )
+
+
+def enqueue_email(subject, body, to_email):
+    return EmailOutbox.objects.create(subject=subject, body=body, to_email=to_email)
+
+
+def enqueue_emails(messages):
+    """Queue several messages with a single INSERT.
+
+    `messages` is an iterable of dicts shaped like the one passed to
+    `send_verification_email`.
+    """
+    return EmailOutbox.objects.bulk_create(
+        [
+            EmailOutbox(
+                subject=message["email_subject"],
+                body=message["email_body"],
+                to_email=message["to_email"],
+            )
+            for message in messages
+        ]
+    )
+
+
+def get_retry_delay(attempts):
+    delay = get_outbox_setting("BACKOFF_SECONDS") * 2 ** (attempts - 1)
+    return timedelta(seconds=min(delay, get_outbox_setting("MAX_BACKOFF_SECONDS")))
+
+
+def deliver_outbox(batch_size=None, connection=None):
+    """Send one batch of due messages over a single SMTP connection.
+
+    Rows are claimed with `SELECT ... FOR UPDATE SKIP LOCKED` so several
+    workers can drain the outbox concurrently. Returns a `(sent, failed)`
+    tuple for the batch.
+    """
+    batch_size = batch_size or get_outbox_setting("BATCH_SIZE")
+    max_attempts = get_outbox_setting("MAX_ATTEMPTS")
+    connection = connection or get_connection()
+
+    sent, failed = [], []
+    with transaction.atomic():
+        now = timezone.now()
+        batch = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True)
+            .filter(status="pending", next_attempt_at__lte=now)
+            .order_by("next_attempt_at", "id")[:batch_size]
+        )
+        if not batch:
+            return 0, 0
+
+        started_at = time.perf_counter()
+        try:
+            connection.open()
+        except Exception as e:
+            failed = [(outbox, e) for outbox in batch]
+        else:
+            try:
+                for outbox in batch:
+                    message = EmailMessage(
+                        subject=outbox.subject,
+                        body=outbox.body,
+                        to=(outbox.to_email,),
+                    )
+                    try:
+                        connection.send_messages([message])
+                        sent.append(outbox)
+                    except Exception as e:
+                        failed.append((outbox, e))
+            finally:
+                connection.close()
+        record_outbound("smtp", time.perf_counter() - started_at)
+
+        now = timezone.now()
+        for outbox in sent:
+            outbox.status = "sent"
+            outbox.sent_at = now
+            outbox.last_error = ""
+        for outbox, error in failed:
+            outbox.attempts += 1
+            outbox.last_error = str(error)
+            if outbox.attempts >= max_attempts:
+                outbox.status = "dead"
+            else:
+                outbox.next_attempt_at = now + get_retry_delay(outbox.attempts)
+
+        EmailOutbox.objects.bulk_update(
+            sent + [outbox for outbox, _ in failed],
+            ["status", "attempts", "last_error", "next_attempt_at", "sent_at"],
+        )
+
+    return len(sent), len(failed)
+
+
+def drain_outbox(batch_size=None):
+    """Deliver batches until no due message is left."""
+    total_sent, total_failed = 0, 0
+    while True:
+        sent, failed = deliver_outbox(batch_size=batch_size)
+        total_sent += sent
+        total_failed += failed
+        if sent + failed == 0:
+            return total_sent, total_failed
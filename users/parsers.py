@@ -0,0 +1,41 @@
+from django.conf import settings
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.utils import json
+
+from users.renderers import ORJSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class ORJSONParser(JSONParser):
+    """`JSONParser` that decodes with orjson when it is installed.
+
+    Bodies orjson refuses (integers beyond 64 bits, lone surrogate escapes)
+    are retried with the standard library so the accepted input does not
+    change.
+    """
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        try:
+            body = stream.read()
+            if encoding.lower().replace("-", "") != "utf8":
+                body = body.decode(encoding)
+            try:
+                return orjson.loads(body)
+            except orjson.JSONDecodeError:
+                parse_constant = json.strict_constant if self.strict else None
+                return json.loads(body, parse_constant=parse_constant)
+        except ValueError as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
@@ -0,0 +1,227 @@
+import contextvars
+import cProfile
+import json
+import os
+import pstats
+import random
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core import signing
+from django.db import connections
+
+
+DEFAULT_PROFILING_SETTINGS = {
+    # Fraction of requests profiled without asking, 0 to only honour HEADER.
+    "SAMPLE_RATE": 0.0,
+    # Requests carrying a value from `manage.py profiles sign` are profiled.
+    "HEADER": "X-Profile",
+    # How long a signed header value stays valid.
+    "HEADER_MAX_AGE": 3600,
+    "DIRECTORY": os.path.join(tempfile.gettempdir(), "profiles"),
+    # Oldest profiles are removed beyond this many.
+    "MAX_FILES": 200,
+    # SQL statements kept per profile.
+    "MAX_QUERIES": 500,
+    # Functions listed in the summary of each profile.
+    "TOP_FUNCTIONS": 30,
+}
+
+SIGNING_SALT = "users.profiling"
+
+# SQL timings of the profiled request, None for every other request.
+current_profile_queries = contextvars.ContextVar(
+    "current_profile_queries", default=None
+)
+
+
+def get_profiling_setting(name):
+    return getattr(settings, "PROFILING", {}).get(
+        name, DEFAULT_PROFILING_SETTINGS[name]
+    )
+
+
+def make_profile_header_value():
+    return signing.TimestampSigner(salt=SIGNING_SALT).sign("profile")
+
+
+def is_valid_profile_header_value(value):
+    try:
+        signing.TimestampSigner(salt=SIGNING_SALT).unsign(
+            value, max_age=get_profiling_setting("HEADER_MAX_AGE")
+        )
+    except signing.BadSignature:
+        return False
+    return True
+
+
+def should_profile(request):
+    value = request.headers.get(get_profiling_setting("HEADER"))
+    if value:
+        return is_valid_profile_header_value(value)
+    sample_rate = get_profiling_setting("SAMPLE_RATE")
+    return sample_rate > 0 and random.random() < sample_rate
+
+
+def record_profiled_query(execute, sql, params, many, context):
+    queries = current_profile_queries.get()
+    if queries is None:
+        return execute(sql, params, many, context)
+
+    started_at = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        if len(queries) < get_profiling_setting("MAX_QUERIES"):
+            queries.append(
+                {
+                    "alias": context["connection"].alias,
+                    "sql": sql,
+                    "many": many,
+                    "duration": time.perf_counter() - started_at,
+                }
+            )
+
+
+def install_profiled_query_recorder(connection, **kwargs):
+    if record_profiled_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_profiled_query)
+
+
+def install_profiled_query_recorders():
+    for connection in connections.all():
+        install_profiled_query_recorder(connection)
+
+
+def summarize_stats(stats, limit):
+    """Return the `limit` functions with the most cumulative time."""
+    rows = []
+    for (filename, line, function), (_, calls, tottime, cumtime, _) in sorted(
+        stats.stats.items(), key=lambda item: item[1][3], reverse=True
+    )[:limit]:
+        rows.append(
+            {
+                "function": f"{filename}:{line}({function})",
+                "calls": calls,
+                "tottime": tottime,
+                "cumtime": cumtime,
+            }
+        )
+    return rows
+
+
+class ProfileStore:
+    """Profiles on disk, a `.prof` (pstats) and a `.json` summary each.
+
+    File names start with a nanosecond timestamp so they sort by age; once
+    there are more than MAX_FILES profiles the oldest are removed.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory or get_profiling_setting("DIRECTORY")
+
+    def get_paths(self, profile_id):
+        stem = os.path.join(self.directory, profile_id)
+        return f"{stem}.json", f"{stem}.prof"
+
+    def save(self, profiler, info):
+        os.makedirs(self.directory, exist_ok=True)
+        profile_id = f"{time.time_ns()}-{os.getpid()}"
+        json_path, prof_path = self.get_paths(profile_id)
+
+        profiler.create_stats()
+        stats = pstats.Stats(profiler)
+        stats.dump_stats(prof_path)
+        info = {
+            "id": profile_id,
+            **info,
+            "top_functions": summarize_stats(
+                stats, get_profiling_setting("TOP_FUNCTIONS")
+            ),
+        }
+        tmp_path = f"{json_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(info, f, ensure_ascii=False)
+        os.replace(tmp_path, json_path)
+
+        self.trim()
+        return profile_id
+
+    def list_ids(self):
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(name[:-5] for name in names if name.endswith(".json"))
+
+    def load(self, profile_id):
+        json_path, _ = self.get_paths(profile_id)
+        with open(json_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def load_stats(self, profile_ids):
+        paths = [self.get_paths(profile_id)[1] for profile_id in profile_ids]
+        return pstats.Stats(*paths)
+
+    def remove(self, profile_id):
+        for path in self.get_paths(profile_id):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def trim(self):
+        profile_ids = self.list_ids()
+        for profile_id in profile_ids[: -get_profiling_setting("MAX_FILES")]:
+            self.remove(profile_id)
+
+
+class RequestProfiler:
+    """Profile one request with cProfile and time its SQL.
+
+    cProfile hooks the current thread only and cannot nest, so a process
+    profiles one request at a time and simply skips the others. For async
+    views that is the event loop thread: code run through sync_to_async is
+    missing from the profile (its SQL is still timed), and other requests
+    served by the loop meanwhile show up in it.
+    """
+
+    lock = threading.Lock()
+
+    def __init__(self):
+        self.profiler = cProfile.Profile()
+        self.queries = []
+
+    def start(self):
+        if not self.lock.acquire(blocking=False):
+            return False
+        install_profiled_query_recorders()
+        self.token = current_profile_queries.set(self.queries)
+        self.started_at = time.perf_counter()
+        self.profiler.enable()
+        return True
+
+    def stop(self):
+        self.profiler.disable()
+        self.duration = time.perf_counter() - self.started_at
+        current_profile_queries.reset(self.token)
+        self.lock.release()
+
+    def save(self, request, response):
+        resolver_match = getattr(request, "resolver_match", None)
+        return ProfileStore().save(
+            self.profiler,
+            {
+                "time": time.time(),
+                "method": request.method,
+                "path": request.path,
+                "view": resolver_match.url_name if resolver_match else None,
+                "status": response.status_code,
+                "duration": self.duration,
+                "sql_count": len(self.queries),
+                "sql_duration": sum(query["duration"] for query in self.queries),
+                "queries": self.queries,
+            },
+        )
@@ -0,0 +1,47 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    """`JSONRenderer` that encodes with orjson when it is installed.
+
+    The output is byte for byte what `JSONRenderer` writes with compact,
+    unicode JSON: non-ASCII text stays UTF-8 and U+2028/U+2029 are escaped.
+    Indented output, ASCII-only settings, and values orjson refuses
+    (integers beyond 64 bits, unknown types) go through `JSONRenderer`.
+    """
+
+    options = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+        if orjson is not None
+        else 0
+    )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        if (
+            orjson is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            # Dates, decimals, lazy strings... are encoded the DRF way.
+            ret = orjson.dumps(
+                data, default=self.encoder_class().default, option=self.options
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
@@ -0,0 +1,126 @@
+import threading
+import time
+
+from django.conf import settings
+from django.db import IntegrityError
+from django.db import transaction
+from django.utils import timezone
+
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from users.bloom import BloomFilter
+from users.models import RevokedToken
+
+
+DEFAULT_TOKEN_REVOCATION_SETTINGS = {
+    "CAPACITY": 100000,
+    "ERROR_RATE": 0.001,
+    # Revocations made by other processes are picked up this often.
+    "SYNC_SECONDS": 30,
+    # Expired rows are deleted and the filter rebuilt without them this often.
+    "SWEEP_SECONDS": 3600,
+}
+
+
+def get_token_revocation_setting(name):
+    return getattr(settings, "TOKEN_REVOCATION", {}).get(
+        name, DEFAULT_TOKEN_REVOCATION_SETTINGS[name]
+    )
+
+
+class RevocationSet:
+    """Revoked refresh token JTIs, checked without a query in the common case.
+
+    A Bloom filter of the revoked JTIs answers "not revoked" on its own;
+    only a hit is confirmed against the `RevokedToken` table. Revocations
+    are saved as they happen. Maintenance piggybacks on the calls, one
+    thread at a time: new rows from other processes are loaded
+    incrementally, and expired rows are swept.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.maintenance_lock = threading.Lock()
+        self.filter = None
+        self.last_id = 0
+        self.synced_at = 0.0
+        self.swept_at = 0.0
+
+    def load(self):
+        RevokedToken.objects.filter(expires_at__lte=timezone.now()).delete()
+        rows = RevokedToken.objects.all()
+        bloom_filter = BloomFilter(
+            max(get_token_revocation_setting("CAPACITY"), 2 * rows.count()),
+            get_token_revocation_setting("ERROR_RATE"),
+        )
+        last_id = 0
+        for pk, jti in rows.values_list("pk", "jti").iterator(chunk_size=10000):
+            bloom_filter.add(jti)
+            last_id = max(last_id, pk)
+
+        with self.lock:
+            self.filter = bloom_filter
+            self.last_id = max(self.last_id, last_id)
+            self.swept_at = self.synced_at = time.monotonic()
+
+    def sync(self):
+        rows = RevokedToken.objects.filter(pk__gt=self.last_id).values_list("pk", "jti")
+        with self.lock:
+            for pk, jti in rows:
+                self.filter.add(jti)
+                self.last_id = max(self.last_id, pk)
+            self.synced_at = time.monotonic()
+
+    def is_maintenance_due(self, now):
+        return (
+            self.filter is None
+            or now - self.swept_at > get_token_revocation_setting("SWEEP_SECONDS")
+            or now - self.synced_at > get_token_revocation_setting("SYNC_SECONDS")
+        )
+
+    def maintain(self):
+        if not self.is_maintenance_due(time.monotonic()):
+            return
+        # Once there is a filter, the other threads keep using it meanwhile.
+        if not self.maintenance_lock.acquire(blocking=self.filter is None):
+            return
+        try:
+            now = time.monotonic()
+            if (
+                self.filter is None
+                or now - self.swept_at > get_token_revocation_setting("SWEEP_SECONDS")
+            ):
+                self.load()
+            elif now - self.synced_at > get_token_revocation_setting("SYNC_SECONDS"):
+                self.sync()
+        finally:
+            self.maintenance_lock.release()
+
+    def revoke(self, jti, exp):
+        """Revoke `jti` until `exp`; False if it was already revoked."""
+        self.maintain()
+        try:
+            with transaction.atomic():
+                RevokedToken.objects.create(
+                    jti=jti, expires_at=datetime_from_epoch(exp)
+                )
+        except IntegrityError:
+            return False
+        with self.lock:
+            self.filter.add(jti)
+        return True
+
+    def is_revoked(self, jti):
+        self.maintain()
+        if jti not in self.filter:
+            return False
+        return RevokedToken.objects.filter(jti=jti).exists()
+
+    def reset(self):
+        with self.lock:
+            self.filter = None
+            self.last_id = 0
+            self.synced_at = self.swept_at = 0.0
+
+
+revoked_tokens = RevocationSet()
@@ -1,18 +1,164 @@
+from functools import reduce
+from operator import or_
+
 from django.contrib.auth import get_user_model
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
 
 from rest_framework import serializers
+from rest_framework.exceptions import ErrorDetail
 from rest_framework.serializers import ModelSerializer
+from rest_framework.validators import UniqueValidator
+from rest_framework_simplejwt import serializers as jwt_serializers
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_api_settings
+
+from users.last_login import record_login
+from users.tokens import RefreshToken
+
+
+class SingleQueryUniqueMixin:
+    """Check every unique model field with one OR'ed query.
+
+    ModelSerializer attaches a `UniqueValidator` (one SELECT each) to every
+    unique field. They are removed here and replaced by a single lookup in
+    `validate()` that reports the same per-field messages.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        self.unique_error_messages = {}
+        for field_name, field in fields.items():
+            validators = []
+            for validator in field.validators:
+                if isinstance(validator, UniqueValidator):
+                    self.unique_error_messages[field_name] = validator.message
+                else:
+                    validators.append(validator)
+            field.validators = validators
+        return fields
+
+    def get_unique_errors(self, attrs):
+        return self.get_many_unique_errors([attrs])[0]
+
+    def get_many_unique_errors(self, items):
+        """Return an error dict per item for values that are already taken.
+
+        A value is taken when a stored row or an earlier item uses it.
+        """
+        values = {
+            field_name: {
+                item[field_name] for item in items if item.get(field_name) is not None
+            }
+            for field_name in self.unique_error_messages
+        }
+        lookups = [
+            Q(**{f"{field_name}__in": field_values})
+            for field_name, field_values in values.items()
+            if field_values
+        ]
+
+        taken = {field_name: set() for field_name in self.unique_error_messages}
+        if lookups:
+            queryset = self.Meta.model._default_manager.filter(reduce(or_, lookups))
+            if self.instance is not None:
+                queryset = queryset.exclude(pk=self.instance.pk)
+            for row in queryset.values_list(*taken):
+                for field_name, value in zip(taken, row):
+                    taken[field_name].add(value)
+
+        errors = []
+        for item in items:
+            item_errors = {}
+            for field_name in taken:
+                value = item.get(field_name)
+                if value is None:
+                    continue
+                if value in taken[field_name]:
+                    message = self.unique_error_messages[field_name]
+                    item_errors[field_name] = [ErrorDetail(message, code="unique")]
+                taken[field_name].add(value)
+            errors.append(item_errors)
+        return errors
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        if isinstance(self.parent, SingleQueryUniqueListSerializer):
+            # Checked for the whole list at once.
+            return attrs
+        errors = self.get_unique_errors(attrs)
+        if errors:
+            raise serializers.ValidationError(errors)
+        return attrs
+
+
+class SingleQueryUniqueListSerializer(serializers.ListSerializer):
+    """`many=True` counterpart of `SingleQueryUniqueMixin`.
 
+    The unique fields of every item are checked with one query, and values
+    repeated within the list are reported on the later items.
+    """
 
-class UserSerializer(ModelSerializer):
+    def to_internal_value(self, data):
+        # Not validate(): errors raised there are folded into non-field
+        # errors instead of being reported per item.
+        attrs = super().to_internal_value(data)
+        errors = self.child.get_many_unique_errors(attrs)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return attrs
+
+
+class UserSerializer(SingleQueryUniqueMixin, ModelSerializer):
     class Meta:
         model = get_user_model()
+        list_serializer_class = SingleQueryUniqueListSerializer
         fields = ["username", "nickname", "email", "favorate_race", "password"]
 
 
-class KakaoRegistrationSerializer(ModelSerializer):
-    access_token = serializers.CharField()
+class KakaoRegistrationSerializer(SingleQueryUniqueMixin, ModelSerializer):
+    access_token = serializers.CharField(required=False)
+    id_token = serializers.CharField(required=False)
 
     class Meta:
         model = get_user_model()
-        fields = ["access_token", "nickname", "favorate_race"]
+        fields = ["access_token", "id_token", "nickname", "favorate_race"]
+
+    def validate(self, attrs):
+        if not attrs.get("access_token") and not attrs.get("id_token"):
+            raise serializers.ValidationError(
+                {"access_token": [_("This field is required.")]}
+            )
+        return super().validate(attrs)
+
+
+class TokenObtainPairSerializer(jwt_serializers.TokenObtainPairSerializer):
+    token_class = RefreshToken
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        record_login(self.user)
+        return data
+
+
+class TokenRefreshSerializer(jwt_serializers.TokenRefreshSerializer):
+    """Refresh with rotation: the presented refresh token is revoked."""
+
+    token_class = RefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        data = {"access": str(refresh.access_token)}
+
+        if jwt_api_settings.ROTATE_REFRESH_TOKENS:
+            # A concurrent refresh with the same token got here first.
+            if not refresh.revoke():
+                raise TokenError(_("Token is blacklisted"))
+
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+
+            data["refresh"] = str(refresh)
+
+        return data
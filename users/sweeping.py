@@ -0,0 +1,94 @@
+import json
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from users.caches import invalidate_cached_users
+
+
+DEFAULT_UNVERIFIED_SWEEP_SETTINGS = {
+    # Unverified users who joined longer ago than this are removed.
+    "MAX_AGE_DAYS": 7,
+    "BATCH_SIZE": 500,
+    # Pause between batches so replication and other writers keep up.
+    "SLEEP_SECONDS": 0.5,
+}
+
+# Written to the archive; the password hash is left out.
+ARCHIVED_FIELDS = (
+    "id",
+    "username",
+    "nickname",
+    "email",
+    "registration_type",
+    "favorate_race",
+    "date_joined",
+)
+
+
+def get_unverified_sweep_setting(name):
+    return getattr(settings, "UNVERIFIED_SWEEP", {}).get(
+        name, DEFAULT_UNVERIFIED_SWEEP_SETTINGS[name]
+    )
+
+
+def get_sweep_cutoff(max_age_days=None):
+    if max_age_days is None:
+        max_age_days = get_unverified_sweep_setting("MAX_AGE_DAYS")
+    return timezone.now() - timedelta(days=max_age_days)
+
+
+def get_sweep_queryset(cutoff, after=None):
+    User = get_user_model()
+    queryset = User.objects.filter(is_verified=False, date_joined__lt=cutoff)
+    if after is not None:
+        date_joined, pk = after
+        queryset = queryset.filter(
+            Q(date_joined__gt=date_joined) | Q(date_joined=date_joined, pk__gt=pk)
+        )
+    return queryset.order_by("date_joined", "pk")
+
+
+def sweep_unverified_batch(cutoff, after=None, batch_size=None, archive=None):
+    """Delete one batch of unverified users who joined before `cutoff`.
+
+    Candidates are read in `(date_joined, id)` order after the `after` key,
+    one short range of the partial index per batch. Only they are locked,
+    with `SKIP LOCKED`, and rechecked, so a user verifying meanwhile is
+    kept and no transaction outlives the batch. Deleted rows are appended
+    to the `archive` file object as JSON lines before the commit.
+
+    Returns `(deleted, last_key)`; `last_key` is None once nothing is left.
+    """
+    User = get_user_model()
+    batch_size = batch_size or get_unverified_sweep_setting("BATCH_SIZE")
+
+    candidates = list(
+        get_sweep_queryset(cutoff, after).values_list("date_joined", "pk")[:batch_size]
+    )
+    if not candidates:
+        return 0, None
+
+    with transaction.atomic():
+        users = list(
+            User.objects.select_for_update(skip_locked=True)
+            .filter(pk__in=[pk for _, pk in candidates], is_verified=False)
+            .values(*ARCHIVED_FIELDS)
+        )
+        if archive is not None:
+            for user in users:
+                archive.write(
+                    json.dumps(user, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
+                )
+            archive.flush()
+        pks = [user["id"] for user in users]
+        User.objects.filter(pk__in=pks).delete()
+
+    invalidate_cached_users(pks)
+    return len(pks), candidates[-1]
@@ -0,0 +1,287 @@
+import hashlib
+import math
+import threading
+import time
+
+import jwt
+
+from django.conf import settings
+from django.core.cache import caches
+
+from rest_framework import exceptions
+from rest_framework.throttling import BaseThrottle
+
+
+DEFAULT_THROTTLING_SETTINGS = {
+    # "local" keeps the buckets in process memory; "cache" shares them
+    # between workers through CACHE.
+    "BACKEND": "local",
+    "CACHE": "default",
+    # Buckets (or remembered rejections) kept in process memory.
+    "MAX_ENTRIES": 10000,
+    # Per `throttle_scope`, "<requests>/<period>" for each client IP ("ip")
+    # and for each user ("user"): the username, the Kakao id an id_token
+    # claims, or else the Kakao access token itself. Scopes missing here
+    # are not throttled.
+    "RATES": {},
+}
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+# Request fields naming whom a login or registration is for, in order.
+IDENTITY_FIELDS = ("username", "id_token", "access_token")
+
+
+def get_throttling_setting(name):
+    return getattr(settings, "THROTTLING", {}).get(
+        name, DEFAULT_THROTTLING_SETTINGS[name]
+    )
+
+
+def parse_rate(rate):
+    num_requests, period = rate.split("/")
+    return int(num_requests), PERIODS[period[0]]
+
+
+def take_token(tat, now, rate):
+    """Take a token from a bucket; return its new state and the wait.
+
+    A bucket holding `num_requests` tokens refilled over `period` is kept
+    as the time it will be full again (GCRA), None for a full bucket. The
+    state is None as well when the request must wait.
+    """
+    num_requests, period = rate
+    tat = max(tat or now, now) + period / num_requests
+    wait = tat - now - period
+    if wait > 0:
+        return None, wait
+    return tat, 0
+
+
+class LocalBuckets:
+    """Buckets of this process only; each worker enforces its own limits."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.tats = {}
+
+    def prune(self, now):
+        # A full bucket is the same as a missing one.
+        self.tats = {key: tat for key, tat in self.tats.items() if tat > now}
+        excess = len(self.tats) - get_throttling_setting("MAX_ENTRIES") // 2
+        if excess > 0:
+            for key in sorted(self.tats, key=self.tats.get)[:excess]:
+                del self.tats[key]
+
+    def hit(self, key, rate):
+        now = time.monotonic()
+        with self.lock:
+            tat, wait = take_token(self.tats.get(key), now, rate)
+            if tat is not None:
+                if len(self.tats) >= get_throttling_setting("MAX_ENTRIES"):
+                    self.prune(now)
+                self.tats[key] = tat
+        return wait
+
+    async def ahit(self, key, rate):
+        return self.hit(key, rate)
+
+
+class CacheBuckets:
+    """Buckets shared by every worker through a Django cache.
+
+    The read and the write are not atomic, so workers racing on one bucket
+    may let a few extra requests through. Rejections are remembered in
+    process until they expire, so a throttled client costs no cache round
+    trip.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.denied_until = {}
+
+    def get_cache(self):
+        return caches[get_throttling_setting("CACHE")]
+
+    def get_denied_wait(self, key):
+        with self.lock:
+            denied_until = self.denied_until.get(key)
+        if denied_until is None:
+            return 0
+        return max(0, denied_until - time.monotonic())
+
+    def deny(self, key, wait):
+        now = time.monotonic()
+        with self.lock:
+            if len(self.denied_until) >= get_throttling_setting("MAX_ENTRIES"):
+                # Only a shortcut; the cache still has every bucket.
+                self.denied_until = {
+                    key: denied_until
+                    for key, denied_until in self.denied_until.items()
+                    if denied_until > now
+                }
+                if len(self.denied_until) >= get_throttling_setting("MAX_ENTRIES"):
+                    self.denied_until = {}
+            self.denied_until[key] = now + wait
+
+    def hit(self, key, rate):
+        wait = self.get_denied_wait(key)
+        if wait:
+            return wait
+        cache = self.get_cache()
+        now = time.time()
+        tat, wait = take_token(cache.get(key), now, rate)
+        if tat is None:
+            self.deny(key, wait)
+            return wait
+        cache.set(key, tat, timeout=math.ceil(tat - now))
+        return 0
+
+    async def ahit(self, key, rate):
+        wait = self.get_denied_wait(key)
+        if wait:
+            return wait
+        cache = self.get_cache()
+        now = time.time()
+        tat, wait = take_token(await cache.aget(key), now, rate)
+        if tat is None:
+            self.deny(key, wait)
+            return wait
+        await cache.aset(key, tat, timeout=math.ceil(tat - now))
+        return 0
+
+
+BACKENDS = {"local": LocalBuckets, "cache": CacheBuckets}
+
+
+class TokenBuckets:
+    """The process-wide buckets of the THROTTLING["BACKEND"] in use.
+
+    The backend is created lazily so that settings overrides are honoured,
+    and `reset()` empties it.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.name = None
+        self.backend = None
+
+    def get_backend(self):
+        name = get_throttling_setting("BACKEND")
+        with self.lock:
+            if self.name != name:
+                self.backend = BACKENDS[name]()
+                self.name = name
+            return self.backend
+
+    def reset(self):
+        with self.lock:
+            self.name = None
+            self.backend = None
+
+
+token_buckets = TokenBuckets()
+
+
+def get_id_token_sub(id_token):
+    """Return the Kakao id an id_token claims, without verifying it.
+
+    Good enough to pick a bucket before any call to Kakao; a forged `sub`
+    only moves the request to another account's bucket.
+    """
+    try:
+        claims = jwt.decode(str(id_token), options={"verify_signature": False})
+    except jwt.InvalidTokenError:
+        return None
+    return claims.get("sub")
+
+
+def get_identity(data):
+    if not hasattr(data, "get"):
+        return None
+    for field in IDENTITY_FIELDS:
+        value = data.get(field)
+        if not value:
+            continue
+        if field == "id_token":
+            sub = get_id_token_sub(value)
+            if sub:
+                return f"kakao:{sub}"
+        # Kakao access tokens cannot be tied to their account without
+        # asking Kakao, so each token gets a bucket of its own.
+        return f"{field}:{value}"
+    return None
+
+
+def get_identity_digest(data):
+    identity = get_identity(data)
+    if identity is None:
+        return None
+    # Keeps usernames and Kakao tokens out of the cache.
+    return hashlib.sha256(identity.encode()).hexdigest()[:32]
+
+
+def get_throttle_buckets(request, scope, data):
+    rates = get_throttling_setting("RATES").get(scope, {})
+    buckets = []
+    if rates.get("ip"):
+        ident = BaseThrottle().get_ident(request)
+        buckets.append((f"users:throttle:{scope}:ip:{ident}", parse_rate(rates["ip"])))
+    if rates.get("user"):
+        digest = get_identity_digest(data)
+        if digest is not None:
+            buckets.append(
+                (f"users:throttle:{scope}:user:{digest}", parse_rate(rates["user"]))
+            )
+    return buckets
+
+
+def check_throttle(request, scope, data):
+    """Return how many seconds the request must wait, 0 if it may proceed.
+
+    The client IP's bucket is checked before the user's, so requests
+    rejected by IP do not use up the user's tokens.
+    """
+    backend = token_buckets.get_backend()
+    for key, rate in get_throttle_buckets(request, scope, data):
+        wait = backend.hit(key, rate)
+        if wait:
+            return wait
+    return 0
+
+
+async def acheck_throttle(request, scope, data):
+    backend = token_buckets.get_backend()
+    for key, rate in get_throttle_buckets(request, scope, data):
+        wait = await backend.ahit(key, rate)
+        if wait:
+            return wait
+    return 0
+
+
+class Throttled(exceptions.Throttled):
+    default_detail = "요청이 너무 많습니다."
+    extra_detail_singular = "{wait}초 후에 다시 시도해주세요."
+    extra_detail_plural = "{wait}초 후에 다시 시도해주세요."
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Throttle views by their `throttle_scope`, see THROTTLING["RATES"]."""
+
+    def allow_request(self, request, view):
+        scope = getattr(view, "throttle_scope", None)
+        if scope is None:
+            self.wait_seconds = 0
+            return True
+        self.wait_seconds = check_throttle(request, scope, request.data)
+        return not self.wait_seconds
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class ThrottledMixin:
+    """Answer throttled requests in Korean."""
+
+    def throttled(self, request, wait):
+        raise Throttled(wait)
@@ -0,0 +1,29 @@
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework_simplejwt import tokens
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+from users.jwks import token_backend
+from users.revocation import revoked_tokens
+
+
+class KeyRingTokenMixin:
+    def get_token_backend(self):
+        return token_backend
+
+
+class AccessToken(KeyRingTokenMixin, tokens.AccessToken):
+    pass
+
+
+class RefreshToken(KeyRingTokenMixin, tokens.RefreshToken):
+    access_token_class = AccessToken
+
+    def verify(self):
+        super().verify()
+        if revoked_tokens.is_revoked(self[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def revoke(self):
+        return revoked_tokens.revoke(self[api_settings.JTI_CLAIM], self["exp"])
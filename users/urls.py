@@ -1,29 +1,51 @@
+from django.conf import settings
 from django.urls import path
 
-from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework_simplejwt.views import TokenRefreshView
 
+from users.views import AsyncKakaoLogInView
+from users.views import AsyncKakaoRegistrationView
+from users.views import BatchEmailRegistrationAPIView
 from users.views import EmailRegistrationAPIView
 from users.views import KakaoLogInView
 from users.views import KakaoRegistrationView
+from users.views import LogInView
+from users.views import NameAvailabilityAPIView
 from users.views import VerifyEmailAPIView
+from users.views import jwks_view
 
 
+if settings.ASYNC_KAKAO_VIEWS:
+    kakao_login_view = AsyncKakaoLogInView.as_view()
+    kakao_registration_view = AsyncKakaoRegistrationView.as_view()
+else:
+    kakao_login_view = KakaoLogInView.as_view()
+    kakao_registration_view = KakaoRegistrationView.as_view()
+
 urlpatterns = [
     path("token/refresh", TokenRefreshView.as_view(), name="token-refresh"),
-    path("login", TokenObtainPairView.as_view(), name="login"),
-    path("login/kakao", KakaoLogInView.as_view(), name="kakao-login"),
+    path(".well-known/jwks.json", jwks_view, name="jwks"),
+    path("login", LogInView.as_view(), name="login"),
+    path("login/kakao", kakao_login_view, name="kakao-login"),
     path(
         "registration",
         EmailRegistrationAPIView.as_view(),
         name="registration",
     ),
+    path(
+        "registration/batch",
+        BatchEmailRegistrationAPIView.as_view(),
+        name="batch-registration",
+    ),
+    path(
+        "registration/availability",
+        NameAvailabilityAPIView.as_view(),
+        name="availability",
+    ),
     path(
         "registration/email/verify",
         VerifyEmailAPIView.as_view(),
         name="email-verification",
     ),
-    path(
-        "registration/kakao", KakaoRegistrationView.as_view(), name="kakao-registration"
-    ),
+    path("registration/kakao", kakao_registration_view, name="kakao-registration"),
 ]
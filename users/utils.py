@@ -1,10 +1,17 @@
-import requests
-
-from django.core.mail import EmailMessage
+import json
 
-from rest_framework_simplejwt.tokens import RefreshToken
+import httpx
+import requests
 
 from users.exceptions import KakaoException
+from users.kakao import kakao_async_client
+from users.kakao import kakao_client
+from users.kakao import kakao_profile_cache
+from users.kakao_oidc import averify_id_token
+from users.kakao_oidc import verify_id_token
+from users.outbox import enqueue_email
+from users.outbox import enqueue_emails
+from users.tokens import RefreshToken
 
 
 def create_token_with_user(user):
@@ -13,23 +20,91 @@ def create_token_with_user(user):
     return token
 
 
+def parse_request_data(request):
+    """Read a JSON or form-encoded body outside of DRF's parsers."""
+    if request.content_type == "application/json":
+        return json.loads(request.body or b"{}")
+    return request.POST.dict()
+
+
 def send_verification_email(data):
-    email = EmailMessage(
-        body=data["email_body"], subject=data["email_subject"], to=(data["to_email"],)
+    enqueue_email(
+        body=data["email_body"],
+        subject=data["email_subject"],
+        to_email=data["to_email"],
     )
-    email.send()
+
+
+def send_verification_emails(data_list):
+    enqueue_emails(data_list)
 
 
 def fetch_kakao_user_data(access_token):
+    user_data = kakao_profile_cache.get(access_token)
+    if user_data is not None:
+        return user_data
+
     try:
-        url = "https://kapi.kakao.com/v2/user/me"
         headers = {"Authorization": f"Bearer {access_token}"}
 
-        response = requests.get(url=url, headers=headers)
+        response = kakao_client.get("/v2/user/me", headers=headers)
         if response.status_code != 200:
             raise KakaoException("잘못된 엑세스 토큰입니다.")
 
         user_data = response.json()
+        kakao_profile_cache.set(access_token, user_data)
         return user_data
+    except requests.Timeout:
+        raise KakaoException("카카오 서버의 응답이 지연되고 있습니다.")
     except Exception as exception:
         raise exception
+
+
+async def afetch_kakao_user_data(access_token):
+    user_data = await kakao_profile_cache.aget(access_token)
+    if user_data is not None:
+        return user_data
+
+    try:
+        headers = {"Authorization": f"Bearer {access_token}"}
+
+        response = await kakao_async_client.get("/v2/user/me", headers=headers)
+        if response.status_code != 200:
+            raise KakaoException("잘못된 엑세스 토큰입니다.")
+
+        user_data = response.json()
+        await kakao_profile_cache.aset(access_token, user_data)
+        return user_data
+    except httpx.TimeoutException:
+        raise KakaoException("카카오 서버의 응답이 지연되고 있습니다.")
+
+
+def get_kakao_user_data(data):
+    """Verify an OIDC `id_token` locally, or ask Kakao about the access token.
+
+    Clients may send both, so logins keep working while Kakao's keys
+    cannot be fetched.
+    """
+    id_token = data.get("id_token")
+    if id_token:
+        try:
+            return verify_id_token(id_token)
+        except KakaoException:
+            if not data.get("access_token"):
+                raise
+    return fetch_kakao_user_data(data["access_token"])
+
+
+async def aget_kakao_user_data(data):
+    id_token = data.get("id_token")
+    if id_token:
+        try:
+            return await averify_id_token(id_token)
+        except KakaoException:
+            if not data.get("access_token"):
+                raise
+    return await afetch_kakao_user_data(data["access_token"])
+
+
+def invalidate_kakao_user_data(access_token):
+    kakao_profile_cache.invalidate(access_token)
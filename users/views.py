@@ -1,61 +1,179 @@
 import jwt
 
+from asgiref.sync import sync_to_async
 from django.contrib.auth import get_user_model
 from django.contrib.sites.shortcuts import get_current_site
+from django.db import DEFAULT_DB_ALIAS
+from django.db import IntegrityError
 from django.db import transaction
+from django.http import HttpResponse
+from django.http import HttpResponseForbidden
+from django.http import JsonResponse
 from django.urls import reverse
+from django.utils.cache import patch_cache_control
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework_simplejwt.views import TokenObtainPairView
 
-from config.settings.base import SECRET_KEY
+from users.availability import get_name_availability_setting
+from users.availability import name_index
+from users.caches import consume_token
+from users.caches import is_token_consumed
+from users.jwks import get_jwt_signing_setting
+from users.jwks import key_ring
+from users.last_login import arecord_login
+from users.last_login import record_login
+from users.metrics import is_metrics_access_allowed
+from users.metrics import registry
 from users.serializers import KakaoRegistrationSerializer
 from users.serializers import UserSerializer
+from users.throttling import Throttled
+from users.throttling import ThrottledMixin
+from users.throttling import acheck_throttle
+from users.utils import aget_kakao_user_data
 from users.utils import create_token_with_user
-from users.utils import fetch_kakao_user_data
+from users.utils import get_kakao_user_data
+from users.utils import parse_request_data
 from users.utils import send_verification_email
+from users.utils import send_verification_emails
 
 
-class EmailRegistrationAPIView(APIView):
+def get_verification_email_data(request, user, access_token):
+    current_site = get_current_site(request)
+    relative_url = reverse("email-verification")
+    absolute_url = f"http://{current_site}{relative_url}?token={access_token}"
+    email_body = (
+        f"Hello {user.nickname}, Use link below to verify your account.\n{absolute_url}"
+    )
+    return {
+        "email_body": email_body,
+        "email_subject": "Verify your email",
+        "to_email": user.email,
+    }
+
+
+class LogInView(ThrottledMixin, TokenObtainPairView):
+    # Throttled before the serializer hashes the password.
+    throttle_scope = "login"
+
+
+class EmailRegistrationAPIView(ThrottledMixin, APIView):
     permission_classes = (AllowAny,)
+    throttle_scope = "registration"
     serializer = UserSerializer
 
     def post(self, request):
         User = get_user_model()
+        serializer = self.serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        form_data = serializer.data
+
         with transaction.atomic():
-            serializer = self.serializer(data=request.data)
-            if serializer.is_valid(raise_exception=True):
-                form_data = serializer.data
-
-                user = User.objects.create_user(
-                    username=form_data.pop("username"),
-                    nickname=form_data.pop("nickname"),
-                    password=form_data.pop("password"),
-                    **form_data,
-                )
-                user.is_verified = False
-                user.save()
+            try:
+                with transaction.atomic():
+                    user = User.objects.create_user(
+                        username=form_data.pop("username"),
+                        nickname=form_data.pop("nickname"),
+                        password=form_data.pop("password"),
+                        is_verified=False,
+                        **form_data,
+                    )
+            except IntegrityError:
+                # Lost a race with a concurrent signup after validation.
+                errors = serializer.get_unique_errors(serializer.validated_data)
+                if not errors:
+                    # Not a uniqueness conflict on the form's fields.
+                    raise
+                raise ValidationError(errors)
 
             token = create_token_with_user(user)
-            current_site = get_current_site(request)
-            relative_url = reverse("email-verification")
-            absolute_url = (
-                f"http://{current_site}{relative_url}?token={token.get('access')}"
-            )
-            email_body = f"Hello {user.nickname}, Use link below to verify your account.\n{absolute_url}"
-            data = {
-                "email_body": email_body,
-                "email_subject": "Verify your email",
-                "to_email": user.email,
-            }
+            data = get_verification_email_data(request, user, token["access"])
 
             send_verification_email(data)
 
             return Response(data=token, status=status.HTTP_201_CREATED)
 
 
+class BatchEmailRegistrationAPIView(ThrottledMixin, APIView):
+    """Register a list of users in one transaction, e.g. a whole team."""
+
+    permission_classes = (AllowAny,)
+    throttle_scope = "batch-registration"
+    serializer = UserSerializer
+    max_batch_size = 100
+
+    def post(self, request):
+        User = get_user_model()
+        serializer = self.serializer(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=self.max_batch_size,
+        )
+        serializer.is_valid(raise_exception=True)
+
+        with transaction.atomic():
+            try:
+                with transaction.atomic():
+                    users = User.objects.bulk_create_users(
+                        {**user_data, "is_verified": False}
+                        for user_data in serializer.validated_data
+                    )
+            except IntegrityError:
+                # Lost a race with a concurrent signup after validation.
+                errors = serializer.child.get_many_unique_errors(
+                    serializer.validated_data
+                )
+                if not any(errors):
+                    # Not a uniqueness conflict on the forms' fields.
+                    raise
+                raise ValidationError(errors)
+
+            results = []
+            emails = []
+            for user in users:
+                token = create_token_with_user(user)
+                results.append({"username": user.username, **token})
+                if user.email:
+                    emails.append(
+                        get_verification_email_data(request, user, token["access"])
+                    )
+
+            send_verification_emails(emails)
+
+            return Response(data=results, status=status.HTTP_201_CREATED)
+
+
+class NameAvailabilityAPIView(APIView):
+    """Tell the signup form whether a username or nickname is still free."""
+
+    permission_classes = (AllowAny,)
+
+    def get(self, request):
+        fields = get_name_availability_setting("FIELDS")
+        values = {
+            field_name: request.query_params[field_name]
+            for field_name in fields
+            if request.query_params.get(field_name)
+        }
+        if not values:
+            error_msg = f"{', '.join(fields)} 중 하나 이상을 입력해주세요."
+            return Response(data=error_msg, status=status.HTTP_400_BAD_REQUEST)
+
+        data = {
+            field_name: name_index.is_available(field_name, value)
+            for field_name, value in values.items()
+        }
+        return Response(data=data, status=status.HTTP_200_OK)
+
+
 class VerifyEmailAPIView(APIView):
     permission_classes = (AllowAny,)
 
@@ -63,11 +181,19 @@ class VerifyEmailAPIView(APIView):
         User = get_user_model()
         token = request.query_params.get("token")
         try:
-            payload = jwt.decode(jwt=token, key=SECRET_KEY, algorithms="HS256")
-            user = User.objects.get(id=payload["user_id"])
-            user.is_verified = True
-            user.save()
+            payload = key_ring.decode(token)
+            # Mail scanners and repeated clicks replay the link.
+            if is_token_consumed(payload["jti"]):
+                return Response(data="인증되었습니다.", status=status.HTTP_200_OK)
+
+            user_id = payload["user_id"]
+            if not User.objects.verify_email(user_id):
+                # Usually right after registration, so ask the primary.
+                if not User.objects.using(DEFAULT_DB_ALIAS).filter(pk=user_id).exists():
+                    error_msg = "가입되지 않은 사용자입니다."
+                    return Response(data=error_msg, status=status.HTTP_400_BAD_REQUEST)
 
+            consume_token(payload["jti"], payload["exp"])
             return Response(data="인증되었습니다.", status=status.HTTP_200_OK)
         except jwt.ExpiredSignatureError as e:
             error_msg = "만료된 토큰입니다."
@@ -75,27 +201,26 @@ class VerifyEmailAPIView(APIView):
         except jwt.exceptions.DecodeError as e:
             error_msg = "유효하지 않은 토큰입니다."
             return Response(data=error_msg, status=status.HTTP_400_BAD_REQUEST)
-        except Exception:
+        except Exception as e:
             return Response(str(e), status=status.HTTP_400_BAD_REQUEST)
 
 
-class KakaoLogInView(APIView):
+class KakaoLogInView(ThrottledMixin, APIView):
     permission_classes = (AllowAny,)
+    throttle_scope = "kakao-login"
 
     def post(self, request):
         User = get_user_model()
         try:
-            access_token = request.data["access_token"]
-            kakao_user_data = fetch_kakao_user_data(access_token)
+            kakao_user_data = get_kakao_user_data(request.data)
             kakao_user_id = kakao_user_data["id"]
 
-            user = User.objects.filter(
-                kakao_id=kakao_user_id, registration_type="kakao"
-            )
-            if not user.exists():
+            user = User.objects.get_kakao_user(kakao_user_id)
+            if user is None:
                 raise User.DoesNotExist("가입되지 않은 사용자입니다.")
 
-            token = create_token_with_user(user.first())
+            record_login(user)
+            token = create_token_with_user(user)
             return Response(data=token, status=status.HTTP_200_OK)
 
         except KeyError as key:
@@ -107,8 +232,9 @@ class KakaoLogInView(APIView):
             return Response(data=str(e), status=status.HTTP_400_BAD_REQUEST)
 
 
-class KakaoRegistrationView(APIView):
+class KakaoRegistrationView(ThrottledMixin, APIView):
     permission_classes = (AllowAny,)
+    throttle_scope = "kakao-registration"
     serializer_class = KakaoRegistrationSerializer
 
     def post(self, request):
@@ -117,27 +243,18 @@ class KakaoRegistrationView(APIView):
             serializer = self.serializer_class(data=request.data)
             serializer.is_valid(raise_exception=True)
 
-            access_token = serializer.data["access_token"]
-            kakao_user_data = fetch_kakao_user_data(access_token)
+            kakao_user_data = get_kakao_user_data(serializer.validated_data)
             kakao_user_id = kakao_user_data["id"]
 
-            user = User.objects.filter(
-                kakao_id=kakao_user_id, registration_type="kakao"
-            )
-            if user.exists():
+            try:
+                created_user = User.objects.create_kakao_user(
+                    kakao_id=kakao_user_id,
+                    nickname=serializer.data["nickname"],
+                    favorate_race=serializer.data["favorate_race"],
+                )
+            except IntegrityError:
                 raise Exception("이미 가입되어있는 유저입니다.")
 
-            username = kakao_user_id
-            nickname = serializer.data["nickname"]
-            extra_fields = {
-                "favorate_race": serializer.data["favorate_race"],
-                "registration_type": "kakao",
-                "kakao_id": username,
-            }
-            created_user = User.objects.create_user(
-                username=username, nickname=nickname, **extra_fields
-            )
-
             token = create_token_with_user(created_user)
             return Response(data=token, status=status.HTTP_201_CREATED)
         except KeyError as e:
@@ -145,3 +262,106 @@ class KakaoRegistrationView(APIView):
             return Response(data=error_msg, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             return Response(data=str(e), status=status.HTTP_400_BAD_REQUEST)
+
+
+def json_response(data, status):
+    return JsonResponse(
+        data=data, status=status, safe=False, json_dumps_params={"ensure_ascii": False}
+    )
+
+
+def throttled_response(wait):
+    exc = Throttled(wait)
+    response = json_response(data={"detail": exc.detail}, status=exc.status_code)
+    response["Retry-After"] = str(exc.wait)
+    return response
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncKakaoLogInView(View):
+    """ASGI counterpart of `KakaoLogInView`, routed by `users.urls`."""
+
+    throttle_scope = "kakao-login"
+
+    async def post(self, request):
+        User = get_user_model()
+        try:
+            data = parse_request_data(request)
+            wait = await acheck_throttle(request, self.throttle_scope, data)
+            if wait:
+                return throttled_response(wait)
+
+            kakao_user_data = await aget_kakao_user_data(data)
+            kakao_user_id = kakao_user_data["id"]
+
+            user = await User.objects.aget_kakao_user(kakao_user_id)
+            if user is None:
+                raise User.DoesNotExist("가입되지 않은 사용자입니다.")
+
+            await arecord_login(user)
+            token = create_token_with_user(user)
+            return json_response(data=token, status=status.HTTP_200_OK)
+
+        except KeyError as key:
+            error_msg = f"{str(key)}필드에 오류가 있습니다."
+            return json_response(data=error_msg, status=status.HTTP_400_BAD_REQUEST)
+        except User.DoesNotExist as e:
+            return json_response(data=str(e), status=status.HTTP_401_UNAUTHORIZED)
+        except Exception as e:
+            return json_response(data=str(e), status=status.HTTP_400_BAD_REQUEST)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncKakaoRegistrationView(View):
+    """ASGI counterpart of `KakaoRegistrationView`, routed by `users.urls`."""
+
+    serializer_class = KakaoRegistrationSerializer
+    throttle_scope = "kakao-registration"
+
+    async def post(self, request):
+        User = get_user_model()
+        try:
+            data = parse_request_data(request)
+            wait = await acheck_throttle(request, self.throttle_scope, data)
+            if wait:
+                return throttled_response(wait)
+
+            serializer = self.serializer_class(data=data)
+            await sync_to_async(serializer.is_valid)(raise_exception=True)
+
+            kakao_user_data = await aget_kakao_user_data(serializer.validated_data)
+            kakao_user_id = kakao_user_data["id"]
+
+            try:
+                created_user = await sync_to_async(User.objects.create_kakao_user)(
+                    kakao_id=kakao_user_id,
+                    nickname=serializer.data["nickname"],
+                    favorate_race=serializer.data["favorate_race"],
+                )
+            except IntegrityError:
+                raise Exception("이미 가입되어있는 유저입니다.")
+
+            token = create_token_with_user(created_user)
+            return json_response(data=token, status=status.HTTP_201_CREATED)
+        except KeyError as e:
+            error_msg = f"{str(e)}필드에 오류가 있습니다."
+            return json_response(data=error_msg, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            return json_response(data=str(e), status=status.HTTP_400_BAD_REQUEST)
+
+
+def metrics_view(request):
+    if not is_metrics_access_allowed(request):
+        return HttpResponseForbidden()
+    return HttpResponse(
+        registry.render_prometheus(),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+def jwks_view(request):
+    response = JsonResponse(key_ring.get_jwks())
+    patch_cache_control(
+        response, public=True, max_age=get_jwt_signing_setting("JWKS_MAX_AGE")
+    )
+    return response